@@ -1,11 +1,129 @@
 import random
 import math
 import os
+import heapq
+import itertools
+from array import array
+from collections import deque, OrderedDict
+import gzip
+import re
+import gc
+from contextlib import contextmanager
+import mmap
+import struct
+import sys
+import copy
+import functools
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 #TODO: 
 # Regresar Falso cuando el grafo es no dirigido y los algoritmos no lo soportan.
 # Ver si el grafo no contiene 0 nodos y regresar none
-# Cargar archivos con atributos
+
+TAMANO_BUFFER = 1 << 20 #bytes del buffer de escritura de Grafo.guardar
+LINEAS_POR_ESCRITURA = 10000 #líneas acumuladas antes de cada write en Grafo.escribir
+ATRIBUTO_GV = re.compile(r'([^\s=\[\];,]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^\s\];,]+)') #llave=valor dentro de [ ] en archivos GV
+LISTA_ATRIBUTOS_GV = re.compile(r'(?:"(?:[^"\\]|\\.)*"|[^"\]])*') #texto hasta el primer ] que no está entre comillas
+ESCAPE_GV = re.compile(r'\\(.)') #\" \\ \n dentro de un valor entre comillas
+VALORES_GV = {"True": True, "False": False, "None": None}
+ENTERO_GV = re.compile(r'[-+]?[0-9]+') #sólo estos textos se convierten a int al leer archivos GV
+TEXTO_SIMPLE_GV = re.compile(r'[^\s\[\];,="\\]+') #textos que se pueden escribir sin comillas como valor de un atributo GV
+REAL_GV = re.compile(r'[-+]?([0-9]+\.[0-9]*|\.[0-9]+|[0-9]+)([eE][-+]?[0-9]+)?') #y estos a float ("inf", "nan" o "1_000" quedan como str)
+MAX_ATRIBUTOS_CACHE = 1 << 16 #textos de atributos distintos que se recuerdan al leer un archivo GV
+FIRMA_BINARIO = b"PGRF"
+VERSION_BINARIO = 1
+ENCABEZADO_BINARIO = struct.Struct("<4sHBBqqq") #firma, versión, banderas, tipo de IDs, n, m, bytes de la tabla de IDs
+ID_BINARIO_ENTERO = 0
+ID_BINARIO_TEXTO = 1
+SESION_CORRIENDO = 0 #estados de SesionDistribucion
+SESION_PAUSADA = 1
+SESION_CONVERGIDA = 2
+SESION_TERMINADA = 3
+ENCABEZADO_SESION = struct.Struct("<qqqd") #secuencia, iteraciones, estado, desplazamiento; seguido de las posiciones x, y
+TAMANO_CACHE = 64 #resultados de consultas guardados por grafo (ver Grafo.tamano_cache)
+
+_AUSENTE = object() #marca de resultado que no está en la caché
+
+def _en_cache(metodo):
+    """
+    Decorador de consultas de Grafo: guarda el resultado en la caché LRU del grafo con llave (método, argumentos, versión).
+    Si algún argumento no es hashable, la consulta se calcula sin caché.
+    """
+    nombre = metodo.__name__
+    @functools.wraps(metodo)
+    def consulta(self, *args, **kwargs):
+        if self.tamano_cache <= 0:
+            return metodo(self, *args, **kwargs)
+        cache = self._cache
+        version = self.version
+        if self._version_cache != version:
+            #Las entradas de versiones anteriores ya no pueden consultarse.
+            cache.clear()
+            self._version_cache = version
+        llave = (nombre, args, tuple(sorted(kwargs.items())) if kwargs else (), version)
+        try:
+            resultado = cache.get(llave, _AUSENTE)
+        except TypeError:
+            resultado = None
+            llave = None
+        if llave is None:
+            return metodo(self, *args, **kwargs)
+        if resultado is not _AUSENTE:
+            cache.move_to_end(llave)
+            self.aciertos_cache += 1
+            return resultado
+        self.fallos_cache += 1
+        resultado = metodo(self, *args, **kwargs)
+        cache[llave] = resultado
+        while len(cache) > self.tamano_cache:
+            cache.popitem(last=False)
+        return resultado
+    return consulta
+
+def _nueva_version(duenos):
+    """Actualiza la versión del grafo (o de la tupla de grafos) al que pertenece un Nodo o Arista modificado."""
+    if type(duenos) is tuple:
+        for grafo in duenos:
+            grafo._version += 1
+    else:
+        duenos._version += 1
+
+def _agregar_dueno(elemento, grafo):
+    """Registra grafo como dueño de un Nodo o Arista; si ya pertenece a otro grafo, _grafo pasa a ser una tupla con ambos."""
+    duenos = elemento._grafo
+    if duenos is None or duenos is grafo:
+        elemento._grafo = grafo
+    elif type(duenos) is tuple:
+        if grafo not in duenos:
+            elemento._grafo = duenos + (grafo,)
+    else:
+        elemento._grafo = (duenos, grafo)
+
+def _como_lista(valores):
+    """Convierte arreglos (NumPy o array) a listas de valores de Python; cualquier otro iterable se devuelve igual."""
+    return valores.tolist() if hasattr(valores, "tolist") else valores
+
+@contextmanager
+def sin_recolector():
+    """
+    Suspende el recolector de ciclos de Python durante construcciones masivas de grafos.
+    Nodos y aristas se referencian entre sí, por lo que cada lote de objetos nuevos dispara recolecciones que no liberan nada.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
 
 class Grafo:
     """
@@ -14,7 +132,19 @@ class Grafo:
     Attributes:
         es_dirigido (bool): True si es dirigido, False en caso contrario. No es recomendable cambiarlo arbitrariamente.
         nodos (list(Nodo)): Lista con todos los nodos del grafo.
-        aristas (list(Arista)): Lista con todas las aristas del grafo.
+        aristas (list(Arista)): Lista con todas las aristas del grafo. Es una copia: para modificar el grafo utilice Grafo.conectar_nodos y Grafo.desconectar_nodos.
+
+    Los nodos se indexan por identificador para que Grafo.get_nodo sea O(1), por lo que los identificadores deben ser hashables.
+    Para agregar nodos ya creados utilice Grafo.agregar_nodos en lugar de modificar la lista directamente.
+
+    Grafo.version cambia con cada modificación hecha por los métodos del grafo o por definir_propiedad, quitar_propiedad y 
+    copiar_propiedades de sus nodos y aristas. Los cambios directos a los atributos (por ejemplo nodo.propiedad[llave] = valor 
+    o arista.propiedad[llave] = valor) no cambian la versión, por lo que la caché seguirá devolviendo resultados anteriores; 
+    después de ellos llame Grafo.limpiar_cache. Las consultas esta_conectado, distancias_Dijkstra, camino_mas_corto, 
+    componentes_conexas, componentes_fuertes, puentes y puntos_articulacion guardan sus resultados en una caché LRU de 
+    tamano_cache entradas, válida mientras la versión no cambie. Los resultados en caché se comparten entre llamadas, por lo 
+    que no deben modificarse; con tamano_cache = 0 se desactiva la caché. Dijkstra, KruskalD, KruskalI y Prim no se guardan: 
+    regresan un grafo nuevo en cada llamada, que puede modificarse libremente.
     """
 
     def __init__(self, es_dirigido):
@@ -25,7 +155,49 @@ class Grafo:
         """
         self.es_dirigido = es_dirigido
         self.nodos = []
-        self.aristas = []
+        self._aristas = {} #(Nodo de, Nodo a) -> Arista
+        self._indice = {} #identificador -> Nodo
+        self._lista_indexada = self.nodos #lista y cantidad de nodos que cubre _indice: si la lista se cambia directamente se reindexa
+        self._nodos_indexados = 0
+        self._version = 0
+        self.tamano_cache = TAMANO_CACHE
+        self._cache = OrderedDict() #(método, argumentos, versión) -> resultado
+        self._version_cache = None
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+        self._entrantes = None #Nodo -> [(Nodo de, Arista)], ver Grafo._aristas_entrantes
+        self._version_entrantes = None
+
+    @property
+    def version(self):
+        """Contador de modificaciones del grafo. También cambia si se modifica la lista de nodos directamente."""
+        return (self._version, len(self.nodos))
+
+    def estadisticas_cache(self):
+        """
+        :return: Diccionario con los aciertos, fallos y entradas actuales de la caché de consultas.
+        :rtype: dict
+        """
+        return {"aciertos": self.aciertos_cache, "fallos": self.fallos_cache, "entradas": len(self._cache)}
+
+    def limpiar_cache(self):
+        """Descarta los resultados guardados y reinicia los contadores de la caché de consultas."""
+        self._cache.clear()
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+
+    @property
+    def aristas(self):
+        return list(self._aristas.values())
+
+    def num_aristas(self):
+        """
+        Cantidad de aristas en el grafo.
+        
+        :return: La cantidad de aristas en el grafo.
+        :rtype: int
+        """
+        return len(self._aristas)
 
     def num_nodos(self):
         """
@@ -39,10 +211,13 @@ class Grafo:
     def conectar_nodos(self, id_de, id_a, **kwargs):
         """
         Crea una arista y conecta 2 nodos dentro del grafo tomando en cuenta si es dirigido o no.
+        Si los nodos ya estaban conectados, la arista anterior se reemplaza.
 
         :param id_de: ID del nodo inicial. Debe ser del mismo tipo del identificador (str, int, etc..). Si no, el nodo no será encontrado.
         :param id_a: ID del nodo terminal. Debe ser del mismo tipo del identificador (str, int, etc..). Si no, el nodo no será encontrado.
         :param **kwargs: Kwargs con los atributos que contendrá la arista entre los nodos.
+        :return: La arista creada. None si no se encuentra alguno de los nodos.
+        :rtype: Arista or None
         """
         nodo_de = self.get_nodo(id_de)
         nodo_a = self.get_nodo(id_a)
@@ -50,11 +225,115 @@ class Grafo:
             print("ERROR: No se encuentra uno o ninguno de los nodos especificados para conectar." + "(" + str(id_de) + ", " + str(id_a) + ")")
             return        
         arista = Arista(**kwargs)
-        self.aristas.append(arista)
+        self._conectar(nodo_de, nodo_a, arista)
+        return arista
+
+    def _conectar(self, nodo_de, nodo_a, arista):
+        """Conecta 2 nodos del grafo con la arista dada, reemplazando la arista anterior entre ellos si existe."""
+        if self._aristas.pop((nodo_de, nodo_a), None) is None and not self.es_dirigido:
+            self._aristas.pop((nodo_a, nodo_de), None)
+        self._aristas[(nodo_de, nodo_a)] = arista
+        arista._grafo = self
+        self._version += 1
         nodo_de.conectar_a(nodo_a, arista)
         if not self.es_dirigido:
             nodo_a.conectar_a(nodo_de, arista)
 
+    def agregar_aristas(self, pares, pesos = None, propiedades = None, reemplazar = True):
+        """
+        Conecta un lote de parejas de nodos. Todos los identificadores se validan antes de conectar, así que si alguno no existe
+        el grafo no se modifica. Igual que en conectar_nodos, una arista repetida reemplaza a la anterior, a menos que reemplazar sea False.
+
+        :param pares: Iterable de parejas (id_de, id_a), o arreglo de NumPy de forma (m, 2).
+        :param pesos: (opcional) Iterable o arreglo alineado con pares con la "distancia" de cada arista.
+        :param propiedades: (opcional) Iterable alineado con pares con un diccionario de propiedades (o None) para cada arista. 
+            No se combina con pesos.
+        :param bool reemplazar: (opcional) False para conservar la arista existente y descartar la repetida (= True si no se especifica).
+        :return: Cantidad de aristas conectadas. None si los datos no son válidos.
+        :rtype: int or None
+        """
+        if len(self.nodos) != self._nodos_indexados or self.nodos is not self._lista_indexada:
+            self._reindexar()
+        indice = self._indice
+        try:
+            extremos = [(indice[id_de], indice[id_a]) for id_de, id_a in _como_lista(pares)]
+        except KeyError as error:
+            print("ERROR: No se encuentra el nodo " + str(error.args[0]) + " de las aristas a conectar.")
+            return
+        except (TypeError, ValueError):
+            print("ERROR: Cada arista debe ser una pareja (id_de, id_a).")
+            return
+        if pesos is not None:
+            pesos = list(_como_lista(pesos))
+            if len(pesos) != len(extremos):
+                print("ERROR: Se recibieron " + str(len(pesos)) + " pesos para " + str(len(extremos)) + " aristas.")
+                return
+        if propiedades is not None:
+            propiedades = list(propiedades)
+            if len(propiedades) != len(extremos):
+                print("ERROR: Se recibieron " + str(len(propiedades)) + " propiedades para " + str(len(extremos)) + " aristas.")
+                return
+        aristas = self._aristas
+        es_dirigido = self.es_dirigido
+        with sin_recolector():
+            if propiedades is not None:
+                nuevas = [Arista(**propiedad) if propiedad else Arista() for propiedad in propiedades]
+            elif pesos is not None:
+                nuevas = [Arista(distancia = peso) for peso in pesos]
+            else:
+                nuevas = [Arista() for i in range(len(extremos))]
+            #Mismo efecto que _conectar y Nodo.conectar_a (incluido el reemplazo y los extremos), sin llamadas por arista.
+            for (nodo_de, nodo_a), arista in zip(extremos, nuevas):
+                adyacencia = nodo_de.adyacencia
+                if nodo_a in adyacencia:
+                    if not reemplazar:
+                        continue
+                    if aristas.pop((nodo_de, nodo_a), None) is None and not es_dirigido:
+                        aristas.pop((nodo_a, nodo_de), None)
+                    del adyacencia[nodo_a]
+                    if not es_dirigido:
+                        nodo_a.adyacencia.pop(nodo_de, None)
+                aristas[(nodo_de, nodo_a)] = arista
+                arista._grafo = self
+                adyacencia[nodo_a] = arista
+                if es_dirigido:
+                    arista.extremos = (nodo_de, nodo_a)
+                else:
+                    nodo_a.adyacencia[nodo_de] = arista
+                    arista.extremos = (nodo_a, nodo_de)
+            self._version += 1
+        return len(extremos)
+
+    @classmethod
+    def desde_aristas(cls, ids, pares, pesos = None, es_dirigido = False, propiedades = None, reemplazar = True):
+        """
+        Crea un grafo con un nodo por identificador y conecta todas las aristas en un solo lote (ver Grafo.agregar_aristas).
+
+        :param ids: Iterable con los identificadores de los nodos, o arreglo de NumPy. No debe tener repetidos.
+        :param pares: Iterable de parejas (id_de, id_a), o arreglo de NumPy de forma (m, 2).
+        :param pesos: (opcional) Iterable o arreglo alineado con pares con la "distancia" de cada arista.
+        :param bool es_dirigido: (opcional) True si el grafo es dirigido (= False si no se especifica).
+        :param propiedades: (opcional) Iterable alineado con pares con un diccionario de propiedades (o None) para cada arista.
+        :param bool reemplazar: (opcional) False para conservar la primera de las aristas repetidas (= True si no se especifica).
+        :return: Grafo generado. None si los datos no son válidos.
+        :rtype: Grafo or None
+        """
+        grafo = cls(es_dirigido)
+        ids = list(_como_lista(ids))
+        with sin_recolector():
+            grafo.nodos = [Nodo(id) for id in ids]
+            for nodo in grafo.nodos:
+                nodo._grafo = grafo
+            grafo._indice = dict(zip(ids, grafo.nodos))
+            grafo._lista_indexada = grafo.nodos
+            grafo._nodos_indexados = len(grafo.nodos)
+            if len(grafo._indice) != len(grafo.nodos):
+                print("ERROR: Hay identificadores de nodo repetidos.")
+                return
+            if grafo.agregar_aristas(pares, pesos, propiedades, reemplazar) is None:
+                return
+        return grafo
+
     def desconectar_nodos(self, id_de, id_a):
         """
         Desconecta 2 nodos dentro del grafo y elimina su arista, tomando en cuenta si es dirigido o no.
@@ -67,19 +346,37 @@ class Grafo:
         if nodo_de is None or nodo_a is None:
             print("ERROR: No se encuentra uno o ninguno de los nodos especificados para desconectar.")
             return        
-        for i in range(len(nodo_de.vecinos)):
-            if nodo_de.vecinos[i][0].identificador == id_a:
-                nodo_de.vecinos.pop(i)
-                if not self.es_dirigido:
-                    for j in range(len(nodo_a.vecinos)):
-                        if nodo_a.vecinos[j][0].identificador == id_de:
-                            nodo_a.vecinos.pop(j)
-                            break
-                break
-        for i in range(len(self.aristas)):
-            if self.aristas[i].extremos[0].identificador == id_de and self.aristas[i].extremos[1].identificador == id_a:
-                self.aristas.pop(i)
-                break
+        arista = self._aristas.pop((nodo_de, nodo_a), None)
+        if arista is None and not self.es_dirigido:
+            arista = self._aristas.pop((nodo_a, nodo_de), None)
+        if arista is not None:
+            arista._grafo = None
+        nodo_de.adyacencia.pop(nodo_a, None)
+        if not self.es_dirigido:
+            nodo_a.adyacencia.pop(nodo_de, None)
+        self._version += 1
+
+    def get_arista(self, id_de, id_a):
+        """
+        Devuelve la arista que conecta 2 nodos o None si no existe.
+
+        :param id_de: ID del nodo inicial.
+        :param id_a: ID del nodo terminal.
+        :rtype: Arista or None
+        """
+        nodo_de = self.get_nodo(id_de)
+        nodo_a = self.get_nodo(id_a)
+        if nodo_de is None or nodo_a is None:
+            return None
+        return nodo_de.adyacencia.get(nodo_a)
+
+    def hay_arista(self, id_de, id_a):
+        """
+        Indica si existe una arista entre 2 nodos (de id_de hacia id_a si el grafo es dirigido).
+
+        :rtype: bool
+        """
+        return self.get_arista(id_de, id_a) is not None
 
     def get_nodo(self, id):
         """
@@ -88,10 +385,37 @@ class Grafo:
         :return: Nodo encontrado.
         :rtype: Nodo or None
         """
-        for nodo in self.nodos:
-            if nodo.identificador == id:
-                return nodo
-        return None
+        if len(self.nodos) != self._nodos_indexados or self.nodos is not self._lista_indexada:
+            self._reindexar()
+        return self._indice.get(id)
+
+    def _reindexar(self):
+        """Reconstruye el índice identificador -> Nodo a partir de la lista de nodos."""
+        self._indice = {nodo.identificador: nodo for nodo in self.nodos}
+        self._lista_indexada = self.nodos
+        self._nodos_indexados = len(self.nodos)
+        if len(self._indice) != len(self.nodos):
+            print("ADVERTENCIA: Hay identificadores de nodo repetidos en Grafo.nodos; get_nodo devolverá el último de cada uno.")
+
+    def agregar_nodos(self, nodos):
+        """
+        Agrega al grafo nodos ya existentes (sin copiarlos) y los registra en el índice.
+        Los nodos cuyo identificador ya exista en el grafo se ignoran. Los nodos (y las aristas de su adyacencia) quedan compartidos 
+        con su grafo original: los cambios de propiedades hechos con sus métodos actualizan la versión de ambos grafos.
+
+        :param nodos: Iterable con los nodos a agregar.
+        """
+        if len(self.nodos) != self._nodos_indexados or self.nodos is not self._lista_indexada:
+            self._reindexar()
+        for nodo in nodos:
+            if nodo.identificador not in self._indice:
+                self._indice[nodo.identificador] = nodo
+                self.nodos.append(nodo)
+                self._nodos_indexados += 1
+                _agregar_dueno(nodo, self)
+                for arista in nodo.adyacencia.values():
+                    _agregar_dueno(arista, self)
+                self._version += 1
     
     def crear_nodo(self, id, **kwargs):
         """
@@ -102,7 +426,11 @@ class Grafo:
         """
         if self.get_nodo(id) is None:
             nodo = Nodo(id, **kwargs)
+            nodo._grafo = self
             self.nodos.append(nodo)
+            self._indice[id] = nodo
+            self._nodos_indexados += 1
+            self._version += 1
         else:
             return
     
@@ -117,266 +445,585 @@ class Grafo:
         id = nodo.identificador if (nuevo_id is None) else nuevo_id
         if self.get_nodo(id) is None:
             copia = Nodo(id)
-            copia.propiedad = nodo.propiedad.copy()
+            copia.copiar_propiedades(nodo)
+            copia._grafo = self
             self.nodos.append(copia)
+            self._indice[id] = copia
+            self._nodos_indexados += 1
+            self._version += 1
 
-    def guardar(self, nombre_archivo, identificador = ""):
+    def guardar(self, nombre_archivo, identificador = "", directorio = "grafos", comprimir = False):
         """
         Guarda el grafo en un archivo GV con el nombre especificado. Si el archivo existe, se sobreescribirá.
-        Los archivos son guardados en el directorio "grafos".
+        Los archivos son guardados en el directorio "grafos", a menos que se indique otro.
 
         :param str nombre_archivo: Nombre con el que se creará el archivo (Sin extensión).
         :param str identificador: (Opcional) Si se proporciona, se guardará el grafo con ese nombre (Diferente a nombre de archivo).
+        :param str directorio: (Opcional) Directorio en el que se guarda el archivo. Si es "" o None se usa nombre_archivo tal cual.
+        :param bool comprimir: (Opcional) Si es True se guarda comprimido con gzip (extensión .gv.gz).
+        """
+        ruta = os.path.join(directorio, nombre_archivo) if directorio else nombre_archivo
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        if comprimir:
+            with gzip.open(ruta + ".gv.gz", 'wt') as archivo:
+                self.escribir(archivo, identificador)
+        else:
+            with open(ruta + ".gv", 'w', buffering=TAMANO_BUFFER) as archivo:
+                self.escribir(archivo, identificador)
+
+    def escribir(self, archivo, identificador = ""):
         """
-        try:
-            os.mkdir("grafos")
-            nombre_archivo = "grafos/" + nombre_archivo
-        except FileExistsError:
-            nombre_archivo = "grafos/" + nombre_archivo
-            pass
-        except:
-            pass
-
-        with open(nombre_archivo + ".gv", 'w') as archivo:
-            archivo.write(("digraph " if self.es_dirigido else "graph ") + ((identificador + " {") if identificador else "{") + '\n')
-            for nodo in self.nodos:            
-                if not nodo.vecinos or nodo.propiedad:
-                    archivo.write(str(nodo) + ";")
-                    archivo.write(" [" if nodo.propiedad else "")
-                    for propiedad in nodo.propiedad:
-                        archivo.write(" " + str(propiedad) + "=" + str(nodo.propiedad[propiedad]) + " ")
-                    archivo.write("]\n" if nodo.propiedad else "\n")
-                for vecino in nodo.vecinos:
-                        archivo.write(str(nodo) + (" -> " if self.es_dirigido else " -- ") + str(vecino[0]))
-                        archivo.write(" [" if vecino[1].propiedad else "")
-                        for propiedad in vecino[1].propiedad:
-                            archivo.write(" " + str(propiedad) + "=" + str(vecino[1].propiedad[propiedad]) + " ")
-                        archivo.write("]\n" if vecino[1].propiedad else "\n")
-            archivo.write("}\n")
+        Escribe el grafo en formato GV en un archivo de texto ya abierto (o cualquier objeto con método write, como sys.stdout
+        o gzip.open(..., 'wt')). En grafos no dirigidos cada arista se escribe una sola vez.
+
+        :param archivo: Objeto de texto en el que se escribe.
+        :param str identificador: (Opcional) Si se proporciona, se escribirá el grafo con ese nombre.
+        """
+        conector = " -> " if self.es_dirigido else " -- "
+        posicion = None if self.es_dirigido else self._indices_nodos()
+        lineas = [("digraph " if self.es_dirigido else "graph ") + ((identificador + " {") if identificador else "{") + '\n']
+        for nodo in self.nodos:
+            id_nodo = str(nodo)
+            if not nodo.adyacencia or nodo.tiene_propiedades():
+                lineas.append(id_nodo + ";" + Grafo._atributos_gv(nodo) + "\n")
+            for vecino, arista in nodo.adyacencia.items():
+                if posicion is None or posicion[vecino] >= posicion[nodo]:
+                    lineas.append(id_nodo + conector + str(vecino) + Grafo._atributos_gv(arista) + "\n")
+            if len(lineas) >= LINEAS_POR_ESCRITURA:
+                archivo.write("".join(lineas))
+                lineas.clear()
+        lineas.append("}\n")
+        archivo.write("".join(lineas))
+
+    @staticmethod
+    def _atributos_gv(elemento):
+        """Texto " [ llave=valor  ... ]" con las propiedades de un Nodo o Arista, o "" si no tiene."""
+        if not elemento.tiene_propiedades():
+            return ""
+        return " [" + "".join([" " + str(llave) + "=" + Grafo._valor_texto_gv(valor) + " " for llave, valor in elemento.propiedades()]) + "]"
+
+    @staticmethod
+    def _valor_texto_gv(valor):
+        """
+        Texto de un valor de atributo que Grafo._valor_gv vuelve a leer igual: los str que se leerían como otro tipo 
+        (o que contienen separadores) se escriben entre comillas, escapando \\, " y los saltos de línea, y math.inf como 1e999.
+        """
+        tipo = type(valor)
+        if tipo is int:
+            return str(valor)
+        if tipo is str:
+            if TEXTO_SIMPLE_GV.fullmatch(valor) and Grafo._valor_gv(valor) is valor:
+                return valor
+            return '"' + valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        if tipo is float and math.isinf(valor):
+            return "1e999" if valor > 0 else "-1e999"
+        return str(valor)
     
     def BFS(self, s):
         """
         Genera un grafo con el árbol inducido por el algorítmo de búsqueda "Breadth First Search".
+        Si sólo se requieren padres y profundidades utilice Grafo.BFS_padres, o Grafo.BFS_capas para recorrer por capas.
 
         :param s: ID del nodo de inicio. 
         :return: Árbol BFS. None si s no existe en el grafo.
         :rtype: Grafo or None
         """
-        if(self.get_nodo(s) is None):
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
             print("ERROR: No existe el nodo de inicio en el grafo.")
             return None
-        capas = [[s]]
-        descubiertos = [s]
         arbol = Grafo(self.es_dirigido)
-        arbol.copiar_nodo(self.get_nodo(s))
-        for capa in capas:
-            capas.append([])
-            for nodoActual in capa:
-                for vecino in self.get_nodo(nodoActual).vecinos:
-                    id = vecino[0].identificador
-                    if id not in descubiertos:
-                        descubiertos.append(id)
-                        capas[-1].append(id)
-                        arbol.copiar_nodo(vecino[0])
-                        arbol.conectar_nodos(self.get_nodo(nodoActual).identificador, id)
-            if not capas[-1]:
-                capas.pop()
+        copias = {}
+        for nodo, padre, _ in self._recorrido_BFS(nodo_s):
+            arbol.copiar_nodo(nodo)
+            copias[nodo] = arbol.nodos[-1]
+            if padre is not None:
+                arbol._conectar(copias[padre], copias[nodo], Arista())
         return arbol
 
+    def BFS_padres(self, s):
+        """
+        Recorrido "Breadth First Search" que sólo calcula el padre y la profundidad de cada nodo alcanzado, sin generar un árbol.
+
+        :param s: ID del nodo de inicio.
+        :return: Tupla (padres, profundidad) de diccionarios ID -> ID del padre (None para s) e ID -> profundidad. 
+            Sólo contienen los nodos alcanzados. None si s no existe en el grafo.
+        :rtype: (dict, dict) or None
+        """
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
+            print("ERROR: No existe el nodo de inicio en el grafo.")
+            return None
+        padres = {}
+        profundidad = {}
+        for nodo, padre, nivel in self._recorrido_BFS(nodo_s):
+            padres[nodo.identificador] = None if padre is None else padre.identificador
+            profundidad[nodo.identificador] = nivel
+        return (padres, profundidad)
+
+    def BFS_capas(self, s):
+        """
+        Generador que recorre el grafo con "Breadth First Search" y devuelve una capa a la vez.
+        Si s no existe en el grafo no devuelve ninguna capa.
+
+        :param s: ID del nodo de inicio.
+        :return: Listas con los IDs de cada capa, comenzando con [s].
+        :rtype: generator(list)
+        """
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
+            print("ERROR: No existe el nodo de inicio en el grafo.")
+            return
+        visitados = {nodo_s}
+        capa = [nodo_s]
+        while capa:
+            yield [nodo.identificador for nodo in capa]
+            siguiente = []
+            for nodo in capa:
+                for vecino in nodo.adyacencia:
+                    if vecino not in visitados:
+                        visitados.add(vecino)
+                        siguiente.append(vecino)
+            capa = siguiente
+
+    def _recorrido_BFS(self, nodo_s):
+        """Generador de tuplas (Nodo, Nodo padre, profundidad) en orden BFS desde nodo_s. O(V + E)."""
+        profundidad = {nodo_s: 0}
+        cola = deque([nodo_s])
+        yield (nodo_s, None, 0)
+        while cola:
+            nodo = cola.popleft()
+            nivel = profundidad[nodo] + 1
+            for vecino in nodo.adyacencia:
+                if vecino not in profundidad:
+                    profundidad[vecino] = nivel
+                    cola.append(vecino)
+                    yield (vecino, nodo, nivel)
+
     def DFS_iterativo(self, s):
         """
         Genera un grafo con el árbol inducido por el algorítmo de búsqueda "Depth First Search" de manera iterativa.
+        Cada arista del árbol se crea al descubrir el nodo hijo.
         
         :param s: ID del nodo de inicio. 
         :return: Árbol generado del grafo. None si s no existe en el grafo.
         :rtype: Grafo or None
         """
-        if(self.get_nodo(s) is None):
-            print("ERROR: No existe el nodo de inicio en el grafo")
-            return None
-        descubiertos = [self.get_nodo(s)]
-        index_nodo_raiz = 0
-        nodo_siguiente = None
-        arbol = Grafo(self.es_dirigido)
-        arbol.copiar_nodo(descubiertos[0])
-        while index_nodo_raiz > -1:
-            nodo_siguiente = None
-            for vecino in descubiertos[index_nodo_raiz].vecinos:
-                if (vecino[0] not in descubiertos):
-                    arbol.copiar_nodo(vecino[0])
-                    arbol.conectar_nodos(descubiertos[index_nodo_raiz].identificador, vecino[0].identificador)
-                    descubiertos.insert(index_nodo_raiz + 1, vecino[0])
-                    index_nodo_raiz += 1
-                    nodo_siguiente = vecino[0]
-                    break
-            if (nodo_siguiente is None):
-                index_nodo_raiz = (index_nodo_raiz - 1)
-        return arbol
+        return self._arbol_DFS(s, "descubrir")
 
     def DFS_recursivo(self, s):
         """
-        Genera un grafo con el árbol inducido por el algorítmo de búsqueda "Depth First Search" de manera recursiva.
+        Genera un grafo con el árbol inducido por el algorítmo de búsqueda "Depth First Search" en el orden de la versión recursiva:
+        cada arista del árbol se crea al terminar de explorar el nodo hijo. Se calcula con una pila explícita, por lo que no depende 
+        del límite de recursión de Python.
         
         :param s: ID del nodo de inicio. 
         :return: Árbol generado del grafo.None si s no existe en el grafo.
         :rtype: Grafo or None
         """
-        if(self.get_nodo(s) is None):
+        return self._arbol_DFS(s, "finalizar")
+
+    def _arbol_DFS(self, s, evento_arista):
+        """Árbol DFS desde s. Las aristas se crean en los eventos evento_arista ("descubrir" o "finalizar") del nodo hijo."""
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
             print("ERROR: No existe el nodo de inicio en el grafo")
             return None
-        arbol = self.DFS_llamada_recursiva(s)
-        for nodo in self.nodos:
-            nodo.propiedad.pop("dfs_visitado", "")
-        return arbol
-    
-    def DFS_llamada_recursiva(self, s):
-        """No invocar directamente. Para generar el DFS de manera recursiva utilice el método "DFS_recursivo"."""
-        if(self.get_nodo(s) is None):
-            return None
-        nodo_origen = self.get_nodo(s)
-        nodo_origen.definir_propiedad("dfs_visitado", True)
         arbol = Grafo(self.es_dirigido)
-        arbol.copiar_nodo(nodo_origen)        
-        for vecino in nodo_origen.vecinos:
-            if not vecino[0].propiedad.get("dfs_visitado", False):
-                arbol.nodos.extend(self.DFS_llamada_recursiva(vecino[0].identificador).nodos)
-                arbol.conectar_nodos(s, vecino[0].identificador)
+        copias = {}
+        for evento, nodo, padre in self._recorrido_DFS(nodo_s):
+            if evento == "descubrir":
+                arbol.copiar_nodo(nodo)
+                copias[nodo] = arbol.nodos[-1]
+            if evento == evento_arista and padre is not None:
+                arbol._conectar(copias[padre], copias[nodo], Arista())
         return arbol
+
+    def DFS_eventos(self, s):
+        """
+        Generador que recorre el grafo con "Depth First Search" y devuelve los eventos del recorrido.
+        Si s no existe en el grafo no devuelve ningún evento.
+
+        :param s: ID del nodo de inicio.
+        :return: Tuplas (evento, ID, ID del padre) donde evento es "descubrir" o "finalizar". El padre de s es None.
+        :rtype: generator((str, id, id))
+        """
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
+            print("ERROR: No existe el nodo de inicio en el grafo")
+            return
+        for evento, nodo, padre in self._recorrido_DFS(nodo_s):
+            yield (evento, nodo.identificador, None if padre is None else padre.identificador)
+
+    def DFS_preorden(self, s):
+        """
+        IDs de los nodos alcanzables desde s en el orden en el que los descubre "Depth First Search".
+
+        :param s: ID del nodo de inicio.
+        :rtype: list
+        """
+        return [id for evento, id, _ in self.DFS_eventos(s) if evento == "descubrir"]
+
+    def DFS_postorden(self, s):
+        """
+        IDs de los nodos alcanzables desde s en el orden en el que "Depth First Search" termina de explorarlos.
+
+        :param s: ID del nodo de inicio.
+        :rtype: list
+        """
+        return [id for evento, id, _ in self.DFS_eventos(s) if evento == "finalizar"]
+
+    def _recorrido_DFS(self, nodo_s):
+        """Generador de tuplas (evento, Nodo, Nodo padre) del DFS desde nodo_s con una pila explícita. O(V + E)."""
+        visitados = {nodo_s}
+        pila = [(nodo_s, None, iter(nodo_s.adyacencia))]
+        yield ("descubrir", nodo_s, None)
+        while pila:
+            nodo, padre, vecinos = pila[-1]
+            for vecino in vecinos:
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    pila.append((vecino, nodo, iter(vecino.adyacencia)))
+                    yield ("descubrir", vecino, nodo)
+                    break
+            else:
+                pila.pop()
+                yield ("finalizar", nodo, padre)
     
-    def Dijkstra(self, s):
+    def Dijkstra(self, s, destino=None, etiquetado=True, generar_arbol=True):
         """
         Genera un grafo generado con el algorítmo de Dijkstra, en el que se etiqueta cada nodo con las distancias a partir de el nodo s.
         Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+        Las distancias se calculan con Grafo.distancias_Dijkstra; los grafos de salida sólo se construyen si se solicitan.
         
         :param s: ID del nodo de inicio.
-        :return: Tupla donde el elemento [0] es una copia del grafo etiquetado con las distancias y [1] el árbol inducido. None si no se encuentra s.
+        :param destino: (Opcional) ID de un nodo. Si se proporciona, el cálculo se detiene al fijar su distancia.
+        :param bool etiquetado: (Opcional) Si es False no se genera la copia etiquetada del grafo.
+        :param bool generar_arbol: (Opcional) Si es False no se genera el árbol inducido.
+        :return: Tupla donde el elemento [0] es una copia del grafo etiquetado con las distancias y [1] el árbol inducido 
+            (None en los elementos no solicitados). None si no se encuentra s.
         :rtype: (Grafo, Grafo) or None
         """
-        if(self.get_nodo(s) is None):
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
             print("ERROR: No existe el nodo de inicio en el grafo")
             return None
-        dijkstra = self.duplicar()
-        arbol = Grafo(self.es_dirigido)
-        nodo_s = dijkstra.get_nodo(s)
-        nodo_s.definir_propiedad("color", "red")
-        for nodo in dijkstra.nodos:
-            arbol.copiar_nodo(nodo)
-            nodo.definir_propiedad("dja_distancia_min", math.inf)
-            nodo.definir_propiedad("dja_calculado", False)
-            nodo.definir_propiedad("dja_descubierto", False)
-            nodo.definir_propiedad("dja_anterior", None)
-            nodo.definir_propiedad("dja_dist_anterior", 0)
-        nodo_s.definir_propiedad("dja_distancia_min", 0)
-        nodos_descubiertos = [nodo_s]
-        for nodo_a_calcular in nodos_descubiertos:
-            if not nodo_a_calcular.propiedad["dja_calculado"]:
-                for vecino in nodo_a_calcular.vecinos:
-                    if not vecino[0].propiedad["dja_calculado"]:
-                        distancia = nodo_a_calcular.propiedad["dja_distancia_min"] + vecino[1].propiedad.get("distancia", 0)
-                        if distancia < vecino[0].propiedad["dja_distancia_min"]:
-                            vecino[0].definir_propiedad("dja_distancia_min", distancia)
-                            vecino[0].definir_propiedad("dja_anterior", nodo_a_calcular.identificador)
-                            vecino[0].definir_propiedad("dja_dist_anterior", vecino[1].propiedad.get("distancia", 0))
-                        if not vecino[0].propiedad["dja_descubierto"]:
-                            nodos_descubiertos.append(vecino[0])
-                            vecino[0].definir_propiedad("dja_descubierto", True)
-            nodo_a_calcular.definir_propiedad("dja_calculado", True)
-        for nodo in dijkstra.nodos:
-            nodo.propiedad.pop("dja_calculado", "")
-            nodo.propiedad.pop("dja_descubierto", "")
-            dist_anterior = nodo.propiedad.pop("dja_dist_anterior", 0)
-            anterior = nodo.propiedad.pop("dja_anterior", None)
-            arbol.get_nodo(nodo.identificador).definir_propiedad("dja_distancia_min", nodo.propiedad["dja_distancia_min"])
-            if (anterior is not None):
-                arbol.conectar_nodos(anterior, nodo.identificador, distancia=dist_anterior)
+        indice = self._indices_nodos()
+        nodo_destino = None if destino is None else self.get_nodo(destino)
+        distancias, anteriores, pesos_anteriores = self._Dijkstra_indices(indice[nodo_s], indice.get(nodo_destino, -1), indice)
+        dijkstra = None
+        arbol = None
+        if etiquetado:
+            dijkstra = self.duplicar()
+            dijkstra.get_nodo(s).definir_propiedad("color", "red")
+            for i in range(len(dijkstra.nodos)):
+                dijkstra.nodos[i].definir_propiedad("dja_distancia_min", distancias[i])
+        if generar_arbol:
+            arbol = Grafo(self.es_dirigido)
+            for i in range(len(self.nodos)):
+                arbol.copiar_nodo(self.nodos[i])
+            arbol.get_nodo(s).definir_propiedad("color", "red")
+            for i in range(len(self.nodos)):
+                arbol.nodos[i].definir_propiedad("dja_distancia_min", distancias[i])
+            for i in range(len(self.nodos)):
+                if anteriores[i] != -1:
+                    arbol.conectar_nodos(self.nodos[anteriores[i]].identificador, self.nodos[i].identificador, distancia=pesos_anteriores[i])
         return (dijkstra, arbol)
+
+    @_en_cache
+    def distancias_Dijkstra(self, s, destino=None):
+        """
+        Calcula las distancias mínimas desde s con el algorítmo de Dijkstra, sin generar grafos ni modificar propiedades.
+        Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+        Si se proporciona destino, sólo las distancias de los nodos fijados antes de detenerse son definitivas (el resto son cotas superiores).
+
+        :param s: ID del nodo de inicio.
+        :param destino: (Opcional) ID de un nodo. Si se proporciona, el cálculo se detiene al fijar su distancia.
+        :return: Tupla (distancias, anteriores) de listas alineadas con Grafo.nodos. distancias[i] es la distancia mínima al nodo i 
+            (math.inf si no se alcanzó) y anteriores[i] el índice en Grafo.nodos del nodo previo en el camino (-1 si no tiene). 
+            None si no se encuentra s.
+        :rtype: (list(float), list(int)) or None
+        """
+        nodo_s = self.get_nodo(s)
+        if(nodo_s is None):
+            print("ERROR: No existe el nodo de inicio en el grafo")
+            return None
+        indice = self._indices_nodos()
+        nodo_destino = None if destino is None else self.get_nodo(destino)
+        distancias, anteriores, _ = self._Dijkstra_indices(indice[nodo_s], indice.get(nodo_destino, -1), indice)
+        return (distancias, anteriores)
+
+    def _Dijkstra_indices(self, i_s, i_destino, indice):
+        """Dijkstra con heap sobre los índices de Grafo.nodos. Regresa las listas de distancias, anteriores y peso de la arista anterior."""
+        n = len(self.nodos)
+        nodos = self.nodos
+        distancias = [math.inf] * n
+        anteriores = [-1] * n
+        pesos_anteriores = [0] * n
+        calculado = [False] * n
+        distancias[i_s] = 0
+        heap = [(0, i_s)]
+        while heap:
+            distancia, i = heapq.heappop(heap)
+            if calculado[i]:
+                continue
+            calculado[i] = True
+            if i == i_destino:
+                break
+            for vecino in nodos[i].adyacencia.items():
+                j = indice[vecino[0]]
+                if not calculado[j]:
+                    peso = vecino[1].get_distancia()
+                    if distancia + peso < distancias[j]:
+                        distancias[j] = distancia + peso
+                        anteriores[j] = i
+                        pesos_anteriores[j] = peso
+                        heapq.heappush(heap, (distancias[j], j))
+        return (distancias, anteriores, pesos_anteriores)
+
+    @_en_cache
+    def camino_mas_corto(self, s, t, modo="bidireccional", escala_heuristica=1):
+        """
+        Calcula el camino más corto entre dos nodos sin resolver el grafo completo.
+        Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+
+        Modos disponibles:
+            "bidireccional": Dijkstra simultáneo desde s y desde t, se detiene cuando ambas búsquedas se encuentran.
+            "A*": Dijkstra guiado por la distancia euclidiana a t, tomada de las propiedades "x"/"y" (generar_geo_simple) 
+                o "dis_x"/"dis_y" (Distribucion). Sólo es exacto si cada arista mide al menos escala_heuristica veces la 
+                distancia entre las coordenadas de sus extremos.
+            "dijkstra": Dijkstra desde s que se detiene al fijar t.
+
+        :param s: ID del nodo de inicio.
+        :param t: ID del nodo final.
+        :param str modo: (Opcional) "bidireccional" (por defecto), "A*" o "dijkstra".
+        :param float escala_heuristica: (Opcional) Factor que multiplica la distancia euclidiana en el modo "A*".
+        :return: Tupla donde [0] es la lista de IDs del camino (vacía si t no es alcanzable) y [1] su costo (math.inf si no es alcanzable). 
+            None si no se encuentra s o t.
+        :rtype: (list, float) or None
+        """
+        resultado = self._camino_mas_corto(s, t, modo, escala_heuristica)
+        return None if resultado is None else (resultado[0], resultado[1])
+
+    def _camino_mas_corto(self, s, t, modo, escala_heuristica=1):
+        """Igual que Grafo.camino_mas_corto, pero regresa también la cantidad de nodos fijados (para comparar los modos)."""
+        nodo_s = self.get_nodo(s)
+        nodo_t = self.get_nodo(t)
+        if nodo_s is None or nodo_t is None:
+            print("ERROR: No se encuentra uno o ninguno de los nodos especificados." + "(" + str(s) + ", " + str(t) + ")")
+            return None
+        if nodo_s is nodo_t:
+            return ([s], 0, 1)
+        if modo == "bidireccional":
+            return self._camino_bidireccional(nodo_s, nodo_t)
+        if modo == "A*":
+            return self._camino_A_estrella(nodo_s, nodo_t, self._heuristica_euclidiana(nodo_t, escala_heuristica))
+        if modo == "dijkstra":
+            return self._camino_A_estrella(nodo_s, nodo_t, lambda nodo: 0)
+        print("ERROR: Modo de búsqueda desconocido. (" + str(modo) + ")")
+        return None
+
+    def _camino_A_estrella(self, nodo_s, nodo_t, heuristica):
+        """A* desde nodo_s hasta nodo_t. Con una heurística nula es Dijkstra con salida temprana."""
+        orden = itertools.count()
+        distancias = {nodo_s: 0}
+        anteriores = {nodo_s: None}
+        fijados = set()
+        heap = [(heuristica(nodo_s), next(orden), nodo_s)]
+        while heap:
+            _, _, nodo = heapq.heappop(heap)
+            if nodo in fijados:
+                continue
+            fijados.add(nodo)
+            if nodo is nodo_t:
+                return (Grafo._reconstruir_camino(anteriores, nodo_t), distancias[nodo_t], len(fijados))
+            distancia = distancias[nodo]
+            for vecino in nodo.adyacencia.items():
+                if vecino[0] not in fijados:
+                    nueva = distancia + vecino[1].get_distancia()
+                    if nueva < distancias.get(vecino[0], math.inf):
+                        distancias[vecino[0]] = nueva
+                        anteriores[vecino[0]] = nodo
+                        heapq.heappush(heap, (nueva + heuristica(vecino[0]), next(orden), vecino[0]))
+        return ([], math.inf, len(fijados))
+
+    def _camino_bidireccional(self, nodo_s, nodo_t):
+        """Dijkstra bidireccional entre nodo_s y nodo_t. En grafos dirigidos la búsqueda hacia atrás usa las aristas entrantes."""
+        if self.es_dirigido:
+            entrantes = self._aristas_entrantes()
+            adyacentes = (lambda nodo: nodo.adyacencia.items(), lambda nodo: entrantes.get(nodo, ()))
+        else:
+            adyacentes = (lambda nodo: nodo.adyacencia.items(), lambda nodo: nodo.adyacencia.items())
+        orden = itertools.count()
+        distancias = ({nodo_s: 0}, {nodo_t: 0})
+        anteriores = ({nodo_s: None}, {nodo_t: None})
+        fijados = (set(), set())
+        heaps = ([(0, next(orden), nodo_s)], [(0, next(orden), nodo_t)])
+        mejor = math.inf
+        encuentro = None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= mejor:
+                break
+            lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            distancia, _, nodo = heapq.heappop(heaps[lado])
+            if nodo in fijados[lado]:
+                continue
+            fijados[lado].add(nodo)
+            for vecino in adyacentes[lado](nodo):
+                nueva = distancia + vecino[1].get_distancia()
+                if nueva < distancias[lado].get(vecino[0], math.inf):
+                    distancias[lado][vecino[0]] = nueva
+                    anteriores[lado][vecino[0]] = nodo
+                    heapq.heappush(heaps[lado], (nueva, next(orden), vecino[0]))
+                if vecino[0] in distancias[1 - lado] and distancias[lado][vecino[0]] + distancias[1 - lado][vecino[0]] < mejor:
+                    mejor = distancias[lado][vecino[0]] + distancias[1 - lado][vecino[0]]
+                    encuentro = vecino[0]
+        asentados = len(fijados[0]) + len(fijados[1])
+        if encuentro is None:
+            return ([], math.inf, asentados)
+        camino = Grafo._reconstruir_camino(anteriores[0], encuentro)
+        nodo = anteriores[1][encuentro]
+        while nodo is not None:
+            camino.append(nodo.identificador)
+            nodo = anteriores[1][nodo]
+        return (camino, mejor, asentados)
+
+    def _aristas_entrantes(self):
+        """
+        Diccionario Nodo -> lista de (Nodo de, Arista) con las aristas que llegan a cada nodo. Se reconstruye sólo cuando 
+        cambia Grafo.version, así que las consultas repetidas sobre el mismo grafo no lo recorren completo.
+        """
+        if self._version_entrantes != self.version:
+            entrantes = {}
+            for nodo in self.nodos:
+                for vecino in nodo.adyacencia.items():
+                    entrantes.setdefault(vecino[0], []).append((nodo, vecino[1]))
+            self._entrantes = entrantes
+            self._version_entrantes = self.version
+        return self._entrantes
+
+    def _heuristica_euclidiana(self, nodo_t, escala):
+        """Función nodo -> distancia euclidiana (por escala) hasta nodo_t. Si t no tiene coordenadas la heurística es 0."""
+        for llave_x, llave_y in (("x", "y"), ("dis_x", "dis_y")):
+            x_t = nodo_t.get_propiedad(llave_x)
+            y_t = nodo_t.get_propiedad(llave_y)
+            if x_t is not None and y_t is not None:
+                return lambda nodo: escala * math.hypot(nodo.get_propiedad(llave_x, x_t) - x_t, nodo.get_propiedad(llave_y, y_t) - y_t)
+        return lambda nodo: 0
+
+    @staticmethod
+    def _reconstruir_camino(anteriores, nodo_final):
+        """Lista de IDs desde el origen hasta nodo_final siguiendo el diccionario Nodo -> Nodo anterior."""
+        camino = []
+        nodo = nodo_final
+        while nodo is not None:
+            camino.append(nodo.identificador)
+            nodo = anteriores[nodo]
+        camino.reverse()
+        return camino
+
+    def _indices_nodos(self):
+        """Diccionario Nodo -> índice en Grafo.nodos."""
+        return {self.nodos[i]: i for i in range(len(self.nodos))}
         
     def KruskalI(self):
         """
         Calcula el árbol de expansión mínima usando el algoritmo de Kruskal Inverso.
         Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+        Si el grafo no es conexo se obtiene un bosque de expansión mínima. No modifica el grafo original.
+        El resultado es siempre un Grafo no dirigido con copias de todos los nodos (en el orden de Grafo.nodos) y sólo la propiedad 
+        "distancia" en sus aristas, igual que en Grafo.KruskalD, Grafo.KruskalI y Grafo.Prim; en grafos dirigidos se ignora la dirección.
         
         :return: Tupla donde el elemento [0] es el árbol de expansión mínima y [1] es su peso total.
         :rtype: (Grafo, int)
         """
-        mst = self.duplicar()
-        mst.aristas.sort(key=Grafo.get_distancia_arista, reverse=True)
+        aristas = sorted(self.aristas, key=Grafo.get_distancia_arista, reverse=True)
+        #Una arista se elimina si sus extremos siguen conectados por las aristas que le siguen en el orden.
+        #Recorriendo el orden al revés, esas aristas son las ya unidas en el ConjuntoDisjunto (conectividad incremental),
+        #así que no es necesario copiar el grafo ni recorrerlo para cada arista.
+        conjuntos = ConjuntoDisjunto(self.nodos)
+        conservar = [False] * len(aristas)
+        for i in range(len(aristas) - 1, -1, -1):
+            conservar[i] = conjuntos.unir(aristas[i].extremos[0], aristas[i].extremos[1])
+        mst = Grafo(False)
         peso_total = 0
-        i = 0
-        while i < (len(mst.aristas)):
-            arista = mst.aristas[i]
-            if mst.esta_conectado(arista_a_remover=arista):
-                mst.desconectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador)
-            else:
-                peso_total += arista.propiedad["distancia"]
-                i += 1
+        for nodo in self.nodos:
+            mst.copiar_nodo(nodo)
+        for i in range(len(aristas)):
+            if conservar[i]:
+                arista = aristas[i]
+                mst.conectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador, distancia=arista.get_distancia())
+                peso_total += arista.get_distancia()
         return (mst, peso_total)
     
     def KruskalD(self):
         """
         Calcula el árbol de expansión mínima usando el algoritmo de Kruskal Directo.
         Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+        Los ciclos se detectan con un ConjuntoDisjunto, por lo que el costo es O(E log E). No modifica el grafo original.
+        El resultado es siempre un Grafo no dirigido con copias de todos los nodos (en el orden de Grafo.nodos) y sólo la propiedad 
+        "distancia" en sus aristas, igual que en Grafo.KruskalD, Grafo.KruskalI y Grafo.Prim; en grafos dirigidos se ignora la dirección.
         
         :return: Tupla donde el elemento [0] es el árbol de expansión mínima y [1] es su peso total.
         :rtype: (Grafo, int)
         """
         mst = Grafo(False)
-        aristas = self.aristas
-        aristas.sort(key=Grafo.get_distancia_arista)
         peso_total = 0
         for nodo in self.nodos:
             mst.copiar_nodo(nodo)
-        for arista in aristas:
-            if not (mst.hay_ciclo_desde(arista.extremos[0].identificador, arista_a_agregar=arista) or mst.hay_ciclo_desde(arista.extremos[1].identificador, arista_a_agregar=arista)):
-                mst.conectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador, distancia=arista.propiedad.get("distancia", 0))
-                peso_total += arista.propiedad.get("distancia", 0)
+        conjuntos = ConjuntoDisjunto(self.nodos)
+        for arista in sorted(self.aristas, key=Grafo.get_distancia_arista):
+            if conjuntos.unir(arista.extremos[0], arista.extremos[1]):
+                mst.conectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador, distancia=arista.get_distancia())
+                peso_total += arista.get_distancia()
         return (mst, peso_total)
     
     def Prim(self):
         """
         Calcula el árbol de expansión mínima usando el algoritmo de Prim.
         Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+        Las aristas candidato se mantienen en un heap y las que llegan a nodos ya agregados se descartan al extraerlas.
+        Si el grafo no es conexo se obtiene un bosque de expansión mínima.
+        El resultado es siempre un Grafo no dirigido con copias de todos los nodos (en el orden de Grafo.nodos) y sólo la propiedad 
+        "distancia" en sus aristas, igual que en Grafo.KruskalD, Grafo.KruskalI y Grafo.Prim; en grafos dirigidos se ignora la dirección.
 
         :return: Tupla donde el elemento [0] es el árbol de expansión mínima y [1] es su peso total.
         :rtype: (Grafo, int)
         """
-        if not self.nodos:
-            return (Grafo(False), 0)
-        aristas_candidato = []
         arbol = Grafo(False)
         peso = 0
-        arbol.copiar_nodo(self.nodos[0])
-        aristas_candidato.extend(self.nodos[0].vecinos)
-
-        while aristas_candidato:            
-            index_mas_corta = -1
-            min_peso = math.inf
-            for i in range(len(aristas_candidato)):
-                if (arbol.get_nodo(aristas_candidato[i][0].identificador) is None) and aristas_candidato[i][1].propiedad.get("distancia", 0) < min_peso:
-                    index_mas_corta = i
-                    min_peso = aristas_candidato[i][1].propiedad.get("distancia", 0) 
-            if index_mas_corta > -1:
-                arbol.copiar_nodo(aristas_candidato[index_mas_corta][0])
-                arbol.conectar_nodos(aristas_candidato[index_mas_corta][1].extremos[0].identificador,aristas_candidato[index_mas_corta][1].extremos[1].identificador, distancia=min_peso)
-                peso += min_peso
-                for vecino in aristas_candidato[index_mas_corta][0].vecinos:
-                    if arbol.get_nodo(vecino[0].identificador) is None:
-                        aristas_candidato.append(vecino)
-                aristas_candidato.pop(index_mas_corta)
-            a_remover = []
-            for arista in aristas_candidato:
-                if arbol.get_nodo(arista[0].identificador) is not None:
-                    a_remover.append(arista)
-            for arista in a_remover:
-                aristas_candidato.remove(arista)
-        return(arbol, peso)        
+        en_arbol = set()
+        orden = itertools.count() #desempate para no comparar nodos en el heap
+        #En grafos dirigidos también se siguen las aristas que llegan a cada nodo, como en Kruskal.
+        entrantes = self._aristas_entrantes() if self.es_dirigido else {}
+        for nodo in self.nodos:
+            arbol.copiar_nodo(nodo)
+        for raiz in self.nodos:
+            if raiz in en_arbol:
+                continue
+            en_arbol.add(raiz)
+            aristas_candidato = []
+            for vecino in itertools.chain(raiz.adyacencia.items(), entrantes.get(raiz, ())):
+                heapq.heappush(aristas_candidato, (vecino[1].get_distancia(), next(orden), raiz, vecino[0]))
+            while aristas_candidato:
+                distancia, _, nodo_de, nodo_a = heapq.heappop(aristas_candidato)
+                if nodo_a in en_arbol:
+                    continue
+                en_arbol.add(nodo_a)
+                arbol.conectar_nodos(nodo_de.identificador, nodo_a.identificador, distancia=distancia)
+                peso += distancia
+                for vecino in itertools.chain(nodo_a.adyacencia.items(), entrantes.get(nodo_a, ())):
+                    if vecino[0] not in en_arbol:
+                        heapq.heappush(aristas_candidato, (vecino[1].get_distancia(), next(orden), nodo_a, vecino[0]))
+        return (arbol, peso)
 
     def get_distancia_arista(arista):
         """
         Función para ordenar las aristas por distancia usando list.sort.
-        Si desea consultar una propiedad, obtenga el valor directamente del diccionario Arista.propiedad (Arista.propiedad.get())
+        Si desea consultar una propiedad, utilice Arista.get_propiedad o el diccionario Arista.propiedad.
         """
-        return arista.propiedad.get("distancia", 0)
+        return arista.get_distancia()
     
     def hay_ciclo_desde(self, s, arista_a_agregar=None):
         """
@@ -397,7 +1044,7 @@ class Grafo:
         nodo_siguiente = None
         while index_nodo_raiz > -1:
             nodo_siguiente = None
-            for vecino in descubiertos[index_nodo_raiz].vecinos:
+            for vecino in descubiertos[index_nodo_raiz].adyacencia.items():
                 if not vecino[1] in aristas_recorridas:
                     aristas_recorridas.append(vecino[1])
                     if (vecino[0] not in descubiertos):
@@ -415,9 +1062,11 @@ class Grafo:
             self.desconectar_nodos(arista_a_agregar.extremos[0].identificador, arista_a_agregar.extremos[1].identificador)
         return False
     
+    @_en_cache
     def esta_conectado(self, arista_a_remover=None):
         """
         Indica si el grafo está conectado.
+        Para obtener las componentes utilice Grafo.componentes_conexas y para las aristas que desconectan el grafo, Grafo.puentes.
 
         :param arista_a_remover: (Opcional) Arista que se ignora al evaluar el grafo, sin removerla del original.
         :return: True si no hay nodos aislados, False si sí. Si no existen nodos, se evaluará como True.
@@ -425,16 +1074,15 @@ class Grafo:
         """
         if not self.nodos:
             return True
-        nodos_visitados = []
-        grafo = self if arista_a_remover is None else self.duplicar() 
-        if arista_a_remover is not None:
-            grafo.desconectar_nodos(arista_a_remover.extremos[0].identificador, arista_a_remover.extremos[1].identificador)
-        nodos_visitados.append(grafo.nodos[0])
-        for nodo in nodos_visitados:
-            for vecino in nodo.vecinos:
-                if vecino[0] not in nodos_visitados:
-                    nodos_visitados.append(vecino[0])
-        return len(nodos_visitados) == len(grafo.nodos)
+        nodos_visitados = {self.nodos[0]}
+        pendientes = [self.nodos[0]]
+        while pendientes:
+            nodo = pendientes.pop()
+            for vecino in nodo.adyacencia.items():
+                if vecino[1] is not arista_a_remover and vecino[0] not in nodos_visitados:
+                    nodos_visitados.add(vecino[0])
+                    pendientes.append(vecino[0])
+        return len(nodos_visitados) == len(self.nodos)
     
     def duplicar(self):
         """
@@ -446,11 +1094,119 @@ class Grafo:
         copia = Grafo(self.es_dirigido)
         for nodo in self.nodos:
             copia.copiar_nodo(nodo)
-        for arista in self.aristas:
-            copia.conectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador)
-            copia.aristas[-1].propiedad = arista.propiedad.copy()
+        for arista in self._aristas.values():
+            copia.conectar_nodos(arista.extremos[0].identificador, arista.extremos[1].identificador).copiar_propiedades(arista)
         return copia
 
+    def compilar(self):
+        """
+        Genera una representación compacta (CSR) e inmutable del grafo para algoritmos de sólo lectura.
+        Las propiedades se descartan, excepto "distancia" de las aristas, que se guarda como peso (0 si no existe).
+        
+        :returns: Grafo compacto equivalente.
+        :rtype: GrafoCompacto
+        """
+        indice = self._indices_nodos()
+        desplazamientos = array('q', [0])
+        vecinos = array('q')
+        pesos = array('d')
+        for nodo in self.nodos:
+            for vecino in nodo.adyacencia.items():
+                vecinos.append(indice[vecino[0]])
+                pesos.append(vecino[1].get_distancia())
+            desplazamientos.append(len(vecinos))
+        return GrafoCompacto([nodo.identificador for nodo in self.nodos], desplazamientos, vecinos, pesos, self.es_dirigido)
+
+    def guardar_binario(self, ruta):
+        """
+        Guarda el grafo en el formato binario de P-Grafos (ver GrafoCompacto.guardar_binario). Sólo se conservan los 
+        identificadores, las conexiones y la propiedad "distancia" de las aristas.
+
+        :param str ruta: Ruta del archivo.
+        """
+        self.compilar().guardar_binario(ruta)
+
+    @staticmethod
+    def cargar_binario(ruta, validar=True):
+        """
+        Carga un grafo binario de P-Grafos mapeando el archivo en memoria (ver GrafoCompacto.cargar_binario).
+        Para obtener un Grafo con objetos Nodo y Arista utilice GrafoCompacto.a_grafo sobre el resultado y después 
+        GrafoCompacto.cerrar para liberar el archivo.
+
+        :param str ruta: Ruta del archivo.
+        :param bool validar: (opcional) Revisar los desplazamientos y vecinos del archivo (= True si no se especifica).
+        :return: Grafo compacto. None si el archivo no existe, no tiene el formato esperado, está incompleto o dañado.
+        :rtype: GrafoCompacto or None
+        """
+        return GrafoCompacto.cargar_binario(ruta, validar)
+
+    def BFS_multiple(self, fuentes = None, procesos = None, flujo = False):
+        """
+        Profundidad BFS desde varios nodos en procesos paralelos, sobre una copia compacta del grafo (ver GrafoCompacto.BFS_multiple).
+        Las columnas de cada fila siguen el orden de Grafo.nodos.
+
+        :param fuentes: (opcional) Iterable con los IDs de los nodos de inicio (= todos los nodos si no se especifica).
+        :param int procesos: (opcional) Número de procesos (= os.cpu_count() si no se especifica).
+        :param bool flujo: (opcional) Devolver un generador de tuplas (id, profundidad) en lugar de la matriz (= False si no se especifica).
+        :rtype: list or generator or None
+        """
+        return self.compilar().BFS_multiple(fuentes, procesos, flujo)
+
+    def Dijkstra_multiple(self, fuentes = None, procesos = None, flujo = False):
+        """
+        Distancias mínimas desde varios nodos en procesos paralelos, sobre una copia compacta del grafo 
+        (ver GrafoCompacto.Dijkstra_multiple). Las columnas de cada fila siguen el orden de Grafo.nodos.
+        Requiere de la propiedad "distancia" en las aristas, de otra forma se tomará el valor como 0.
+
+        :param fuentes: (opcional) Iterable con los IDs de los nodos de inicio (= todos los nodos si no se especifica).
+        :param int procesos: (opcional) Número de procesos (= os.cpu_count() si no se especifica).
+        :param bool flujo: (opcional) Devolver un generador de tuplas (id, distancias) en lugar de la matriz (= False si no se especifica).
+        :rtype: list or generator or None
+        """
+        return self.compilar().Dijkstra_multiple(fuentes, procesos, flujo)
+
+    @_en_cache
+    def componentes_conexas(self):
+        """
+        Componentes conexas en tiempo O(V + E), sobre una copia compacta del grafo (ver GrafoCompacto.componentes_conexas).
+        En grafos dirigidos se obtienen las débilmente conexas; para las fuertemente conexas utilice Grafo.componentes_fuertes.
+
+        :return: Tupla (cantidad, etiquetas) donde etiquetas[i] es la componente (0 a cantidad - 1) del nodo Grafo.nodos[i].
+        :rtype: (int, array('q'))
+        """
+        return self.compilar().componentes_conexas()
+
+    @_en_cache
+    def componentes_fuertes(self):
+        """
+        Componentes fuertemente conexas con el algoritmo de Tarjan iterativo, en tiempo O(V + E) (ver GrafoCompacto.componentes_fuertes).
+
+        :return: Tupla (cantidad, etiquetas) donde etiquetas[i] es la componente (0 a cantidad - 1) del nodo Grafo.nodos[i].
+        :rtype: (int, array('q'))
+        """
+        return self.compilar().componentes_fuertes()
+
+    @_en_cache
+    def puentes(self):
+        """
+        Aristas cuya eliminación desconecta su componente (se considera el grafo como no dirigido), en tiempo O(V + E).
+
+        :return: Lista de parejas (id_de, id_a) de los extremos de cada puente.
+        :rtype: list((id, id))
+        """
+        ids = [nodo.identificador for nodo in self.nodos]
+        return [(ids[i], ids[j]) for i, j in self.compilar().puentes()]
+
+    @_en_cache
+    def puntos_articulacion(self):
+        """
+        Nodos cuya eliminación desconecta su componente (se considera el grafo como no dirigido), en tiempo O(V + E).
+
+        :return: Lista con los IDs de los puntos de articulación, en el orden de Grafo.nodos.
+        :rtype: list
+        """
+        return [self.nodos[i].identificador for i in self.compilar().puntos_articulacion()]
+
     @classmethod
     def generar_malla(cls, n, m, es_dirigido = False):
         """
@@ -461,16 +1217,13 @@ class Grafo:
         :return: Grafo generado
         :rtype: Grafo
         """
-        grafo = cls(es_dirigido)
-        for i in range(n):
-            for j in range(m):
-                id_actual = j + (i * m)
-                grafo.crear_nodo(id_actual)
-                if (id_actual % m) != 0:
-                    grafo.conectar_nodos(id_actual, id_actual - 1)
-                if id_actual >= m:
-                    grafo.conectar_nodos(id_actual, id_actual - m)
-        return grafo
+        pares = []
+        for id_actual in range(n * m):
+            if (id_actual % m) != 0:
+                pares.append((id_actual, id_actual - 1))
+            if id_actual >= m:
+                pares.append((id_actual, id_actual - m))
+        return cls.desde_aristas(range(n * m), pares, es_dirigido = es_dirigido)
     
     @classmethod
     def generar_ErdosRenyi(cls, n, m, es_dirigido = False):
@@ -482,90 +1235,245 @@ class Grafo:
         :return: Grafo generado
         :rtype: Grafo
         """
-        grafo = cls(es_dirigido)
-        for i in range(n):
-            grafo.crear_nodo(i)
+        pares = []
         for i in range(m):
             n_de = random.randrange(0, n)
             n_a = random.randrange(0, n)
             if n_de == n_a:
                 n_a = (n_a + 1) % n
-            grafo.conectar_nodos(n_de, n_a)
-        return grafo
+            pares.append((n_de, n_a))
+        return cls.desde_aristas(range(n), pares, es_dirigido = es_dirigido)
     
     @classmethod
-    def generar_Gilbert(cls, n, p, es_dirigido = False):
+    def generar_Gilbert(cls, n, p, es_dirigido = False, semilla = None, usar_numpy = False):
         """
-        Crea un gráfo con el modelo de Gilbert. Define n nodos con p probabilidad de cada uno conectarse con el resto.
+        Crea un gráfo con el modelo de Gilbert G(n, p). Define n nodos y conecta cada pareja con probabilidad p.
+        En grafos no dirigidos cada pareja i > j se conecta de i a j; en dirigidos se considera cada pareja ordenada (i, j) con i != j.
+        Usa el método de saltos geométricos de Batagelj-Brandes, en tiempo O(n + m).
 
         :param int n: Cantidad de nodos
-        :param float p: Valor entre 0 y 1. Probabilidad de conectar un nodo con cada nodo anterior.
+        :param float p: Valor entre 0 y 1. Probabilidad de conectar cada pareja de nodos.
+        :param semilla: (opcional) Semilla del generador aleatorio. Si es None se usa el generador global del módulo random.
+        :param bool usar_numpy: (opcional) Generar las aristas por bloques con NumPy (= False si no se especifica).
         :return: Grafo generado
         :rtype: Grafo
         """
-        p = min(p, 1) * 100
-        grafo = cls(es_dirigido)
-        for i in range(n):
-            grafo.crear_nodo(i)
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    break
-                if(random.randint(0, 100) <= p):
-                    grafo.conectar_nodos(i, j)
-        return grafo
-    
+        return cls.desde_aristas(range(n), cls._pares_Gilbert(n, p, es_dirigido, semilla, usar_numpy), es_dirigido = es_dirigido)
+
+    @staticmethod
+    def _pares_Gilbert(n, p, es_dirigido, semilla, usar_numpy):
+        """
+        Genera las aristas de G(n, p) saltando entre parejas elegidas con saltos de distribución geométrica (Batagelj-Brandes).
+
+        :return: Generador de tuplas (i, j).
+        """
+        total = n * (n - 1) if es_dirigido else n * (n - 1) // 2
+        if p <= 0 or total == 0:
+            return
+        if usar_numpy and np is None:
+            print("ERROR: NumPy no está instalado. Se generarán las aristas sin NumPy.")
+            usar_numpy = False
+        if usar_numpy:
+            for origenes, destinos in Grafo._pares_Gilbert_numpy(n, min(p, 1), es_dirigido, semilla, total):
+                yield from zip(origenes.tolist(), destinos.tolist())
+            return
+        rng = random if semilla is None else random.Random(semilla)
+        if p >= 1:
+            for i in range(n):
+                for j in range(n):
+                    if i != j and (es_dirigido or j < i):
+                        yield (i, j)
+            return
+        log_q = math.log(1 - p)
+        aleatorio = rng.random
+        log = math.log
+        if es_dirigido:
+            #Índice lineal k sobre las parejas ordenadas: i = k // (n - 1), j = k % (n - 1) saltando la diagonal.
+            k = -1
+            while True:
+                k += 1 + int(log(1 - aleatorio()) / log_q)
+                if k >= total:
+                    return
+                i, j = divmod(k, n - 1)
+                yield (i, j + 1 if j >= i else j)
+        i = 1
+        j = -1
+        while i < n:
+            j += 1 + int(log(1 - aleatorio()) / log_q)
+            while j >= i and i < n:
+                j -= i
+                i += 1
+            if i < n:
+                yield (i, j)
+
+    @staticmethod
+    def _pares_Gilbert_numpy(n, p, es_dirigido, semilla, total):
+        """
+        Versión por bloques de Grafo._pares_Gilbert: los saltos se generan con numpy.random.Generator.geometric y los 
+        índices lineales se convierten a parejas de nodos de forma vectorizada.
+
+        :return: Generador de tuplas (origenes, destinos) de arreglos de NumPy.
+        """
+        rng = np.random.default_rng(semilla)
+        bloque = max(1024, min(1 << 20, int(total * p * 1.1) + 1))
+        ultimo = -1
+        while ultimo < total:
+            k = ultimo + np.cumsum(rng.geometric(p, size=bloque), dtype=np.int64)
+            ultimo = int(k[-1])
+            k = k[k < total]
+            if es_dirigido:
+                origenes, destinos = np.divmod(k, n - 1)
+                destinos += destinos >= origenes
+            else:
+                #k = i(i-1)/2 + j con j < i; la raíz se corrige por si el redondeo se equivoca en una unidad.
+                origenes = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+                origenes -= origenes * (origenes - 1) // 2 > k
+                origenes += (origenes + 1) * origenes // 2 <= k
+                destinos = k - origenes * (origenes - 1) // 2
+            yield (origenes, destinos)
+
     @classmethod
-    def generar_geo_simple(cls, n, r, es_dirigido = False):
+    def generar_geo_simple(cls, n, r, es_dirigido = False, con_distancia = False, compacto = False):
         """
-        Crea un gráfo con el método geográfico simple. Define n nodos con coordenadas aleatorias normales. 
-        Se conectan aquellos entre distancia menor o igual a r.
+        Crea un gráfo con el método geográfico simple. Define n nodos con coordenadas aleatorias uniformes "x", "y" en [0, 1). 
+        Se conectan aquellos entre distancia euclidiana menor o igual a r (la arista va del nodo con mayor índice al menor).
+        Los puntos se agrupan en una malla de celdas de lado r y sólo se comparan los de celdas vecinas, en tiempo esperado O(n + m).
 
         :param int n: Cantidad de nodos
-        :param float r: Valor entre 0 y 1. Distancia mínima para conectarse.
+        :param float r: Valor entre 0 y 1. Distancia máxima para conectarse.
+        :param bool con_distancia: (opcional) Guardar la distancia entre los nodos como "distancia" de la arista (= False si no se especifica).
+        :param bool compacto: (opcional) Generar directamente un GrafoCompacto a partir de los arreglos de aristas, sin objetos Nodo 
+        ni Arista (= False si no se especifica). Las coordenadas no se conservan; los pesos son la distancia si con_distancia, 0 si no.
         :return: Grafo generado
-        :rtype: Grafo
+        :rtype: Grafo or GrafoCompacto
         """
         r = min(r, 1)
-        grafo = cls(es_dirigido)
-        for i in range(n):
-            grafo.crear_nodo(i, x = random.random(), y = random.random())
+        x = []
+        y = []
         for i in range(n):
-            for j in range(n):
-                if i == j:
-                    break
-                if (r >= math.dist([grafo.get_nodo(i).propiedad["x"], grafo.get_nodo(i).propiedad["y"]],
-                                                 [grafo.get_nodo(j).propiedad["x"], grafo.get_nodo(i).propiedad["y"]])):
-                    grafo.conectar_nodos(i, j)
+            x.append(random.random())
+            y.append(random.random())
+        if compacto:
+            origenes = array('q')
+            destinos = array('q')
+            pesos = array('d')
+            for i, j, d in cls._pares_cercanos(x, y, r):
+                origenes.append(i)
+                destinos.append(j)
+                pesos.append(d if con_distancia else 0)
+            return GrafoCompacto.desde_aristas(list(range(n)), origenes, destinos, pesos, es_dirigido)
+        pares = []
+        distancias = []
+        for i, j, d in cls._pares_cercanos(x, y, r):
+            pares.append((i, j))
+            distancias.append(d)
+        grafo = cls.desde_aristas(range(n), pares, distancias if con_distancia else None, es_dirigido)
+        for nodo in grafo.nodos:
+            nodo.definir_propiedad("x", x[nodo.identificador])
+            nodo.definir_propiedad("y", y[nodo.identificador])
         return grafo
+
+    @staticmethod
+    def _pares_cercanos(x, y, r):
+        """
+        Genera los pares de puntos a distancia euclidiana menor o igual a r, usando una malla de celdas de lado r.
+        Cada par se compara sólo si sus celdas son iguales o adyacentes, y se genera una vez.
+
+        :param list x: Coordenadas horizontales.
+        :param list y: Coordenadas verticales.
+        :param float r: Distancia máxima.
+        :return: Generador de tuplas (i, j, distancia) con j < i.
+        """
+        if r <= 0:
+            return
+        celdas = {}
+        for i in range(len(x)):
+            celdas.setdefault((int(x[i] // r), int(y[i] // r)), []).append(i)
+        r2 = r * r
+        for (cx, cy), puntos in celdas.items():
+            #La misma celda y 4 de sus 8 vecinas: cada par de celdas adyacentes se visita una sola vez.
+            for vx, vy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                otros = celdas.get((cx + vx, cy + vy))
+                if otros is None:
+                    continue
+                misma = vx == 0 and vy == 0
+                for k, i in enumerate(puntos):
+                    xi = x[i]
+                    yi = y[i]
+                    for j in (puntos[k + 1:] if misma else otros):
+                        dx = xi - x[j]
+                        dy = yi - y[j]
+                        d2 = dx * dx + dy * dy
+                        if d2 <= r2:
+                            yield (i, j, math.sqrt(d2)) if j < i else (j, i, math.sqrt(d2))
     
     @classmethod
     def generar_BarbasiAlbert_variante(cls, n, d, es_dirigido = False):
         """
         Crea un gráfo con una variante del Método Barbasi-Albert.
+        Para el modelo Barabási-Albert estándar en tiempo lineal utilice Grafo.generar_BarabasiAlbert.
 
         :param int n: Cantidad de nodos
         :param int d: Grado máximo esperado por cada nodo.
         :return: Grafo generado
         :rtype: Grafo
         """
-        grafo = cls(es_dirigido)
-        grafo.crear_nodo(0)
+        #grados[j] es el tamaño de la adyacencia de j: en grafos dirigidos sólo cuentan las aristas que salen de j.
+        grados = [0] * max(n, 1)
+        pares = []
         nodos_revueltos = [0]
 
-        for i in range(1, n):
-            grafo.crear_nodo(i)
-            if d <= 0:
-                break
+        for i in range(1, n if d > 0 else 0):
             random.shuffle(nodos_revueltos)
             for j in nodos_revueltos:
-                probabilidad = 1 - (len(grafo.get_nodo(j).vecinos) / d)
+                probabilidad = 1 - (grados[j] / d)
                 if random.random() <= probabilidad:
-                    grafo.conectar_nodos(i,j)
-                if len(grafo.get_nodo(i).vecinos) == d:
+                    pares.append((i, j))
+                    grados[i] += 1
+                    if not es_dirigido:
+                        grados[j] += 1
+                if grados[i] == d:
                     break
             nodos_revueltos.append(i)
-        return grafo
+        return cls.desde_aristas(range(max(n, 1)), pares, es_dirigido = es_dirigido)
+    
+    @classmethod
+    def generar_BarabasiAlbert(cls, n, m, es_dirigido = False, semilla = None, compacto = False):
+        """
+        Crea un gráfo con el modelo Barabási-Albert. Los primeros m nodos no tienen aristas; el nodo m se conecta con todos ellos
+        y cada nodo siguiente se conecta con m nodos anteriores distintos, elegidos con probabilidad proporcional a su grado.
+        Los extremos de las aristas ya creadas forman la lista de la que se muestrea (un nodo aparece tantas veces como su grado),
+        por lo que cada elección es O(1) y el total es O(n + m·n).
+
+        :param int n: Cantidad de nodos
+        :param int m: Aristas agregadas por cada nodo nuevo (>= 1).
+        :param semilla: (opcional) Semilla del generador aleatorio. Si es None se usa el generador global del módulo random.
+        :param bool compacto: (opcional) Generar directamente un GrafoCompacto a partir de los arreglos de aristas, sin objetos Nodo 
+        ni Arista (= False si no se especifica).
+        :return: Grafo generado. Las aristas van del nodo nuevo al anterior.
+        :rtype: Grafo or GrafoCompacto
+        """
+        m = max(m, 1)
+        rng = random if semilla is None else random.Random(semilla)
+        aleatorio = rng.random
+        origenes = array('q')
+        destinos = array('q')
+        for nuevo in range(m, n):
+            if nuevo == m:
+                objetivos = range(m)
+            else:
+                #El extremo k de la lista de extremos es origenes[k // 2] o destinos[k // 2].
+                extremos = 2 * len(origenes)
+                objetivos = set()
+                while len(objetivos) < m:
+                    k = int(aleatorio() * extremos)
+                    objetivos.add(destinos[k >> 1] if k & 1 else origenes[k >> 1])
+            for objetivo in objetivos:
+                origenes.append(nuevo)
+                destinos.append(objetivo)
+        if compacto:
+            return GrafoCompacto.desde_aristas(list(range(n)), origenes, destinos, None, es_dirigido)
+        return cls.desde_aristas(range(n), zip(origenes, destinos), es_dirigido = es_dirigido)
     
     @classmethod
     def generar_DorogovtsevMendes(cls, n, es_dirigido = False):
@@ -578,60 +1486,125 @@ class Grafo:
         :rtype: Grafo
         """
         n = max(n, 3)
-        grafo = cls(es_dirigido)
-        grafo.crear_nodo(0)
-        grafo.crear_nodo(1)
-        grafo.crear_nodo(2)
-        grafo.conectar_nodos(0, 1)
-        grafo.conectar_nodos(1, 2)
-        grafo.conectar_nodos(2, 0)
+        pares = [(0, 1), (1, 2), (2, 0)]
+        #adyacencias[i] sigue el orden en que se llenaría nodo.adyacencia (en grafos dirigidos, sólo las aristas que salen de i).
+        adyacencias = [[1, 2], [0, 2], [1, 0]] if not es_dirigido else [[1], [2], [0]]
         for i in range(3, n):
-            grafo.crear_nodo(i)
             arista_de = random.randrange(0, i)
-            arista_a = grafo.get_nodo(arista_de).vecinos[random.randrange(0, len(grafo.get_nodo(arista_de).vecinos))][0].identificador
-            grafo.conectar_nodos(i, arista_de)
-            grafo.conectar_nodos(i, arista_a)
-        return grafo
+            arista_a = adyacencias[arista_de][random.randrange(0, len(adyacencias[arista_de]))]
+            pares.append((i, arista_de))
+            pares.append((i, arista_a))
+            adyacencias.append([arista_de, arista_a])
+            if not es_dirigido:
+                adyacencias[arista_de].append(i)
+                adyacencias[arista_a].append(i)
+        return cls.desde_aristas(range(n), pares, es_dirigido = es_dirigido)
     
     @classmethod
     def generar_desde_archivo(cls, ruta):
         """
-        Genera el grafo a partir de un archivo .gv creado por esta biblioteca.
+        Genera el grafo a partir de un archivo .gv (o .gv.gz) creado por esta biblioteca, incluyendo los atributos [llave=valor]
+        de nodos y aristas. Los valores que son literales de int, float o bool se convierten a ese tipo y los valores entre comillas se 
+        leen como str (con \\", \\\\ y \\n como escapes); los identificadores de los nodos se leen como str. En grafos no dirigidos, las líneas repetidas de una misma arista (a -- b y b -- a) se cargan una sola vez.
         
         :param str ruta: Ruta del archivo.
         :return: Grafo generado
         :rtype: Grafo
         """
-        grafo = None
-        conector = "--"
-
         if not os.path.exists(ruta):
             print("No se encuentra el archivo de grafo especificado. (" + str(ruta) + ")")
-            return grafo
-        
-        with open(ruta) as archivo:
-            for linea in archivo:
-                if grafo is None:
+            return None
+
+        es_dirigido = None
+        conector = "--"
+        ids = {} #texto del ID -> identificador
+        orden_ids = {} #identificadores en orden de aparición
+        pares = []
+        propiedades = [] #atributos de cada arista de pares (None si no tiene)
+        propiedades_nodos = {} #identificador -> atributos
+        completo = False
+        atributos_leidos = {} #texto de atributos -> diccionario (muchas aristas comparten los mismos atributos)
+
+        def obtener_id(texto):
+            id = ids.get(texto)
+            if id is None:
+                id = texto.strip()
+                if " " in id:
+                    id = id.replace(" ", "")
+                ids[texto] = id
+                orden_ids[id] = None
+            return id
+
+        def leer_atributos(texto):
+            atributos = atributos_leidos.get(texto)
+            if atributos is None:
+                atributos = Grafo._leer_atributos_gv(texto)
+                if len(atributos_leidos) < MAX_ATRIBUTOS_CACHE:
+                    atributos_leidos[texto] = atributos
+            return atributos
+
+        #Se reúnen los nodos y las aristas del archivo y el grafo se construye en un solo lote con Grafo.desde_aristas.
+        agregar_par = pares.append
+        agregar_propiedades = propiedades.append
+        buscar_id = ids.get
+        with sin_recolector():
+            with (gzip.open(ruta, 'rt') if ruta.endswith(".gz") else open(ruta, buffering=TAMANO_BUFFER)) as archivo:
+                for linea in archivo:
                     if linea.find('{') != -1:
-                        grafo = cls(linea.find("digraph") != -1)
-                        conector = ("->" if grafo.es_dirigido else "--")
-                else:
-                    if linea.find('}') != -1:
-                        return grafo
-                    conexion = linea.partition(conector)
-                    if not conexion[1] or not conexion[2]:
-                        conexion = linea.partition(';')
-                        if conexion[0]:
-                            nodo = conexion[0].replace(" ", "").strip()
-                            grafo.crear_nodo(nodo)
+                        es_dirigido = linea.find("digraph") != -1
+                        conector = ("->" if es_dirigido else "--")
+                        break
+                for linea in archivo:
+                    cuerpo, _, atributos = linea.partition('[')
+                    if cuerpo.find('}') != -1:
+                        completo = True
+                        break
+                    conexion = cuerpo.partition(conector)
+                    if conexion[1] and conexion[2].strip(" ;\n"):
+                        texto_a = conexion[2].partition(';')[0]
+                        agregar_par((buscar_id(conexion[0]) or obtener_id(conexion[0]), buscar_id(texto_a) or obtener_id(texto_a)))
+                        agregar_propiedades(leer_atributos(atributos) if atributos else None)
                     else:
-                        nodo_de = conexion[0].replace(" ","").strip()
-                        nodo_a = conexion[2].replace(" ","").strip()
-                        grafo.crear_nodo(nodo_de)
-                        grafo.crear_nodo(nodo_a)
-                        grafo.conectar_nodos(nodo_de, nodo_a)
+                        id = cuerpo.partition(';')[0]
+                        if id.strip():
+                            id = obtener_id(id)
+                            atributos = Grafo._leer_atributos_gv(atributos)
+                            if atributos:
+                                propiedades_nodos.setdefault(id, {}).update(atributos)
+            if es_dirigido is None:
+                return None
+            #Como al leer línea por línea: en grafos no dirigidos se conserva la primera línea de cada arista; en dirigidos, la última.
+            grafo = cls.desde_aristas(orden_ids, pares, es_dirigido=es_dirigido, propiedades=propiedades if any(propiedades) else None, 
+                                      reemplazar=es_dirigido)
+            for id, atributos in propiedades_nodos.items():
+                grafo._indice[id]._propiedad = atributos
+        if not completo:
             print("ADVERTENCIA: No se encontró marcador final del grafo. Verifique la integridad del archivo.")
-            return grafo
+        return grafo
+
+    @staticmethod
+    def _leer_atributos_gv(texto):
+        """Diccionario con los atributos llave=valor del texto que sigue a '[' en una línea GV."""
+        if not texto:
+            return {}
+        return {llave: Grafo._valor_gv(valor) for llave, valor in ATRIBUTO_GV.findall(LISTA_ATRIBUTOS_GV.match(texto).group())}
+
+    @staticmethod
+    def _valor_gv(texto):
+        """Convierte el texto de un atributo GV a int, float, bool o None si es una literal de ese tipo; si no, lo regresa como str (sin comillas)."""
+        if len(texto) >= 2 and texto[0] == '"' and texto[-1] == '"':
+            texto = texto[1:-1]
+            return ESCAPE_GV.sub(Grafo._sin_escape_gv, texto) if '\\' in texto else texto
+        if ENTERO_GV.fullmatch(texto):
+            return int(texto)
+        if REAL_GV.fullmatch(texto):
+            return float(texto)
+        return VALORES_GV.get(texto, texto)
+
+    @staticmethod
+    def _sin_escape_gv(coincidencia):
+        caracter = coincidencia.group(1)
+        return "\n" if caracter == "n" else caracter
 
 class Nodo:
     """
@@ -639,9 +1612,15 @@ class Nodo:
 
     Attributes:
         identificador: ID del nodo. Único dentro del grafo. Puede ser de cualquier tipo (str, int, etc..), pero deberá buscarse de la misma manera.
-        propiedad (dict): Diccionario con las propiedades del nodo (key:value).
-        vecinos (list((Nodo, Arista))): Lista con tuplas (Nodo, Arista) de los nodos hacia los que está conectado el Nodo.
+        propiedad (dict): Diccionario con las propiedades del nodo (key:value). Se crea al definir la primera propiedad o al consultarlo.
+        adyacencia (dict(Nodo: Arista)): Diccionario (en orden de conexión) con los nodos hacia los que está conectado el Nodo y la arista de cada uno.
+        vecinos (list((Nodo, Arista))): Lista con tuplas (Nodo, Arista) generada a partir de adyacencia (es una copia).
+
+    Para consultar propiedades sin crear el diccionario utilice Nodo.get_propiedad, Nodo.tiene_propiedades y Nodo.propiedades.
+    Los cambios de propiedades hechos con los métodos del nodo actualizan la versión del grafo que lo contiene.
     """
+    __slots__ = ("identificador", "_propiedad", "adyacencia", "_grafo")
+
     def __init__(self, id, **kwargs):
         """
         Crea un nodo. Se le pueden asignar propiedades.
@@ -649,13 +1628,28 @@ class Nodo:
         :param **kwargs: (Opcional) [Llave=valor] Define propiedades y sus valores para el nodo.
         """
         self.identificador = id
-        self.propiedad = {}
-        self.vecinos = [] ##tuplas (nodo, arista)
-        for llave, valor in kwargs.items():
-                self.propiedad[llave] = valor
+        self._propiedad = kwargs if kwargs else None
+        self.adyacencia = {} ##nodo -> arista
+        self._grafo = None #grafo (o tupla de grafos, ver Grafo.agregar_nodos) al que pertenece, para actualizar su versión
     
     def __str__(self):
         return str(self.identificador)
+
+    @property
+    def propiedad(self):
+        if self._propiedad is None:
+            self._propiedad = {}
+        return self._propiedad
+
+    @propiedad.setter
+    def propiedad(self, valor):
+        self._propiedad = valor
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
+    @property
+    def vecinos(self):
+        return list(self.adyacencia.items())
     
     def conectar_a(self, nodo, arista):
         """
@@ -665,11 +1659,9 @@ class Nodo:
         :param Nodo nodo: Nodo al que estará conectado. (Dirigido a)
         :param Arista arista: Arista mediante la cual estarán conectados los nodos.
         """
-        for vecino in self.vecinos:
-            if nodo is vecino[0]:
-                self.vecinos.remove(vecino)
+        self.adyacencia.pop(nodo, None)
         arista.definir_extremos(self, nodo)
-        self.vecinos.append((nodo, arista))
+        self.adyacencia[nodo] = arista
 
     def definir_propiedad(self, llave, valor):
         """
@@ -679,6 +1671,51 @@ class Nodo:
         :param valor: Valor que tendrá la propiedad.
         """
         self.propiedad[llave] = valor
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
+    def get_propiedad(self, llave, defecto=None):
+        """
+        Devuelve el valor de una propiedad sin crear el diccionario de propiedades.
+
+        :param str llave: Nombre de la propiedad
+        :param defecto: (Opcional) Valor devuelto si la propiedad no existe.
+        """
+        return defecto if self._propiedad is None else self._propiedad.get(llave, defecto)
+
+    def quitar_propiedad(self, llave):
+        """
+        Elimina una propiedad del nodo si existe.
+
+        :param str llave: Nombre de la propiedad
+        """
+        if self._propiedad:
+            self._propiedad.pop(llave, None)
+            if self._grafo is not None:
+                _nueva_version(self._grafo)
+
+    def tiene_propiedades(self):
+        """
+        :return: True si el nodo tiene al menos una propiedad.
+        :rtype: bool
+        """
+        return bool(self._propiedad)
+
+    def propiedades(self):
+        """
+        :return: Pares (llave, valor) de las propiedades del nodo, sin crear el diccionario si no existe.
+        """
+        return () if self._propiedad is None else self._propiedad.items()
+
+    def copiar_propiedades(self, nodo):
+        """
+        Reemplaza las propiedades del nodo por una copia de las de otro nodo.
+
+        :param Nodo nodo: Nodo del que se copian las propiedades.
+        """
+        self._propiedad = None if nodo._propiedad is None else nodo._propiedad.copy()
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
 
 
 class Arista:
@@ -687,23 +1724,48 @@ class Arista:
 
     Attributes:
         identificador: ID del nodo. Único dentro del grafo. Puede ser de cualquier tipo (str, int, etc..), pero deberá buscarse de la misma manera.
-        propiedad (dict): Diccionario con las propiedades de la arista (key:value).
+        propiedad (dict): Diccionario con las propiedades de la arista (key:value). Se crea al definir la primera propiedad distinta
+            de "distancia" o al consultarlo.
         extremos (Nodo, Nodo): Tupla de los nodos que conecta la arista. [0] es el nodo inicial, [1] es el final.
+
+    Mientras la arista sólo tenga "distancia", ésta se guarda en un atributo propio sin crear el diccionario.
+    Para consultar propiedades sin crear el diccionario utilice Arista.get_distancia, Arista.get_propiedad y Arista.propiedades.
+    Los cambios de propiedades hechos con los métodos de la arista actualizan la versión del grafo que la contiene.
     """
+    __slots__ = ("_propiedad", "_distancia", "extremos", "_grafo")
+
     def __init__(self, **kwargs):
         """
         Crea una arista. Se le pueden asignar propiedades.
 
         :param **kwargs: (Opcional) [Llave=valor] Define propiedades y sus valores para la arista.
         """
-        self.propiedad = {}
+        self._propiedad = None
+        self._distancia = None #sólo se usa mientras no exista el diccionario
         self.extremos = (None, None)
-        for llave, valor in kwargs.items():
-                self.propiedad[llave] = valor
+        self._grafo = None #grafo (o tupla de grafos, ver Grafo.agregar_nodos) al que pertenece, para actualizar su versión
+        if len(kwargs) == 1 and "distancia" in kwargs:
+            self._distancia = kwargs["distancia"]
+        elif kwargs:
+            self._propiedad = kwargs
     
     def __str__(self):
         return str(self.extremos[0]) + " --> " + str(self.extremos[1])
 
+    @property
+    def propiedad(self):
+        if self._propiedad is None:
+            self._propiedad = {} if self._distancia is None else {"distancia": self._distancia}
+            self._distancia = None
+        return self._propiedad
+
+    @propiedad.setter
+    def propiedad(self, valor):
+        self._propiedad = valor
+        self._distancia = None
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
     def definir_extremos(self, nodo_de, nodo_a):
         """
         Crea referencias a los nodos que conecta la arista.
@@ -720,7 +1782,1495 @@ class Arista:
         :param str llave: Nombre de la propiedad
         :param valor: Valor que tendrá la propiedad.
         """
-        self.propiedad[llave] = valor
+        if self._propiedad is None and llave == "distancia":
+            self._distancia = valor
+        else:
+            self.propiedad[llave] = valor
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
+    def get_distancia(self):
+        """
+        :return: Valor de la propiedad "distancia", 0 si no existe.
+        """
+        if self._propiedad is None:
+            return 0 if self._distancia is None else self._distancia
+        return self._propiedad.get("distancia", 0)
+
+    def get_propiedad(self, llave, defecto=None):
+        """
+        Devuelve el valor de una propiedad sin crear el diccionario de propiedades.
+
+        :param str llave: Nombre de la propiedad
+        :param defecto: (Opcional) Valor devuelto si la propiedad no existe.
+        """
+        if self._propiedad is None:
+            return self._distancia if (llave == "distancia" and self._distancia is not None) else defecto
+        return self._propiedad.get(llave, defecto)
+
+    def quitar_propiedad(self, llave):
+        """
+        Elimina una propiedad de la arista si existe.
+
+        :param str llave: Nombre de la propiedad
+        """
+        if self._propiedad is None:
+            if llave == "distancia":
+                self._distancia = None
+        else:
+            self._propiedad.pop(llave, None)
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
+    def tiene_propiedades(self):
+        """
+        :return: True si la arista tiene al menos una propiedad.
+        :rtype: bool
+        """
+        return self._distancia is not None or bool(self._propiedad)
+
+    def propiedades(self):
+        """
+        :return: Pares (llave, valor) de las propiedades de la arista, sin crear el diccionario si no existe.
+        """
+        if self._propiedad is None:
+            return () if self._distancia is None else (("distancia", self._distancia),)
+        return self._propiedad.items()
+
+    def copiar_propiedades(self, arista):
+        """
+        Reemplaza las propiedades de la arista por una copia de las de otra arista.
+
+        :param Arista arista: Arista de la que se copian las propiedades.
+        """
+        self._propiedad = None if arista._propiedad is None else arista._propiedad.copy()
+        self._distancia = arista._distancia
+        if self._grafo is not None:
+            _nueva_version(self._grafo)
+
+class ConjuntoDisjunto:
+    """
+    Estructura Union-Find (conjuntos disjuntos) con compresión de caminos y unión por rango.
+    Los elementos pueden ser de cualquier tipo hashable (Nodo, identificadores, índices, etc..).
+    """
+    def __init__(self, elementos=()):
+        """
+        Crea un conjunto unitario por cada elemento.
+
+        :param elementos: (Opcional) Iterable con los elementos iniciales.
+        """
+        self.padre = {}
+        self.rango = {}
+        for elemento in elementos:
+            self.agregar(elemento)
+
+    def agregar(self, elemento):
+        """
+        Agrega un elemento en su propio conjunto si aún no existe.
+
+        :param elemento: Elemento a agregar.
+        """
+        if elemento not in self.padre:
+            self.padre[elemento] = elemento
+            self.rango[elemento] = 0
+
+    def encontrar(self, elemento):
+        """
+        Devuelve el representante del conjunto que contiene al elemento, comprimiendo el camino recorrido.
+
+        :param elemento: Elemento a buscar. Se agrega si no existe.
+        :return: Representante del conjunto.
+        """
+        self.agregar(elemento)
+        padre = self.padre
+        raiz = elemento
+        while padre[raiz] != raiz:
+            raiz = padre[raiz]
+        while padre[elemento] != raiz:
+            padre[elemento], elemento = raiz, padre[elemento]
+        return raiz
+
+    def unir(self, a, b):
+        """
+        Une los conjuntos que contienen a los elementos a y b.
+
+        :return: True si estaban en conjuntos distintos, False si ya estaban unidos.
+        :rtype: bool
+        """
+        raiz_a = self.encontrar(a)
+        raiz_b = self.encontrar(b)
+        if raiz_a == raiz_b:
+            return False
+        if self.rango[raiz_a] < self.rango[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padre[raiz_b] = raiz_a
+        if self.rango[raiz_a] == self.rango[raiz_b]:
+            self.rango[raiz_a] += 1
+        return True
+
+    def conectados(self, a, b):
+        """
+        Indica si los elementos a y b pertenecen al mismo conjunto.
+
+        :rtype: bool
+        """
+        return self.encontrar(a) == self.encontrar(b)
+
+class DijkstraDinamico:
+    """
+    Árbol de caminos más cortos desde un nodo s que se repara al cambiar las aristas, en lugar de recalcular Grafo.Dijkstra.
+    Se construye con Grafo.distancias_Dijkstra y sigue el método de Ramalingam-Reps:
+        Si una arista se agrega o su distancia disminuye, se propaga la mejora con Dijkstra sólo desde su nodo final.
+        Si una arista del árbol se elimina o su distancia aumenta, sólo el subárbol que cuelga de ella puede cambiar: se 
+        recalculan sus distancias a partir de las aristas que llegan desde fuera del subárbol.
+    Cada modificación regresa el conjunto de IDs de los nodos cuya distancia o nodo anterior en el árbol cambió.
+
+    Las modificaciones deben hacerse con los métodos de esta clase, que también modifican el grafo. Requiere de la propiedad 
+    "distancia" en las aristas, de otra forma se tomará el valor como 0; las distancias negativas no están soportadas.
+
+    Attributes:
+        grafo (Grafo): Grafo sobre el que se calculan los caminos.
+        nodo_s (Nodo): Nodo de inicio.
+    """
+    def __init__(self, grafo, s):
+        """
+        :param Grafo grafo: Grafo sobre el que se calculan los caminos.
+        :param s: ID del nodo de inicio.
+        """
+        self.grafo = grafo
+        self.nodo_s = grafo.get_nodo(s)
+        self._distancias = {} #Nodo -> distancia; los nodos no alcanzados no aparecen
+        self._anteriores = {} #Nodo -> Nodo anterior en el árbol
+        self._hijos = {} #Nodo -> set(Nodo) hijos en el árbol
+        self._entrantes = None #Nodo -> {Nodo: Arista} aristas que llegan a cada nodo (sólo en grafos dirigidos)
+        if self.nodo_s is None:
+            print("ERROR: No existe el nodo de inicio en el grafo")
+            return
+        distancias, anteriores = grafo.distancias_Dijkstra(s)
+        nodos = grafo.nodos
+        for i, nodo in enumerate(nodos):
+            if distancias[i] != math.inf:
+                self._distancias[nodo] = distancias[i]
+                if anteriores[i] != -1:
+                    self._definir_anterior(nodo, nodos[anteriores[i]])
+        if grafo.es_dirigido:
+            self._entrantes = {}
+            for (nodo_de, nodo_a), arista in grafo._aristas.items():
+                self._entrantes.setdefault(nodo_a, {})[nodo_de] = arista
+
+    def distancia(self, id):
+        """
+        :param id: ID del nodo.
+        :return: Distancia mínima desde s hasta el nodo. math.inf si no se alcanza o no existe.
+        :rtype: float
+        """
+        return self._distancias.get(self.grafo.get_nodo(id), math.inf)
+
+    def camino(self, id):
+        """
+        :param id: ID del nodo.
+        :return: Lista de IDs desde s hasta el nodo. None si no se alcanza o no existe.
+        :rtype: list or None
+        """
+        nodo = self.grafo.get_nodo(id)
+        if nodo not in self._distancias:
+            return None
+        camino = [nodo.identificador]
+        while nodo in self._anteriores:
+            nodo = self._anteriores[nodo]
+            camino.append(nodo.identificador)
+        camino.reverse()
+        return camino
+
+    def conectar_nodos(self, id_de, id_a, **kwargs):
+        """
+        Conecta 2 nodos del grafo (ver Grafo.conectar_nodos) y repara el árbol.
+
+        :return: Conjunto de IDs de los nodos cuya distancia o nodo anterior cambió. None si no se encuentra alguno de los nodos.
+        :rtype: set or None
+        """
+        anterior = self.grafo.get_arista(id_de, id_a)
+        peso_anterior = None if anterior is None else anterior.get_distancia()
+        arista = self.grafo.conectar_nodos(id_de, id_a, **kwargs)
+        if arista is None:
+            return None
+        if self._entrantes is not None:
+            self._entrantes.setdefault(arista.extremos[1], {})[arista.extremos[0]] = arista
+        return self._reparar(arista.extremos[0], arista.extremos[1], peso_anterior, arista.get_distancia())
+
+    def desconectar_nodos(self, id_de, id_a):
+        """
+        Desconecta 2 nodos del grafo (ver Grafo.desconectar_nodos) y repara el árbol.
+
+        :return: Conjunto de IDs de los nodos cuya distancia o nodo anterior cambió. None si no se encuentra alguno de los nodos.
+        :rtype: set or None
+        """
+        arista = self.grafo.get_arista(id_de, id_a)
+        if arista is None:
+            if self.grafo.get_nodo(id_de) is None or self.grafo.get_nodo(id_a) is None:
+                print("ERROR: No se encuentra uno o ninguno de los nodos especificados para desconectar.")
+                return None
+            return set()
+        nodo_de, nodo_a = self.grafo.get_nodo(id_de), self.grafo.get_nodo(id_a)
+        self.grafo.desconectar_nodos(id_de, id_a)
+        if self._entrantes is not None:
+            self._entrantes.get(nodo_a, {}).pop(nodo_de, None)
+        return self._reparar(nodo_de, nodo_a, arista.get_distancia(), None)
+
+    def definir_distancia(self, id_de, id_a, distancia):
+        """
+        Cambia la propiedad "distancia" de la arista entre 2 nodos y repara el árbol.
+
+        :param float distancia: Nueva distancia (>= 0).
+        :return: Conjunto de IDs de los nodos cuya distancia o nodo anterior cambió. None si la arista no existe.
+        :rtype: set or None
+        """
+        arista = self.grafo.get_arista(id_de, id_a)
+        if arista is None:
+            print("ERROR: No existe una arista entre los nodos especificados.")
+            return None
+        peso_anterior = arista.get_distancia()
+        arista.definir_propiedad("distancia", distancia)
+        return self._reparar(self.grafo.get_nodo(id_de), self.grafo.get_nodo(id_a), peso_anterior, distancia)
+
+    def _reparar(self, nodo_de, nodo_a, peso_anterior, peso_nuevo):
+        """
+        Repara el árbol tras cambiar el peso de la arista nodo_de -> nodo_a (y nodo_a -> nodo_de si no es dirigido).
+        peso_anterior o peso_nuevo es None si la arista no existía o ya no existe.
+        """
+        arcos = [(nodo_de, nodo_a)] if self.grafo.es_dirigido else [(nodo_de, nodo_a), (nodo_a, nodo_de)]
+        if peso_nuevo is not None and (peso_anterior is None or peso_nuevo < peso_anterior):
+            return self._disminuir(arcos, peso_nuevo)
+        if peso_anterior is not None and (peso_nuevo is None or peso_nuevo > peso_anterior):
+            for u, v in arcos:
+                if self._anteriores.get(v) is u:
+                    return self._aumentar(v)
+        return set()
+
+    def _disminuir(self, arcos, peso):
+        #Sólo se cambia el anterior de un nodo cuando su distancia disminuye, así que cambiados incluye ambos casos.
+        distancias = self._distancias
+        heap = []
+        contador = itertools.count()
+        cambiados = set()
+        for u, v in arcos:
+            if u in distancias and distancias[u] + peso < distancias.get(v, math.inf):
+                distancias[v] = distancias[u] + peso
+                self._definir_anterior(v, u)
+                cambiados.add(v)
+                heapq.heappush(heap, (distancias[v], next(contador), v))
+        while heap:
+            distancia, _, nodo = heapq.heappop(heap)
+            if distancia > distancias[nodo]:
+                continue
+            for vecino, arista in nodo.adyacencia.items():
+                nueva = distancia + arista.get_distancia()
+                if nueva < distancias.get(vecino, math.inf):
+                    distancias[vecino] = nueva
+                    self._definir_anterior(vecino, nodo)
+                    cambiados.add(vecino)
+                    heapq.heappush(heap, (nueva, next(contador), vecino))
+        return {nodo.identificador for nodo in cambiados}
+
+    def _aumentar(self, raiz):
+        distancias = self._distancias
+        #Subárbol afectado: sus distancias pueden aumentar; las del resto del árbol no cambian.
+        afectados = [raiz]
+        for nodo in afectados:
+            afectados.extend(self._hijos.get(nodo, ()))
+        previas = {nodo: distancias.pop(nodo) for nodo in afectados}
+        anteriores_previos = {nodo: self._anteriores.get(nodo) for nodo in afectados}
+        for nodo in afectados:
+            self._definir_anterior(nodo, None)
+        #Cada nodo afectado empieza con la mejor arista que le llega desde fuera del subárbol.
+        heap = []
+        contador = itertools.count()
+        for nodo in afectados:
+            mejor = math.inf
+            anterior = None
+            for vecino, arista in self._aristas_entrantes(nodo):
+                if vecino in distancias and distancias[vecino] + arista.get_distancia() < mejor:
+                    mejor = distancias[vecino] + arista.get_distancia()
+                    anterior = vecino
+            if anterior is not None:
+                heapq.heappush(heap, (mejor, next(contador), nodo, anterior))
+        while heap:
+            distancia, _, nodo, anterior = heapq.heappop(heap)
+            if nodo in distancias:
+                continue
+            distancias[nodo] = distancia
+            self._definir_anterior(nodo, anterior)
+            for vecino, arista in nodo.adyacencia.items():
+                if vecino in previas and vecino not in distancias:
+                    heapq.heappush(heap, (distancia + arista.get_distancia(), next(contador), vecino, nodo))
+        return {nodo.identificador for nodo, previa in previas.items()
+                if distancias.get(nodo, math.inf) != previa or self._anteriores.get(nodo) is not anteriores_previos[nodo]}
+
+    def _aristas_entrantes(self, nodo):
+        if self._entrantes is None:
+            return nodo.adyacencia.items()
+        return self._entrantes.get(nodo, {}).items()
+
+    def _definir_anterior(self, nodo, anterior):
+        previo = self._anteriores.pop(nodo, None)
+        if previo is not None:
+            self._hijos[previo].discard(nodo)
+        if anterior is not None:
+            self._anteriores[nodo] = anterior
+            self._hijos.setdefault(anterior, set()).add(nodo)
+
+class ArbolLinkCut:
+    """
+    Bosque de árboles link-cut (Sleator-Tarjan) sobre vértices enteros 0..n-1, representado con árboles splay con inversión perezosa.
+    Cada vértice tiene un valor y la consulta de camino devuelve el vértice de valor máximo. Todas las operaciones son O(log n) amortizado.
+    """
+    def __init__(self, n=0):
+        """
+        :param int n: (Opcional) Cantidad de vértices iniciales, con valor -inf.
+        """
+        self.izquierdo = []
+        self.derecho = []
+        self.padre = [] #padre en el árbol splay, o padre de camino si el vértice es raíz de su árbol splay
+        self.invertido = []
+        self.valor = []
+        self.maximo = [] #vértice de valor máximo en el subárbol splay
+        for _ in range(n):
+            self.agregar()
+
+    def agregar(self, valor=-math.inf):
+        """
+        Agrega un vértice aislado.
+
+        :param valor: (Opcional) Valor del vértice.
+        :return: Índice del vértice.
+        :rtype: int
+        """
+        self.izquierdo.append(-1)
+        self.derecho.append(-1)
+        self.padre.append(-1)
+        self.invertido.append(False)
+        self.valor.append(valor)
+        self.maximo.append(len(self.valor) - 1)
+        return len(self.valor) - 1
+
+    def definir_valor(self, x, valor):
+        """
+        Cambia el valor de un vértice.
+        """
+        self._acceder(x)
+        self.valor[x] = valor
+        self._actualizar(x)
+
+    def raiz(self, x):
+        """
+        :return: Raíz del árbol que contiene a x.
+        :rtype: int
+        """
+        self._acceder(x)
+        izquierdo = self.izquierdo
+        while True:
+            self._empujar(x)
+            if izquierdo[x] == -1:
+                break
+            x = izquierdo[x]
+        self._splay(x)
+        return x
+
+    def conectados(self, a, b):
+        """
+        :return: True si a y b están en el mismo árbol, False si no.
+        :rtype: bool
+        """
+        return a == b or self.raiz(a) == self.raiz(b)
+
+    def enlazar(self, a, b):
+        """
+        Une con una arista 2 vértices de árboles distintos.
+        """
+        self.evertir(a)
+        self.padre[a] = b
+
+    def cortar(self, a, b):
+        """
+        Elimina la arista entre 2 vértices adyacentes.
+        """
+        self.evertir(a)
+        self._acceder(b)
+        #b es la raíz de su árbol splay y a, su único predecesor en el camino, es su hijo izquierdo.
+        self.izquierdo[b] = -1
+        self.padre[a] = -1
+        self._actualizar(b)
+
+    def maximo_camino(self, a, b):
+        """
+        :return: Vértice de valor máximo en el camino entre a y b, que deben estar en el mismo árbol.
+        :rtype: int
+        """
+        self.evertir(a)
+        self._acceder(b)
+        return self.maximo[b]
+
+    def evertir(self, x):
+        """
+        Convierte a x en la raíz de su árbol.
+        """
+        self._acceder(x)
+        self.invertido[x] = not self.invertido[x]
+
+    def _es_raiz(self, x):
+        p = self.padre[x]
+        return p == -1 or (self.izquierdo[p] != x and self.derecho[p] != x)
+
+    def _actualizar(self, x):
+        valor, maximo = self.valor, self.maximo
+        mayor = x
+        for hijo in (self.izquierdo[x], self.derecho[x]):
+            if hijo != -1 and valor[maximo[hijo]] > valor[mayor]:
+                mayor = maximo[hijo]
+        maximo[x] = mayor
+
+    def _empujar(self, x):
+        if self.invertido[x]:
+            izquierdo, derecho = self.derecho[x], self.izquierdo[x]
+            self.izquierdo[x], self.derecho[x] = izquierdo, derecho
+            for hijo in (izquierdo, derecho):
+                if hijo != -1:
+                    self.invertido[hijo] = not self.invertido[hijo]
+            self.invertido[x] = False
+
+    def _rotar(self, x):
+        izquierdo, derecho, padre = self.izquierdo, self.derecho, self.padre
+        p = padre[x]
+        g = padre[p]
+        p_es_raiz = self._es_raiz(p)
+        if izquierdo[p] == x:
+            b = derecho[x]
+            izquierdo[p] = b
+            derecho[x] = p
+        else:
+            b = izquierdo[x]
+            derecho[p] = b
+            izquierdo[x] = p
+        if b != -1:
+            padre[b] = p
+        if not p_es_raiz:
+            if izquierdo[g] == p:
+                izquierdo[g] = x
+            else:
+                derecho[g] = x
+        padre[x] = g
+        padre[p] = x
+        self._actualizar(p)
+        self._actualizar(x)
+
+    def _splay(self, x):
+        #Las inversiones pendientes se aplican de la raíz del árbol splay hacia x antes de rotar.
+        pila = [x]
+        y = x
+        while not self._es_raiz(y):
+            y = self.padre[y]
+            pila.append(y)
+        for y in reversed(pila):
+            self._empujar(y)
+        izquierdo, padre = self.izquierdo, self.padre
+        while not self._es_raiz(x):
+            p = padre[x]
+            if not self._es_raiz(p):
+                g = padre[p]
+                self._rotar(p if (izquierdo[g] == p) == (izquierdo[p] == x) else x)
+            self._rotar(x)
+
+    def _acceder(self, x):
+        #Hace preferido el camino de la raíz a x; al terminar x es la raíz de su árbol splay y no tiene hijo derecho.
+        anterior = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.derecho[y] = anterior
+            self._actualizar(y)
+            anterior = y
+            y = self.padre[y]
+        self._splay(x)
+
+class MSTDinamico:
+    """
+    Árbol de expansión mínima que se actualiza al agregar aristas o cambiar su distancia, en lugar de recalcular Grafo.KruskalD, 
+    Grafo.KruskalI o Grafo.Prim. Las aristas del árbol se guardan en un ArbolLinkCut como vértices con su distancia como valor, 
+    así que la arista más pesada del camino entre 2 nodos se obtiene en O(log V) amortizado:
+        Una arista nueva (o una fuera del árbol cuya distancia disminuye) cierra un ciclo; si la arista más pesada del ciclo pesa más, 
+        se reemplaza por la nueva.
+        Si una arista del árbol aumenta su distancia o se elimina, el árbol se parte en 2 y se busca la arista más ligera que los vuelve 
+        a unir entre las del lado más pequeño, así que ese caso cuesta O(aristas del lado menor).
+    El peso total se actualiza con cada arista que entra o sale del árbol; si hay distancias float se acumula como fracción exacta.
+
+    Las modificaciones deben hacerse con los métodos de esta clase, que también modifican el grafo y el árbol.
+    Sólo admite grafos no dirigidos. Si el grafo no es conexo se mantiene un bosque de expansión mínima.
+
+    Attributes:
+        grafo (Grafo): Grafo original.
+        mst (Grafo): Árbol de expansión mínima. Se modifica con cada cambio.
+    """
+    def __init__(self, grafo, resultado=None):
+        """
+        :param Grafo grafo: Grafo no dirigido.
+        :param resultado: (Opcional) Tupla (mst, peso_total) obtenida con Grafo.KruskalD, Grafo.KruskalI o Grafo.Prim; su árbol se 
+            modifica con cada cambio. Si no se proporciona se calcula con Grafo.KruskalD.
+        """
+        self.grafo = grafo
+        self.mst = None
+        self._peso = 0
+        self._arbol = ArbolLinkCut()
+        self._nodos = [] #vértice del ArbolLinkCut -> Nodo del grafo (None si el vértice es una arista)
+        self._extremos = [] #vértice del ArbolLinkCut -> (i, j) si el vértice es una arista
+        self._indices = {} #Nodo del grafo -> vértice del ArbolLinkCut
+        self._aristas = {} #(i, j) con i < j -> vértice de la arista del árbol
+        self._libres = [] #vértices de aristas que salieron del árbol, para reutilizarlos
+        if grafo.es_dirigido:
+            print("ERROR: El árbol de expansión mínima dinámico requiere de un grafo no dirigido.")
+            return
+        self.mst = grafo.KruskalD()[0] if resultado is None else resultado[0]
+        for nodo in grafo.nodos:
+            self._indice(nodo)
+        conjuntos = ConjuntoDisjunto()
+        vecinos = {}
+        for arista in self.mst.aristas:
+            nodo_de = grafo.get_nodo(arista.extremos[0].identificador)
+            nodo_a = grafo.get_nodo(arista.extremos[1].identificador)
+            if nodo_de is None or nodo_a is None:
+                print("ERROR: El árbol contiene nodos que no existen en el grafo.")
+                self.mst = None
+                return
+            i, j = self._indices[nodo_de], self._indices[nodo_a]
+            if not conjuntos.unir(i, j):
+                print("ERROR: El resultado proporcionado contiene un ciclo.")
+                self.mst = None
+                return
+            vecinos.setdefault(i, []).append((j, arista))
+            vecinos.setdefault(j, []).append((i, arista))
+        #Cada árbol se enraiza con un BFS: basta con apuntar cada vértice a su padre, sin pasar por ArbolLinkCut.enlazar.
+        padre = self._arbol.padre
+        visitados = set()
+        for raiz in vecinos:
+            if raiz in visitados:
+                continue
+            visitados.add(raiz)
+            cola = [raiz]
+            for i in cola:
+                for j, arista in vecinos[i]:
+                    if j not in visitados:
+                        visitados.add(j)
+                        e = self._nueva_arista(i, j, arista.get_distancia())
+                        padre[j] = e
+                        padre[e] = i
+                        cola.append(j)
+
+    @property
+    def peso_total(self):
+        """Peso total del árbol de expansión mínima."""
+        return float(self._peso) if isinstance(self._peso, Fraction) else self._peso
+
+    def resultado(self):
+        """
+        :return: Tupla donde el elemento [0] es el árbol de expansión mínima y [1] es su peso total, como en Grafo.KruskalD.
+        :rtype: (Grafo, int)
+        """
+        return (self.mst, self.peso_total)
+
+    def conectar_nodos(self, id_de, id_a, **kwargs):
+        """
+        Conecta 2 nodos del grafo (ver Grafo.conectar_nodos) y actualiza el árbol.
+
+        :return: True si cambiaron las aristas del árbol, False si no. None si no se encuentra alguno de los nodos.
+        :rtype: bool or None
+        """
+        arista = self.grafo.conectar_nodos(id_de, id_a, **kwargs)
+        if arista is None:
+            return None
+        return self._cambiar_distancia(arista.extremos[0], arista.extremos[1], arista)
+
+    def definir_distancia(self, id_de, id_a, distancia):
+        """
+        Cambia la propiedad "distancia" de la arista entre 2 nodos y actualiza el árbol.
+
+        :param distancia: Nueva distancia.
+        :return: True si cambiaron las aristas del árbol, False si no. None si la arista no existe.
+        :rtype: bool or None
+        """
+        arista = self.grafo.get_arista(id_de, id_a)
+        if arista is None:
+            print("ERROR: No existe una arista entre los nodos especificados.")
+            return None
+        arista.definir_propiedad("distancia", distancia)
+        return self._cambiar_distancia(self.grafo.get_nodo(id_de), self.grafo.get_nodo(id_a), arista)
+
+    def desconectar_nodos(self, id_de, id_a):
+        """
+        Desconecta 2 nodos del grafo (ver Grafo.desconectar_nodos) y actualiza el árbol.
+
+        :return: True si cambiaron las aristas del árbol, False si no. None si no se encuentra alguno de los nodos.
+        :rtype: bool or None
+        """
+        nodo_de, nodo_a = self.grafo.get_nodo(id_de), self.grafo.get_nodo(id_a)
+        if nodo_de is None or nodo_a is None:
+            print("ERROR: No se encuentra uno o ninguno de los nodos especificados para desconectar.")
+            return None
+        self.grafo.desconectar_nodos(id_de, id_a)
+        i, j = self._indice(nodo_de), self._indice(nodo_a)
+        e = self._aristas.get((i, j) if i < j else (j, i))
+        if e is None:
+            return False
+        self._cortar(e)
+        self._reconectar(i, j)
+        return True
+
+    def _cambiar_distancia(self, nodo_de, nodo_a, arista):
+        i, j = self._indice(nodo_de), self._indice(nodo_a)
+        if i == j:
+            return False
+        e = self._aristas.get((i, j) if i < j else (j, i))
+        peso = arista.get_distancia()
+        if e is None:
+            #Arista fuera del árbol: entra si es más ligera que la más pesada del ciclo que cierra.
+            if self._arbol.conectados(i, j):
+                mayor = self._arbol.maximo_camino(i, j)
+                if not self._arbol.valor[mayor] > peso:
+                    return False
+                self._cortar(mayor)
+            self._enlazar(i, j, arista)
+            return True
+        anterior = self._arbol.valor[e]
+        self._sumar(-anterior)
+        self._sumar(peso)
+        self._arbol.definir_valor(e, peso)
+        self.mst.get_arista(nodo_de.identificador, nodo_a.identificador).copiar_propiedades(arista)
+        if not peso > anterior:
+            return False
+        self._cortar(e)
+        return self._reconectar(i, j) != ((i, j) if i < j else (j, i))
+
+    def _reconectar(self, i, j):
+        """Une los 2 árboles que contienen a i y j con la arista más ligera entre ellos. Regresa la pareja (menor, mayor) unida o None."""
+        nodo_i = self.mst.get_nodo(self._nodos[i].identificador)
+        nodo_j = self.mst.get_nodo(self._nodos[j].identificador)
+        #Se recorren ambos lados a la vez para detenerse en cuanto se agote el menor.
+        lados = ([nodo_i], [nodo_j])
+        vistos = ({nodo_i}, {nodo_j})
+        posiciones = [0, 0]
+        menor = None
+        while menor is None:
+            for k in (0, 1):
+                if posiciones[k] == len(lados[k]):
+                    menor = vistos[k]
+                    break
+                nodo = lados[k][posiciones[k]]
+                posiciones[k] += 1
+                for vecino in nodo.adyacencia:
+                    if vecino not in vistos[k]:
+                        vistos[k].add(vecino)
+                        lados[k].append(vecino)
+        lado = {self.grafo.get_nodo(nodo.identificador) for nodo in menor}
+        mejor = None
+        for nodo in lado:
+            for vecino, arista in nodo.adyacencia.items():
+                if vecino not in lado and (mejor is None or arista.get_distancia() < mejor[2].get_distancia()):
+                    mejor = (nodo, vecino, arista)
+        if mejor is None:
+            return None
+        a, b = self._indices[mejor[0]], self._indices[mejor[1]]
+        self._enlazar(a, b, mejor[2])
+        return (a, b) if a < b else (b, a)
+
+    def _indice(self, nodo):
+        i = self._indices.get(nodo)
+        if i is None:
+            #Nodo agregado al grafo después de crear el árbol.
+            i = self._arbol.agregar()
+            self._nodos.append(nodo)
+            self._extremos.append(None)
+            self._indices[nodo] = i
+            self.mst.copiar_nodo(nodo)
+        return i
+
+    def _enlazar(self, i, j, arista):
+        e = self._nueva_arista(i, j, arista.get_distancia())
+        self._arbol.enlazar(i, e)
+        self._arbol.enlazar(e, j)
+        self.mst.conectar_nodos(self._nodos[i].identificador, self._nodos[j].identificador).copiar_propiedades(arista)
+
+    def _nueva_arista(self, i, j, peso):
+        if self._libres:
+            e = self._libres.pop()
+            self._arbol.definir_valor(e, peso)
+        else:
+            e = self._arbol.agregar(peso)
+            self._nodos.append(None)
+            self._extremos.append(None)
+        self._extremos[e] = (i, j)
+        self._aristas[(i, j) if i < j else (j, i)] = e
+        self._sumar(peso)
+        return e
+
+    def _cortar(self, e):
+        i, j = self._extremos[e]
+        self._arbol.cortar(i, e)
+        self._arbol.cortar(e, j)
+        del self._aristas[(i, j) if i < j else (j, i)]
+        self._extremos[e] = None
+        self._libres.append(e)
+        self.mst.desconectar_nodos(self._nodos[i].identificador, self._nodos[j].identificador)
+        self._sumar(-self._arbol.valor[e])
+
+    def _sumar(self, valor):
+        if isinstance(valor, float) or isinstance(self._peso, Fraction):
+            self._peso = Fraction(self._peso) + Fraction(valor)
+        else:
+            self._peso += valor
+
+class GrafoCompacto:
+    """
+    Representación inmutable de un grafo en formato CSR (compressed sparse row), generada con Grafo.compilar.
+    Los nodos se identifican por su índice (0 a n-1). Los vecinos del nodo i son vecinos[desplazamientos[i]:desplazamientos[i + 1]]
+    y pesos[k] es la distancia de la arista hacia vecinos[k]. En grafos no dirigidos cada arista aparece en ambos extremos.
+
+    Attributes:
+        es_dirigido (bool): True si es dirigido, False en caso contrario.
+        ids (list): Identificadores de los nodos. ids[i] es el identificador del nodo con índice i.
+        indice (dict): Diccionario identificador -> índice. Se construye la primera vez que se consulta.
+        desplazamientos (array('q')): n + 1 posiciones de inicio de los vecinos de cada nodo.
+        vecinos (array('q')): Índices de los nodos vecinos.
+        pesos (array('d')): Distancia de cada arista, alineada con vecinos.
+
+    Un grafo cargado con GrafoCompacto.cargar_binario usa memoryview sobre el archivo mapeado en memoria en lugar de array.
+    """
+    def __init__(self, ids, desplazamientos, vecinos, pesos, es_dirigido):
+        """
+        Crea un grafo compacto a partir de sus arreglos. Para generarlo desde un Grafo utilice Grafo.compilar.
+
+        :param ids: Secuencia con los identificadores de los nodos.
+        :param desplazamientos: Secuencia de enteros con n + 1 elementos.
+        :param vecinos: Secuencia de enteros con los índices de los vecinos.
+        :param pesos: Secuencia de flotantes alineada con vecinos.
+        :param bool es_dirigido: True si el grafo es dirigido.
+        """
+        self.es_dirigido = es_dirigido
+        self.ids = ids
+        self.desplazamientos = desplazamientos
+        self.vecinos = vecinos
+        self.pesos = pesos
+        self._indice = None
+        self._mapa = None #mmap del archivo binario, si el grafo se cargó de uno
+        self._vistas = () #memoryview sobre _mapa, ver GrafoCompacto.cerrar
+
+    @property
+    def indice(self):
+        if self._indice is None:
+            ids = self.ids
+            self._indice = {ids[i]: i for i in range(len(ids))}
+        return self._indice
+
+    def num_nodos(self):
+        """
+        Cantidad de nodos en el grafo.
+
+        :rtype: int
+        """
+        return len(self.desplazamientos) - 1
+
+    def _indice_de(self, s):
+        """Índice del nodo con ID s, o None (con mensaje de error) si no existe."""
+        i = self.indice.get(s)
+        if i is None:
+            print("ERROR: No existe el nodo de inicio en el grafo")
+        return i
+
+    def BFS(self, s):
+        """
+        Recorrido "Breadth First Search" desde el nodo s.
+
+        :param s: ID del nodo de inicio.
+        :return: Tupla (padres, profundidad) de arreglos indexados por nodo. -1 en nodos no alcanzados (y en el padre de s). 
+            None si s no existe en el grafo.
+        :rtype: (array('q'), array('q')) or None
+        """
+        i_s = self._indice_de(s)
+        if i_s is None:
+            return None
+        return self._BFS_indices(i_s)
+
+    def _BFS_indices(self, i_s):
+        """BFS desde el índice i_s. Devuelve (padres, profundidad) como GrafoCompacto.BFS."""
+        n = self.num_nodos()
+        desplazamientos = self.desplazamientos
+        vecinos = self.vecinos
+        padres = array('q', [-1]) * n
+        profundidad = array('q', [-1]) * n
+        profundidad[i_s] = 0
+        cola = [i_s]
+        for i in cola:
+            siguiente = profundidad[i] + 1
+            for k in range(desplazamientos[i], desplazamientos[i + 1]):
+                j = vecinos[k]
+                if profundidad[j] == -1:
+                    profundidad[j] = siguiente
+                    padres[j] = i
+                    cola.append(j)
+        return (padres, profundidad)
+
+    def DFS(self, s):
+        """
+        Recorrido "Depth First Search" iterativo desde el nodo s.
+
+        :param s: ID del nodo de inicio.
+        :return: Tupla (preorden, padres). preorden es el arreglo de índices en orden de descubrimiento; padres es -1 en nodos 
+            no alcanzados (y en el padre de s). None si s no existe en el grafo.
+        :rtype: (array('q'), array('q')) or None
+        """
+        i_s = self._indice_de(s)
+        if i_s is None:
+            return None
+        n = self.num_nodos()
+        desplazamientos = self.desplazamientos
+        vecinos = self.vecinos
+        padres = array('q', [-1]) * n
+        visitado = bytearray(n)
+        visitado[i_s] = 1
+        preorden = array('q', [i_s])
+        pila = [i_s]
+        siguiente = [desplazamientos[i_s]] #siguiente posición de vecinos a revisar de cada nodo en la pila
+        while pila:
+            i = pila[-1]
+            k = siguiente[-1]
+            fin = desplazamientos[i + 1]
+            while k < fin and visitado[vecinos[k]]:
+                k += 1
+            if k < fin:
+                j = vecinos[k]
+                siguiente[-1] = k + 1
+                visitado[j] = 1
+                padres[j] = i
+                preorden.append(j)
+                pila.append(j)
+                siguiente.append(desplazamientos[j])
+            else:
+                pila.pop()
+                siguiente.pop()
+        return (preorden, padres)
+
+    def Dijkstra(self, s, destino=None):
+        """
+        Distancias mínimas desde el nodo s con el algorítmo de Dijkstra.
+
+        :param s: ID del nodo de inicio.
+        :param destino: (Opcional) ID de un nodo. Si se proporciona, el cálculo se detiene al fijar su distancia.
+        :return: Tupla (distancias, anteriores) de arreglos indexados por nodo. math.inf y -1 en nodos no alcanzados. 
+            None si s no existe en el grafo.
+        :rtype: (array('d'), array('q')) or None
+        """
+        i_s = self._indice_de(s)
+        if i_s is None:
+            return None
+        return self._Dijkstra_indices(i_s, -1 if destino is None else self.indice.get(destino, -1))
+
+    def _Dijkstra_indices(self, i_s, i_destino=-1):
+        """Dijkstra desde el índice i_s hasta fijar i_destino (-1 para todos). Devuelve (distancias, anteriores) como GrafoCompacto.Dijkstra."""
+        n = self.num_nodos()
+        desplazamientos = self.desplazamientos
+        vecinos = self.vecinos
+        pesos = self.pesos
+        distancias = array('d', [math.inf]) * n
+        anteriores = array('q', [-1]) * n
+        calculado = bytearray(n)
+        distancias[i_s] = 0
+        heap = [(0.0, i_s)]
+        while heap:
+            distancia, i = heapq.heappop(heap)
+            if calculado[i]:
+                continue
+            calculado[i] = 1
+            if i == i_destino:
+                break
+            for k in range(desplazamientos[i], desplazamientos[i + 1]):
+                j = vecinos[k]
+                nueva = distancia + pesos[k]
+                if nueva < distancias[j] and not calculado[j]:
+                    distancias[j] = nueva
+                    anteriores[j] = i
+                    heapq.heappush(heap, (nueva, j))
+        return (distancias, anteriores)
+
+    def BFS_multiple(self, fuentes=None, procesos=None, flujo=False):
+        """
+        Profundidad BFS desde varios nodos, repartiendo las fuentes entre procesos (ver GrafoCompacto.Dijkstra_multiple).
+
+        :param fuentes: (opcional) Iterable con los IDs de los nodos de inicio (= todos los nodos si no se especifica).
+        :param int procesos: (opcional) Número de procesos (= os.cpu_count() si no se especifica). Con 1 se calcula en este proceso.
+        :param bool flujo: (opcional) Devolver un generador de tuplas (id, profundidad) en lugar de la matriz (= False si no se especifica).
+        :return: Matriz de profundidades: una fila array('q') por fuente, alineada con ids, con -1 en nodos no alcanzados. 
+            None si alguna fuente no existe en el grafo.
+        :rtype: list or generator or None
+        """
+        return self._multiple("BFS", fuentes, procesos, flujo)
+
+    def Dijkstra_multiple(self, fuentes=None, procesos=None, flujo=False):
+        """
+        Distancias mínimas desde varios nodos, repartiendo las fuentes entre procesos.
+        Cada proceso recibe el grafo una sola vez: lo hereda al crearse (fork) o lo recibe serializado al iniciar, y después sólo
+        se envían índices de fuentes y se devuelven filas de resultados. Las filas llegan en el orden de fuentes.
+        La matriz completa ocupa 8 bytes por pareja (fuente, nodo); para muchas fuentes en grafos grandes conviene flujo=True.
+
+        :param fuentes: (opcional) Iterable con los IDs de los nodos de inicio (= todos los nodos si no se especifica).
+        :param int procesos: (opcional) Número de procesos (= os.cpu_count() si no se especifica). Con 1 se calcula en este proceso.
+        :param bool flujo: (opcional) Devolver un generador de tuplas (id, distancias) en lugar de la matriz (= False si no se especifica).
+        :return: Matriz de distancias: una fila array('d') por fuente, alineada con ids, con math.inf en nodos no alcanzados. 
+            None si alguna fuente no existe en el grafo.
+        :rtype: list or generator or None
+        """
+        return self._multiple("Dijkstra", fuentes, procesos, flujo)
+
+    def _multiple(self, algoritmo, fuentes, procesos, flujo):
+        if fuentes is None:
+            indices = list(range(self.num_nodos()))
+        else:
+            indices = [self.indice.get(fuente) for fuente in fuentes]
+            if None in indices:
+                print("ERROR: No existe el nodo de inicio en el grafo")
+                return None
+        procesos = max(1, min(procesos or os.cpu_count() or 1, len(indices)))
+        filas = self._filas_multiple(algoritmo, indices, procesos)
+        if flujo:
+            ids = self.ids
+            return ((ids[i], fila) for i, fila in zip(indices, filas))
+        return list(filas)
+
+    def _filas_multiple(self, algoritmo, indices, procesos):
+        """Generador de las filas de resultados de algoritmo ("BFS" o "Dijkstra") para cada índice de fuente."""
+        if procesos == 1:
+            for i in indices:
+                yield _fila_multiple(self, algoritmo, i)
+            return
+        #Bloques pequeños para balancear la carga, pero suficientes para amortizar la comunicación.
+        tamano_bloque = max(1, len(indices) // (procesos * 8))
+        with multiprocessing.Pool(procesos, initializer=_iniciar_multiple, initargs=(self,)) as pool:
+            yield from pool.imap(functools.partial(_trabajo_multiple, algoritmo), indices, tamano_bloque)
+
+    def __getstate__(self):
+        #Un grafo cargado con mmap se serializa copiando sus arreglos; el índice se reconstruye al consultarlo.
+        estado = self.__dict__.copy()
+        estado["_mapa"] = None
+        estado["_vistas"] = ()
+        estado["_indice"] = None
+        if self._mapa is not None:
+            estado["ids"] = list(self.ids)
+            estado["desplazamientos"] = array('q', self.desplazamientos.tobytes())
+            estado["vecinos"] = array('q', self.vecinos.tobytes())
+            estado["pesos"] = array('d', self.pesos.tobytes())
+        return estado
+
+    def Prim(self):
+        """
+        Bosque de expansión mínima con el algoritmo de Prim (se considera el grafo como no dirigido).
+
+        :return: Tupla donde [0] es la lista de aristas (padre, hijo) como índices y [1] el peso total.
+        :rtype: (list((int, int)), float)
+        """
+        n = self.num_nodos()
+        desplazamientos, vecinos, pesos = self._no_dirigido()
+        en_arbol = bytearray(n)
+        aristas = []
+        peso_total = 0
+        for raiz in range(n):
+            if en_arbol[raiz]:
+                continue
+            en_arbol[raiz] = 1
+            heap = [(pesos[k], raiz, vecinos[k]) for k in range(desplazamientos[raiz], desplazamientos[raiz + 1])]
+            heapq.heapify(heap)
+            while heap:
+                peso, i, j = heapq.heappop(heap)
+                if en_arbol[j]:
+                    continue
+                en_arbol[j] = 1
+                aristas.append((i, j))
+                peso_total += peso
+                for k in range(desplazamientos[j], desplazamientos[j + 1]):
+                    if not en_arbol[vecinos[k]]:
+                        heapq.heappush(heap, (pesos[k], j, vecinos[k]))
+        return (aristas, peso_total)
+
+    def Kruskal(self):
+        """
+        Bosque de expansión mínima con el algoritmo de Kruskal (se considera el grafo como no dirigido).
+
+        :return: Tupla donde [0] es la lista de aristas (de, a) como índices y [1] el peso total.
+        :rtype: (list((int, int)), float)
+        """
+        origenes = self.origenes()
+        vecinos = self.vecinos
+        pesos = self.pesos
+        conjuntos = ConjuntoDisjunto(range(self.num_nodos()))
+        aristas = []
+        peso_total = 0
+        for k in sorted(range(len(vecinos)), key=pesos.__getitem__):
+            if conjuntos.unir(origenes[k], vecinos[k]):
+                aristas.append((origenes[k], vecinos[k]))
+                peso_total += pesos[k]
+        return (aristas, peso_total)
+
+    def componentes_conexas(self):
+        """
+        Componentes conexas en tiempo O(V + E). En grafos dirigidos se obtienen las débilmente conexas (se ignora la dirección);
+        para las fuertemente conexas utilice GrafoCompacto.componentes_fuertes.
+
+        :return: Tupla (cantidad, etiquetas) donde etiquetas[i] es la componente (0 a cantidad - 1) del nodo con índice i. 
+            Las componentes se numeran en orden de su nodo de menor índice.
+        :rtype: (int, array('q'))
+        """
+        n = self.num_nodos()
+        desplazamientos, vecinos, _ = self._no_dirigido()
+        etiquetas = array('q', [-1]) * n
+        cantidad = 0
+        for raiz in range(n):
+            if etiquetas[raiz] != -1:
+                continue
+            etiquetas[raiz] = cantidad
+            cola = [raiz]
+            for i in cola:
+                for k in range(desplazamientos[i], desplazamientos[i + 1]):
+                    j = vecinos[k]
+                    if etiquetas[j] == -1:
+                        etiquetas[j] = cantidad
+                        cola.append(j)
+            cantidad += 1
+        return (cantidad, etiquetas)
+
+    def componentes_fuertes(self):
+        """
+        Componentes fuertemente conexas con el algoritmo de Tarjan iterativo, en tiempo O(V + E).
+        En grafos no dirigidos coinciden con GrafoCompacto.componentes_conexas.
+
+        :return: Tupla (cantidad, etiquetas) donde etiquetas[i] es la componente (0 a cantidad - 1) del nodo con índice i.
+            Las componentes se numeran en orden topológico inverso: las aristas entre componentes van de una etiqueta mayor a una menor.
+        :rtype: (int, array('q'))
+        """
+        n = self.num_nodos()
+        desplazamientos = self.desplazamientos
+        vecinos = self.vecinos
+        orden = array('q', [-1]) * n #orden de descubrimiento
+        bajo = array('q', [0]) * n
+        en_pila = bytearray(n)
+        etiquetas = array('q', [-1]) * n
+        pila = [] #nodos de componentes aún sin cerrar
+        contador = 0
+        cantidad = 0
+        for raiz in range(n):
+            if orden[raiz] != -1:
+                continue
+            orden[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila[raiz] = 1
+            llamadas = [raiz] #recorrido DFS en curso
+            siguiente = [desplazamientos[raiz]] #siguiente posición de vecinos a revisar de cada nodo en llamadas
+            while llamadas:
+                i = llamadas[-1]
+                k = siguiente[-1]
+                fin = desplazamientos[i + 1]
+                while k < fin:
+                    j = vecinos[k]
+                    k += 1
+                    if orden[j] == -1:
+                        break
+                    if en_pila[j] and orden[j] < bajo[i]:
+                        bajo[i] = orden[j]
+                else:
+                    #Se revisaron todos los vecinos de i: si es raíz de su componente, se cierra.
+                    llamadas.pop()
+                    siguiente.pop()
+                    if bajo[i] == orden[i]:
+                        while True:
+                            j = pila.pop()
+                            en_pila[j] = 0
+                            etiquetas[j] = cantidad
+                            if j == i:
+                                break
+                        cantidad += 1
+                    if llamadas and bajo[i] < bajo[llamadas[-1]]:
+                        bajo[llamadas[-1]] = bajo[i]
+                    continue
+                siguiente[-1] = k
+                orden[j] = bajo[j] = contador
+                contador += 1
+                pila.append(j)
+                en_pila[j] = 1
+                llamadas.append(j)
+                siguiente.append(desplazamientos[j])
+        return (cantidad, etiquetas)
+
+    def puentes(self):
+        """
+        Aristas cuya eliminación desconecta su componente (se considera el grafo como no dirigido), en tiempo O(V + E).
+        Una arista repetida entre los mismos nodos no es puente.
+
+        :return: Lista de aristas (padre, hijo) como índices, según el árbol DFS.
+        :rtype: list((int, int))
+        """
+        return self._Tarjan_no_dirigido()[0]
+
+    def puntos_articulacion(self):
+        """
+        Nodos cuya eliminación desconecta su componente (se considera el grafo como no dirigido), en tiempo O(V + E).
+
+        :return: Arreglo con los índices de los puntos de articulación en orden ascendente.
+        :rtype: array('q')
+        """
+        articulacion = self._Tarjan_no_dirigido()[1]
+        return array('q', [i for i in range(len(articulacion)) if articulacion[i]])
+
+    def _Tarjan_no_dirigido(self):
+        """DFS iterativo de Tarjan sobre el grafo no dirigido. Devuelve (puentes, articulacion) con articulacion[i] = 1 en los puntos de articulación."""
+        n = self.num_nodos()
+        desplazamientos, vecinos, _ = self._no_dirigido()
+        orden = array('q', [-1]) * n
+        bajo = array('q', [0]) * n
+        articulacion = bytearray(n)
+        puentes = []
+        contador = 0
+        for raiz in range(n):
+            if orden[raiz] != -1:
+                continue
+            orden[raiz] = bajo[raiz] = contador
+            contador += 1
+            hijos_raiz = 0
+            llamadas = [raiz]
+            padres = [-1]
+            siguiente = [desplazamientos[raiz]]
+            while llamadas:
+                i = llamadas[-1]
+                padre = padres[-1]
+                k = siguiente[-1]
+                fin = desplazamientos[i + 1]
+                while k < fin:
+                    j = vecinos[k]
+                    k += 1
+                    if orden[j] == -1:
+                        break
+                    if j == padre:
+                        #La arista al padre se ignora una vez; una arista repetida hacia él sí cuenta como retroceso.
+                        padre = -1
+                        padres[-1] = -1
+                    elif orden[j] < bajo[i]:
+                        bajo[i] = orden[j]
+                else:
+                    llamadas.pop()
+                    padres.pop()
+                    siguiente.pop()
+                    if llamadas:
+                        p = llamadas[-1]
+                        if bajo[i] < bajo[p]:
+                            bajo[p] = bajo[i]
+                        if bajo[i] > orden[p]:
+                            puentes.append((p, i))
+                        if p == raiz:
+                            hijos_raiz += 1
+                        elif bajo[i] >= orden[p]:
+                            articulacion[p] = 1
+                    continue
+                siguiente[-1] = k
+                orden[j] = bajo[j] = contador
+                contador += 1
+                llamadas.append(j)
+                padres.append(i)
+                siguiente.append(desplazamientos[j])
+            if hijos_raiz > 1:
+                articulacion[raiz] = 1
+        return (puentes, articulacion)
+
+    def _no_dirigido(self):
+        """Arreglos (desplazamientos, vecinos, pesos) del grafo sin dirección: los propios si no es dirigido."""
+        if not self.es_dirigido:
+            return (self.desplazamientos, self.vecinos, self.pesos)
+        simetrico = GrafoCompacto.desde_aristas(self.ids, self.origenes(), self.vecinos, self.pesos)
+        return (simetrico.desplazamientos, simetrico.vecinos, simetrico.pesos)
+
+    @classmethod
+    def desde_aristas(cls, ids, origenes, destinos, pesos=None, es_dirigido=False):
+        """
+        Crea un grafo compacto a partir de arreglos de aristas, ordenándolas por origen en tiempo O(n + m).
+        En grafos no dirigidos cada arista se agrega en ambos extremos. No se eliminan aristas repetidas.
+
+        :param ids: Secuencia con los identificadores de los nodos.
+        :param origenes: Secuencia de índices del nodo de origen de cada arista.
+        :param destinos: Secuencia de índices del nodo de destino de cada arista.
+        :param pesos: (opcional) Secuencia de distancias de cada arista (= 0 para todas si no se especifica).
+        :param bool es_dirigido: (opcional) True si el grafo es dirigido (= False si no se especifica).
+        :rtype: GrafoCompacto
+        """
+        n = len(ids)
+        m = len(origenes)
+        if np is not None:
+            return cls._desde_aristas_numpy(ids, origenes, destinos, pesos, es_dirigido)
+        if pesos is None:
+            pesos = array('d', [0]) * m
+        grados = array('q', [0]) * (n + 1)
+        for i in origenes:
+            grados[i + 1] += 1
+        if not es_dirigido:
+            for j in destinos:
+                grados[j + 1] += 1
+        for i in range(n):
+            grados[i + 1] += grados[i]
+        desplazamientos = array('q', grados)
+        total = grados[n]
+        vecinos = array('q', [0]) * total
+        pesos_csr = array('d', [0]) * total
+        for k in range(m):
+            i = origenes[k]
+            j = destinos[k]
+            posicion = grados[i]
+            vecinos[posicion] = j
+            pesos_csr[posicion] = pesos[k]
+            grados[i] = posicion + 1
+            if not es_dirigido:
+                posicion = grados[j]
+                vecinos[posicion] = i
+                pesos_csr[posicion] = pesos[k]
+                grados[j] = posicion + 1
+        return cls(ids, desplazamientos, vecinos, pesos_csr, es_dirigido)
+
+    @classmethod
+    def _desde_aristas_numpy(cls, ids, origenes, destinos, pesos, es_dirigido):
+        """Versión de GrafoCompacto.desde_aristas con NumPy; produce el mismo orden de vecinos (estable por arista)."""
+        n = len(ids)
+        origenes = np.asarray(origenes, dtype=np.int64)
+        destinos = np.asarray(destinos, dtype=np.int64)
+        pesos = np.zeros(len(origenes)) if pesos is None else np.asarray(pesos, dtype=np.float64)
+        if not es_dirigido:
+            #Cada arista k aparece como 2k (origen -> destino) y 2k + 1 (destino -> origen).
+            origenes, destinos = np.column_stack((origenes, destinos)).ravel(), np.column_stack((destinos, origenes)).ravel()
+            pesos = np.repeat(pesos, 2)
+        orden = np.argsort(origenes, kind="stable")
+        desplazamientos = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origenes, minlength=n), out=desplazamientos[1:])
+        return cls(ids, array('q', desplazamientos.tobytes()), array('q', destinos[orden].tobytes()), array('d', pesos[orden].tobytes()), es_dirigido)
+
+    def origenes(self):
+        """
+        Arreglo alineado con vecinos con el índice del nodo del que parte cada arista.
+
+        :rtype: array('q')
+        """
+        origenes = array('q', [0]) * len(self.vecinos)
+        desplazamientos = self.desplazamientos
+        for i in range(self.num_nodos()):
+            for k in range(desplazamientos[i], desplazamientos[i + 1]):
+                origenes[k] = i
+        return origenes
+
+    def guardar_binario(self, ruta):
+        """
+        Guarda el grafo en el formato binario de P-Grafos (extensión sugerida: .pgr). Si el archivo existe, se sobreescribirá.
+
+        Formato (little-endian, secciones alineadas a 8 bytes):
+            Encabezado: firma b"PGRF", versión (uint16), banderas (uint8, bit 0 = dirigido), tipo de IDs (uint8, 0 = int64, 
+                1 = texto UTF-8), n (int64), cantidad de vecinos m (int64), bytes de la tabla de IDs (int64).
+            Tabla de IDs: n int64, o n + 1 desplazamientos int64 seguidos del texto UTF-8 de todos los IDs.
+            desplazamientos: n + 1 int64. vecinos: m int64. pesos: m float64.
+
+        Si algún ID no es int se guardan todos como texto (str).
+
+        :param str ruta: Ruta del archivo.
+        """
+        n = self.num_nodos()
+        if all(type(id) is int for id in self.ids):
+            tipo_ids = ID_BINARIO_ENTERO
+            tabla_ids = [array('q', self.ids)]
+        else:
+            tipo_ids = ID_BINARIO_TEXTO
+            textos = [str(id).encode("utf-8") for id in self.ids]
+            desplazamientos_ids = array('q', [0]) * (n + 1)
+            for i in range(n):
+                desplazamientos_ids[i + 1] = desplazamientos_ids[i] + len(textos[i])
+            texto = b"".join(textos)
+            tabla_ids = [desplazamientos_ids, texto + bytes(-len(texto) % 8)]
+        tabla_ids = [GrafoCompacto._arreglo_little_endian(parte) for parte in tabla_ids]
+        secciones = [GrafoCompacto._arreglo_little_endian(array('q', self.desplazamientos)), 
+                     GrafoCompacto._arreglo_little_endian(array('q', self.vecinos)), 
+                     GrafoCompacto._arreglo_little_endian(array('d', self.pesos))]
+        with open(ruta, 'wb') as archivo:
+            archivo.write(ENCABEZADO_BINARIO.pack(FIRMA_BINARIO, VERSION_BINARIO, 1 if self.es_dirigido else 0, tipo_ids, n, 
+                                                  len(self.vecinos), sum(len(parte) for parte in tabla_ids)))
+            for parte in tabla_ids + secciones:
+                archivo.write(parte)
+
+    @classmethod
+    def cargar_binario(cls, ruta, validar=True):
+        """
+        Carga un grafo guardado con GrafoCompacto.guardar_binario (o Grafo.guardar_binario) mapeando el archivo en memoria.
+        Los arreglos se leen directamente del archivo, sin copiarlos ni crear objetos Nodo/Arista (utilice a_grafo para generarlos).
+        El archivo queda abierto mientras se use el grafo: llame GrafoCompacto.cerrar (o use el grafo con with) para liberarlo.
+
+        :param str ruta: Ruta del archivo.
+        :param bool validar: (opcional) Revisar en O(n + m) que los desplazamientos no disminuyan y que los vecinos estén entre 
+            0 y n - 1 (= True si no se especifica). Con False sólo se revisan los tamaños y un archivo dañado puede causar 
+            errores en los algoritmos.
+        :return: Grafo compacto. None si el archivo no existe, no tiene el formato esperado, está incompleto o dañado.
+        :rtype: GrafoCompacto or None
+        """
+        if not os.path.exists(ruta):
+            print("No se encuentra el archivo de grafo especificado. (" + str(ruta) + ")")
+            return None
+        if os.path.getsize(ruta) < ENCABEZADO_BINARIO.size:
+            print("ERROR: El archivo no es un grafo binario de P-Grafos. (" + str(ruta) + ")")
+            return None
+        with open(ruta, 'rb') as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, banderas, tipo_ids, n, m, bytes_ids = ENCABEZADO_BINARIO.unpack_from(mapa)
+        if firma != FIRMA_BINARIO or version != VERSION_BINARIO:
+            print("ERROR: El archivo no es un grafo binario de P-Grafos compatible. (" + str(ruta) + ")")
+            mapa.close()
+            return None
+        #El archivo debe contener completas las secciones que anuncia el encabezado.
+        if tipo_ids == ID_BINARIO_ENTERO:
+            ids_validos = bytes_ids == 8 * n
+        else:
+            ids_validos = tipo_ids == ID_BINARIO_TEXTO and bytes_ids >= 8 * (n + 1) and bytes_ids % 8 == 0
+        if n < 0 or m < 0 or not ids_validos or len(mapa) < ENCABEZADO_BINARIO.size + bytes_ids + 8 * (n + 1) + 16 * m:
+            print("ERROR: El archivo de grafo binario está incompleto o dañado. (" + str(ruta) + ")")
+            mapa.close()
+            return None
+        vistas = [memoryview(mapa)] #se liberan (en orden inverso) antes de cerrar el mapa
+        inicio = ENCABEZADO_BINARIO.size
+        def seccion(bytes_seccion, formato):
+            nonlocal inicio
+            vista = vistas[0][inicio:inicio + bytes_seccion]
+            vistas.append(vista)
+            inicio += bytes_seccion
+            if formato is None:
+                return vista
+            if sys.byteorder != "little":
+                arreglo = array(formato, vista)
+                arreglo.byteswap()
+                return arreglo
+            vista = vista.cast(formato)
+            vistas.append(vista)
+            return vista
+        if tipo_ids == ID_BINARIO_ENTERO:
+            ids = seccion(8 * n, 'q')
+        else:
+            desplazamientos_ids = seccion(8 * (n + 1), 'q')
+            ids = _IdsTexto(desplazamientos_ids, seccion(bytes_ids - 8 * (n + 1), None))
+        desplazamientos = seccion(8 * (n + 1), 'q')
+        vecinos = seccion(8 * m, 'q')
+        valido = desplazamientos[0] == 0 and desplazamientos[n] == m
+        if valido and tipo_ids == ID_BINARIO_TEXTO:
+            valido = GrafoCompacto._enteros_validos(desplazamientos_ids, bytes_ids - 8 * (n + 1), True)
+        if valido and validar:
+            valido = GrafoCompacto._enteros_validos(desplazamientos, m, True) and GrafoCompacto._enteros_validos(vecinos, n - 1, False)
+        if not valido:
+            print("ERROR: El archivo de grafo binario está incompleto o dañado. (" + str(ruta) + ")")
+            ids = desplazamientos_ids = desplazamientos = vecinos = None
+            _cerrar_mapa(mapa, vistas)
+            return None
+        grafo = cls(ids, desplazamientos, vecinos, seccion(8 * m, 'd'), bool(banderas & 1))
+        grafo._mapa = mapa
+        grafo._vistas = vistas
+        return grafo
+
+    @staticmethod
+    def _enteros_validos(valores, maximo, creciente):
+        """True si todos los valores están entre 0 y maximo y, si creciente, ninguno es menor que el anterior."""
+        if not len(valores):
+            return True
+        if np is not None:
+            arreglo = np.frombuffer(valores, dtype=np.int64)
+            if creciente:
+                return bool(arreglo[0] >= 0 and arreglo[-1] <= maximo and (arreglo[1:] >= arreglo[:-1]).all())
+            return bool(arreglo.min() >= 0 and arreglo.max() <= maximo)
+        if creciente:
+            return valores[0] >= 0 and valores[-1] <= maximo and all(a <= b for a, b in zip(valores, itertools.islice(valores, 1, None)))
+        return min(valores) >= 0 and max(valores) <= maximo
+
+    def cerrar(self):
+        """
+        Libera el archivo mapeado de un grafo cargado con GrafoCompacto.cargar_binario. Después de cerrarlo sus arreglos ya 
+        no pueden consultarse. No hace nada en grafos que no se cargaron de un archivo o que ya se cerraron.
+        """
+        if self._mapa is None:
+            return
+        self.ids = self.desplazamientos = self.vecinos = self.pesos = None
+        self._indice = None
+        _cerrar_mapa(self._mapa, self._vistas)
+        self._mapa = None
+        self._vistas = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    @staticmethod
+    def _arreglo_little_endian(arreglo):
+        """Bytes del arreglo en orden little-endian."""
+        if isinstance(arreglo, array) and sys.byteorder != "little":
+            arreglo = array(arreglo.typecode, arreglo)
+            arreglo.byteswap()
+        return bytes(arreglo)
+
+    def a_grafo(self):
+        """
+        Genera un Grafo (con objetos Nodo y Arista) equivalente. Los pesos se guardan en la propiedad "distancia".
+
+        :rtype: Grafo
+        """
+        grafo = Grafo(self.es_dirigido)
+        for id in self.ids:
+            grafo.crear_nodo(id)
+        ids = self.ids
+        vecinos = self.vecinos
+        pesos = self.pesos
+        desplazamientos = self.desplazamientos
+        for i in range(self.num_nodos()):
+            for k in range(desplazamientos[i], desplazamientos[i + 1]):
+                if self.es_dirigido or i <= vecinos[k]:
+                    grafo.conectar_nodos(ids[i], ids[vecinos[k]], distancia=pesos[k])
+        return grafo
+
+_COMPACTO_MULTIPLE = None #grafo de los procesos de GrafoCompacto.Dijkstra_multiple y BFS_multiple
+
+def _iniciar_multiple(compacto):
+    global _COMPACTO_MULTIPLE
+    _COMPACTO_MULTIPLE = compacto
+
+def _trabajo_multiple(algoritmo, i):
+    return _fila_multiple(_COMPACTO_MULTIPLE, algoritmo, i)
+
+def _fila_multiple(compacto, algoritmo, i):
+    if algoritmo == "BFS":
+        return compacto._BFS_indices(i)[1]
+    return compacto._Dijkstra_indices(i)[0]
+
+def _cerrar_mapa(mapa, vistas):
+    #Las vistas derivadas se liberan antes que aquella de la que salieron; el mmap no puede cerrarse mientras alguna exista.
+    for vista in reversed(vistas):
+        vista.release()
+    vistas.clear()
+    mapa.close()
+
+class _IdsTexto:
+    """Secuencia de IDs de texto de un archivo binario, decodificados al consultarlos."""
+    def __init__(self, desplazamientos, texto):
+        self.desplazamientos = desplazamientos
+        self.texto = texto
+
+    def __len__(self):
+        return len(self.desplazamientos) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self.texto[self.desplazamientos[i]:self.desplazamientos[i + 1]]).decode("utf-8")
 
 class Distribucion:
     """Una clase con métodos para distribuir los nodos de un grafo."""
@@ -751,14 +3301,15 @@ class Distribucion:
         :param float c3: (opcional) Multiplicador de fuerza (= 1 si no se especifica).
         :param int comienzo: (opcional) Índice del nodo con el que se comienza el cálculo.
         :param int operaciones_por_frame: (opcional) Número de nodos calculados. Si <= 0 se calcularán todos. 
+        Para grafos grandes conviene MotorSpring, que usa las mismas fuerzas con repulsión vectorizada o de Barnes-Hut.
         """
         fin_calculo = len(grafo.nodos) if operaciones_por_frame <= 0 else (min(comienzo + operaciones_por_frame, len(grafo.nodos)))
         for nodo in grafo.nodos[comienzo:fin_calculo]:
-            pos_nodo_1 = [nodo.propiedad.get("dis_x", 0), nodo.propiedad.get("dis_y", 0)]
+            pos_nodo_1 = [nodo.get_propiedad("dis_x", 0), nodo.get_propiedad("dis_y", 0)]
             vecinos = []
             #Atracción
-            for vecino in nodo.vecinos:
-                pos_nodo_2 = [vecino[0].propiedad.get("dis_x", 0), vecino[0].propiedad.get("dis_y", 0)]
+            for vecino in nodo.adyacencia.items():
+                pos_nodo_2 = [vecino[0].get_propiedad("dis_x", 0), vecino[0].get_propiedad("dis_y", 0)]
                 d = math.dist(pos_nodo_1, pos_nodo_2)
                 atraccion = c1 * (math.log((d if d > 0 else 0.01)/c2))
                 direccion = [pos_nodo_2[0] - pos_nodo_1[0], pos_nodo_2[1] - pos_nodo_1[1]]
@@ -772,7 +3323,7 @@ class Distribucion:
             #Repulsión
             for otro_nodo in grafo.nodos:
                 if otro_nodo not in vecinos:
-                    pos_nodo_2 = [otro_nodo.propiedad.get("dis_x", 0), otro_nodo.propiedad.get("dis_y", 0)]
+                    pos_nodo_2 = [otro_nodo.get_propiedad("dis_x", 0), otro_nodo.get_propiedad("dis_y", 0)]
                     d = math.dist(pos_nodo_1, pos_nodo_2)
                     repulsion = c3 / math.sqrt(d if d > 0 else 0.01)
                     direccion = [pos_nodo_1[0] - pos_nodo_2[0], pos_nodo_1[1] - pos_nodo_2[1]]
@@ -782,3 +3333,505 @@ class Distribucion:
                     pos_nodo_1 = [max(0, min(limite_x, pos_nodo_1[0])), max(0, min(limite_y, pos_nodo_1[1]))]
                     nodo.definir_propiedad("dis_x", pos_nodo_1[0])
                     nodo.definir_propiedad("dis_y", pos_nodo_1[1])
+
+    @staticmethod
+    def sesion(grafo, limite_x, limite_y, **kwargs):
+        """
+        Inicia una SesionDistribucion que calcula el algoritmo Spring en segundo plano.
+        Los argumentos adicionales se pasan a SesionDistribucion (y de ahí a MotorSpring).
+
+        :param int limite_x: El límite superior de la coordenada horizontal.
+        :param int limite_y: El límite superior de la coordenada vertical.
+        :return: La sesión ya iniciada.
+        """
+        return SesionDistribucion(grafo, limite_x, limite_y, **kwargs).iniciar()
+
+class MotorSpring:
+    """
+    Motor del algoritmo Spring con las mismas fuerzas que Distribucion.spring, pero que mantiene las posiciones en arreglos
+    y calcula un paso completo de una vez: todas las fuerzas se evalúan con las posiciones del paso anterior y
+    las propiedades "dis_x" y "dis_y" se escriben una sola vez por llamada a paso().
+
+    La repulsión (entre nodos no vecinos) se calcula con uno de tres métodos:
+        "vectorizado": exacta con NumPy, O(V²) operaciones por paso en bloques de filas.
+        "malla": aproximada con NumPy: los nodos se reparten en una malla fija sobre los límites y la repulsión se obtiene 
+            como una convolución con FFT, O(V + M log M) por paso con M celdas. Los nodos a menos de una celda se repelen 
+            menos que con la fórmula exacta (el núcleo se suaviza en la distancia de una celda).
+        "barnes_hut": aproximada con un quadtree de Barnes-Hut, O(V log V) por paso en Python puro. No requiere NumPy.
+    Con "auto" se usa "vectorizado" si el grafo tiene hasta UMBRAL_VECTORIZADO nodos y "malla" si tiene más; sin NumPy, "barnes_hut".
+
+    Los nodos y aristas se leen al crear el motor; si el grafo cambia hay que crear un motor nuevo.
+    """
+    UMBRAL_VECTORIZADO = 5000 #nodos
+    TAMANO_MALLA = 512 #celdas en el lado mayor de la malla del método "malla"
+    ELEMENTOS_POR_BLOQUE = 1 << 22 #pares de nodos evaluados a la vez por el método vectorizado
+    PROFUNDIDAD_MAXIMA = 32 #niveles del quadtree; los nodos con la misma posición comparten hoja
+
+    def __init__(self, grafo, limite_x, limite_y, c1=2, c2=200, c3=1, c4=1, metodo="auto", theta=0.8):
+        """
+        :param Grafo grafo: El grafo a distribuir.
+        :param int limite_x: El límite superior de la coordenada horizontal.
+        :param int limite_y: El límite superior de la coordenada vertical.
+        :param float c1: (opcional) Constante de atracción (= 2 si no se especifica).
+        :param float c2: (opcional) Distancia ideal de la arista (= 200 si no se especifica).
+        :param float c3: (opcional) Constante de repulsión (= 1 si no se especifica).
+        :param float c4: (opcional) Multiplicador de fuerza (= 1 si no se especifica).
+        :param str metodo: (opcional) "auto", "vectorizado", "malla" o "barnes_hut" (= "auto" si no se especifica).
+        :param float theta: (opcional) Criterio de apertura de Barnes-Hut: una celda de lado l a distancia d se aproxima por su centro de masa si l < theta * d (= 0.8 si no se especifica).
+        """
+        self.grafo = grafo
+        self.limite_x = limite_x
+        self.limite_y = limite_y
+        self.c1 = c1
+        self.c2 = c2
+        self.c3 = c3
+        self.c4 = c4
+        self.theta = theta
+        indice = grafo._indices_nodos()
+        #Cada entrada de adyacencia es una atracción de vecino -> nodo, como en Distribucion.spring.
+        self.origenes = []
+        self.destinos = []
+        for i, nodo in enumerate(grafo.nodos):
+            for vecino in nodo.adyacencia:
+                self.origenes.append(i)
+                self.destinos.append(indice[vecino])
+        self.x = [float(nodo.get_propiedad("dis_x", 0)) for nodo in grafo.nodos]
+        self.y = [float(nodo.get_propiedad("dis_y", 0)) for nodo in grafo.nodos]
+
+        if metodo == "auto":
+            if np is None:
+                metodo = "barnes_hut"
+            else:
+                metodo = "vectorizado" if len(self.x) <= self.UMBRAL_VECTORIZADO else "malla"
+        elif metodo not in ("vectorizado", "malla", "barnes_hut"):
+            print("ERROR: Método de repulsión desconocido: " + str(metodo) + ". Se usará barnes_hut.")
+            metodo = "barnes_hut"
+        if metodo in ("vectorizado", "malla") and np is None:
+            print("ERROR: El método " + metodo + " requiere NumPy. Se usará barnes_hut.")
+            metodo = "barnes_hut"
+        self.metodo = metodo
+        self._nucleo_malla = None #transformadas del núcleo de repulsión del método "malla", se calculan en el primer paso
+        if np is not None:
+            self.x = np.array(self.x, dtype=np.float64)
+            self.y = np.array(self.y, dtype=np.float64)
+            self.origenes = np.array(self.origenes, dtype=np.intp)
+            self.destinos = np.array(self.destinos, dtype=np.intp)
+
+    def paso(self, iteraciones=1):
+        """
+        Calcula una o más iteraciones del algoritmo y escribe "dis_x" y "dis_y" en los nodos al terminar.
+
+        :param int iteraciones: (opcional) Número de iteraciones (= 1 si no se especifica).
+        :return: El mayor desplazamiento de un nodo en la última iteración.
+        """
+        desplazamiento = self.iterar(iteraciones)
+        self.escribir()
+        return desplazamiento
+
+    def iterar(self, iteraciones=1):
+        """
+        Calcula una o más iteraciones del algoritmo sin escribir las propiedades de los nodos.
+
+        :param int iteraciones: (opcional) Número de iteraciones (= 1 si no se especifica).
+        :return: El mayor desplazamiento de un nodo en la última iteración.
+        """
+        desplazamiento = 0
+        for i in range(iteraciones):
+            if self.metodo == "vectorizado":
+                fuerza_x, fuerza_y = self._fuerzas_vectorizado()
+            elif self.metodo == "malla":
+                fuerza_x, fuerza_y = self._fuerzas_malla()
+            else:
+                fuerza_x, fuerza_y = self._fuerzas_barnes_hut()
+            desplazamiento = self._mover(fuerza_x, fuerza_y)
+        return desplazamiento
+
+    def escribir(self):
+        """Escribe las posiciones actuales en las propiedades "dis_x" y "dis_y" de los nodos."""
+        for nodo, x, y in zip(self.grafo.nodos, self.x, self.y):
+            nodo.definir_propiedad("dis_x", float(x))
+            nodo.definir_propiedad("dis_y", float(y))
+
+    def _mover(self, fuerza_x, fuerza_y):
+        if np is not None:
+            x = np.clip(self.x + fuerza_x * self.c4, 0, self.limite_x)
+            y = np.clip(self.y + fuerza_y * self.c4, 0, self.limite_y)
+            desplazamiento = float(np.hypot(x - self.x, y - self.y).max()) if len(x) else 0
+            self.x, self.y = x, y
+            return desplazamiento
+        desplazamiento = 0
+        c4, limite_x, limite_y = self.c4, self.limite_x, self.limite_y
+        x_anterior, y_anterior = self.x, self.y
+        self.x = [max(0, min(limite_x, x + fx * c4)) for x, fx in zip(x_anterior, fuerza_x)]
+        self.y = [max(0, min(limite_y, y + fy * c4)) for y, fy in zip(y_anterior, fuerza_y)]
+        for x0, y0, x1, y1 in zip(x_anterior, y_anterior, self.x, self.y):
+            desplazamiento = max(desplazamiento, math.hypot(x1 - x0, y1 - y0))
+        return desplazamiento
+
+    def _fuerzas_vectorizado(self):
+        x, y = self.x, self.y
+        n = len(x)
+        fuerza_x = np.zeros(n)
+        fuerza_y = np.zeros(n)
+        #Repulsión de todos contra todos, c3/sqrt(d) en dirección contraria al otro nodo.
+        bloque = max(1, self.ELEMENTOS_POR_BLOQUE // max(n, 1))
+        for inicio in range(0, n, bloque):
+            fin = min(inicio + bloque, n)
+            dx = x[inicio:fin, None] - x[None, :]
+            dy = y[inicio:fin, None] - y[None, :]
+            d = np.hypot(dx, dy)
+            cero = d == 0
+            d[cero] = 1
+            f = self.c3 / (np.sqrt(d) * d)
+            f[cero] = 0
+            fuerza_x[inicio:fin] = (f * dx).sum(axis=1)
+            fuerza_y[inicio:fin] = (f * dy).sum(axis=1)
+        self._fuerzas_vecinos(fuerza_x, fuerza_y, 0)
+        return (fuerza_x, fuerza_y)
+
+    def _fuerzas_vecinos(self, fuerza_x, fuerza_y, suavizado):
+        """Los vecinos no se repelen: se quita su repulsión (con el mismo suavizado) y se suma la atracción c1*log(d/c2) hacia ellos."""
+        if not len(self.origenes):
+            return
+        x, y = self.x, self.y
+        n = len(x)
+        o, v = self.origenes, self.destinos
+        dx = x[v] - x[o]
+        dy = y[v] - y[o]
+        d = np.hypot(dx, dy)
+        cero = d == 0
+        d[cero] = 1
+        f = self.c1 * np.log(d / self.c2) / d + self.c3 / (d * d + suavizado * suavizado) ** 0.75
+        f[cero] = 0
+        fuerza_x += np.bincount(o, weights=f * dx, minlength=n)
+        fuerza_y += np.bincount(o, weights=f * dy, minlength=n)
+
+    def _fuerzas_malla(self):
+        x, y = self.x, self.y
+        n = len(x)
+        if self._nucleo_malla is None:
+            self._nucleo_malla = self._crear_nucleo_malla()
+        h, celdas_x, celdas_y, forma, nucleo_x, nucleo_y = self._nucleo_malla
+        #Cada nodo reparte su masa entre las 4 esquinas de su celda (cloud-in-cell) y la fuerza se interpola con los mismos pesos.
+        gx = x / h
+        gy = y / h
+        i = np.clip(np.floor(gx).astype(np.intp), 0, celdas_x - 2)
+        j = np.clip(np.floor(gy).astype(np.intp), 0, celdas_y - 2)
+        fx = gx - i
+        fy = gy - j
+        esquinas = (i * celdas_y + j, (i + 1) * celdas_y + j, i * celdas_y + j + 1, (i + 1) * celdas_y + j + 1)
+        pesos = ((1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy)
+        densidad = np.zeros(forma)
+        densidad[:celdas_x, :celdas_y] = np.bincount(np.concatenate(esquinas), weights=np.concatenate(pesos), 
+                                                     minlength=celdas_x * celdas_y).reshape(celdas_x, celdas_y)
+        transformada = np.fft.rfft2(densidad)
+        malla_x = np.fft.irfft2(transformada * nucleo_x, s=forma)[:celdas_x, :celdas_y].ravel()
+        malla_y = np.fft.irfft2(transformada * nucleo_y, s=forma)[:celdas_x, :celdas_y].ravel()
+        fuerza_x = sum(peso * malla_x[esquina] for esquina, peso in zip(esquinas, pesos))
+        fuerza_y = sum(peso * malla_y[esquina] for esquina, peso in zip(esquinas, pesos))
+        self._fuerzas_vecinos(fuerza_x, fuerza_y, h)
+        return (fuerza_x, fuerza_y)
+
+    def _crear_nucleo_malla(self):
+        """
+        Malla fija sobre [0, limite_x] x [0, limite_y] (los nodos nunca salen de ella) y transformadas del núcleo de repulsión 
+        c3 * (dx, dy) / (d² + h²)^(3/4), con al menos el doble de celdas por lado para que la convolución no dé la vuelta.
+
+        :return: Tupla (h, celdas_x, celdas_y, forma de la malla extendida, nucleo_x, nucleo_y).
+        """
+        h = max(self.limite_x, self.limite_y) / self.TAMANO_MALLA or 1.0
+        celdas_x = int(math.ceil(self.limite_x / h)) + 2
+        celdas_y = int(math.ceil(self.limite_y / h)) + 2
+        total_x = MotorSpring._tamano_fft(2 * celdas_x)
+        total_y = MotorSpring._tamano_fft(2 * celdas_y)
+        desplazamiento_x = np.arange(total_x)
+        desplazamiento_x[celdas_x:] -= total_x
+        desplazamiento_y = np.arange(total_y)
+        desplazamiento_y[celdas_y:] -= total_y
+        dx = (desplazamiento_x * h)[:, None]
+        dy = (desplazamiento_y * h)[None, :]
+        f = self.c3 / (dx * dx + dy * dy + h * h) ** 0.75
+        return (h, celdas_x, celdas_y, (total_x, total_y), np.fft.rfft2(f * dx), np.fft.rfft2(f * dy))
+
+    @staticmethod
+    def _tamano_fft(n):
+        """Menor entero >= n sin factores primos mayores que 5, tamaños para los que la FFT es rápida."""
+        while True:
+            m = n
+            for primo in (2, 3, 5):
+                while m % primo == 0:
+                    m //= primo
+            if m == 1:
+                return n
+            n += 1
+
+    def _fuerzas_barnes_hut(self):
+        x = self.x.tolist() if np is not None else self.x
+        y = self.y.tolist() if np is not None else self.y
+        n = len(x)
+        c1, c2, c3, theta = self.c1, self.c2, self.c3, self.theta
+        masa, suma_x, suma_y, lado, hijos = self._quadtree(x, y)
+        masa_x = [sx / m if m else 0.0 for sx, m in zip(suma_x, masa)]
+        masa_y = [sy / m if m else 0.0 for sy, m in zip(suma_y, masa)]
+        sqrt = math.sqrt
+        fuerza_x = [0.0] * n
+        fuerza_y = [0.0] * n
+        for i in range(n):
+            xi = x[i]
+            yi = y[i]
+            fx = fy = 0.0
+            pila = [0]
+            while pila:
+                celda = pila.pop()
+                m = masa[celda]
+                dx = xi - masa_x[celda]
+                dy = yi - masa_y[celda]
+                d = sqrt(dx * dx + dy * dy)
+                if hijos[celda] is None or lado[celda] < theta * d:
+                    if d > 0:
+                        f = m * c3 / (sqrt(d) * d)
+                        fx += f * dx
+                        fy += f * dy
+                else:
+                    pila.extend(hijos[celda])
+            fuerza_x[i] = fx
+            fuerza_y[i] = fy
+        #Igual que en el método vectorizado, los vecinos atraen en lugar de repeler.
+        for o, v in zip(self.origenes, self.destinos):
+            dx = x[v] - x[o]
+            dy = y[v] - y[o]
+            d = sqrt(dx * dx + dy * dy)
+            if d > 0:
+                f = (c1 * math.log(d / c2) + c3 / sqrt(d)) / d
+                fuerza_x[o] += f * dx
+                fuerza_y[o] += f * dy
+        return (fuerza_x, fuerza_y)
+
+    def _quadtree(self, x, y):
+        """
+        Construye el quadtree de Barnes-Hut como arreglos paralelos indexados por celda (la raíz es la celda 0).
+
+        :return: Tupla (masa, suma_x, suma_y, lado, hijos); hijos[celda] es None en las hojas o la lista de sus celdas hijas no vacías.
+        """
+        masa = [0]
+        suma_x = [0.0]
+        suma_y = [0.0]
+        lado = [0.0]
+        centro_x = [0.0]
+        centro_y = [0.0]
+        hijos = [None]
+        punto = [-1]
+        if not x:
+            return (masa, suma_x, suma_y, lado, hijos)
+        min_x, max_x, min_y, max_y = min(x), max(x), min(y), max(y)
+        lado[0] = max(max_x - min_x, max_y - min_y, 1e-9)
+        centro_x[0] = (min_x + max_x) / 2
+        centro_y[0] = (min_y + max_y) / 2
+
+        def hija(celda, px, py):
+            #Índice de la celda hija que contiene (px, py); se crea si no existe.
+            cuadrante = (px >= centro_x[celda]) + 2 * (py >= centro_y[celda])
+            nueva = hijos[celda][cuadrante]
+            if nueva < 0:
+                nueva = len(masa)
+                cuarto = lado[celda] / 4
+                masa.append(0)
+                suma_x.append(0.0)
+                suma_y.append(0.0)
+                lado.append(lado[celda] / 2)
+                centro_x.append(centro_x[celda] + (cuarto if cuadrante & 1 else -cuarto))
+                centro_y.append(centro_y[celda] + (cuarto if cuadrante & 2 else -cuarto))
+                hijos.append(None)
+                punto.append(-1)
+                hijos[celda][cuadrante] = nueva
+            return nueva
+
+        for i, (px, py) in enumerate(zip(x, y)):
+            celda = 0
+            profundidad = 0
+            while True:
+                masa[celda] += 1
+                suma_x[celda] += px
+                suma_y[celda] += py
+                if hijos[celda] is None:
+                    if masa[celda] == 1:
+                        punto[celda] = i
+                        break
+                    if profundidad >= self.PROFUNDIDAD_MAXIMA:
+                        break
+                    #La hoja ya tenía un nodo: se divide y ese nodo baja a su celda hija.
+                    anterior = punto[celda]
+                    punto[celda] = -1
+                    hijos[celda] = [-1, -1, -1, -1]
+                    otra = hija(celda, x[anterior], y[anterior])
+                    masa[otra] = 1
+                    suma_x[otra] = x[anterior]
+                    suma_y[otra] = y[anterior]
+                    punto[otra] = anterior
+                celda = hija(celda, px, py)
+                profundidad += 1
+        for celda in range(len(hijos)):
+            if hijos[celda] is not None:
+                hijos[celda] = [h for h in hijos[celda] if h >= 0]
+        return (masa, suma_x, suma_y, lado, hijos)
+
+class SesionDistribucion:
+    """
+    Calcula un MotorSpring en otro proceso (o hilo) y publica cada paso en un buffer de memoria compartida.
+    Quien dibuja sólo lee la última copia completa de las posiciones con posiciones() o escribir(), sin esperar al cálculo.
+
+    El buffer contiene ENCABEZADO_SESION seguido de las posiciones x y luego y (float64), en el orden de grafo.nodos.
+    La secuencia del encabezado es impar mientras el trabajador escribe; el lector repite la copia si cambió mientras leía.
+    La sesión converge cuando el mayor desplazamiento de un paso es menor a la tolerancia o se alcanza max_iteraciones.
+    """
+    def __init__(self, grafo, limite_x, limite_y, tolerancia=0.01, max_iteraciones=-1, iteraciones_por_paso=1, hilo=False, **kwargs):
+        """
+        :param Grafo grafo: El grafo a distribuir. Las posiciones iniciales se toman de "dis_x" y "dis_y".
+        :param int limite_x: El límite superior de la coordenada horizontal.
+        :param int limite_y: El límite superior de la coordenada vertical.
+        :param float tolerancia: (opcional) Desplazamiento máximo con el que se considera convergido (= 0.01 si no se especifica).
+        :param int max_iteraciones: (opcional) Iteraciones tras las que se detiene el cálculo. Si < 0 no hay límite (= -1 si no se especifica).
+        :param int iteraciones_por_paso: (opcional) Iteraciones calculadas entre cada publicación de posiciones (= 1 si no se especifica).
+        :param bool hilo: (opcional) Usar un hilo en lugar de un proceso (= False si no se especifica). Un hilo comparte el GIL con quien dibuja.
+        Los argumentos adicionales (c1, c2, c3, c4, metodo, theta) se pasan a MotorSpring.
+        """
+        self.grafo = grafo
+        self.num_nodos = len(grafo.nodos)
+        motor = MotorSpring(grafo, limite_x, limite_y, **kwargs)
+        self._memoria = shared_memory.SharedMemory(create=True, size=ENCABEZADO_SESION.size + 16 * max(self.num_nodos, 1))
+        self._enteros = self._memoria.buf[:24].cast("q")
+        self._reales = self._memoria.buf[24:].cast("d")
+        #El estado inicial es el que tendrá el trabajador al iniciar (no está pausado), para que pausar/reanudar según estado funcione desde el principio.
+        _publicar_posiciones(self._enteros, self._reales, motor, 0, SESION_CORRIENDO, 0.0)
+        #El trabajador recibe una copia del motor sin el grafo: sólo necesita los arreglos.
+        motor = copy.copy(motor)
+        motor.grafo = None
+        evento, trabajador = (threading.Event, threading.Thread) if hilo else (multiprocessing.Event, multiprocessing.Process)
+        self._activa = evento()
+        self._activa.set()
+        self._detener = evento()
+        self._trabajador = trabajador(target=_trabajo_sesion, args=(motor, self._memoria.name, self._activa, self._detener, tolerancia, max_iteraciones, iteraciones_por_paso), daemon=True)
+        self._iniciada = False
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, tipo, valor, traza):
+        self.detener()
+
+    def iniciar(self):
+        """
+        Inicia el cálculo en segundo plano. No hace nada si la sesión ya se inició o se detuvo.
+
+        :return: La misma sesión.
+        """
+        if not self._iniciada and self._memoria is not None:
+            self._iniciada = True
+            self._trabajador.start()
+        return self
+
+    def pausar(self):
+        """Suspende el cálculo después del paso en curso."""
+        self._activa.clear()
+
+    def reanudar(self):
+        """Continúa el cálculo suspendido con pausar()."""
+        self._activa.set()
+
+    def detener(self):
+        """Termina el trabajador y libera la memoria compartida. Las posiciones deben leerse antes."""
+        if self._memoria is None:
+            return
+        self._detener.set()
+        self._activa.set()
+        if self._trabajador.is_alive():
+            self._trabajador.join()
+        self._enteros.release()
+        self._reales.release()
+        self._memoria.close()
+        self._memoria.unlink()
+        self._memoria = None
+
+    @property
+    def iteraciones(self):
+        return self._enteros[1]
+
+    @property
+    def estado(self):
+        """Uno de SESION_CORRIENDO, SESION_PAUSADA, SESION_CONVERGIDA o SESION_TERMINADA."""
+        return self._enteros[2]
+
+    @property
+    def convergida(self):
+        return self._enteros[2] == SESION_CONVERGIDA
+
+    @property
+    def desplazamiento(self):
+        """Mayor desplazamiento de un nodo en el último paso publicado."""
+        return self._reales[0]
+
+    def posiciones(self):
+        """
+        Copia la última publicación completa de las posiciones.
+
+        :return: Tupla (x, y) de arreglos alineados con grafo.nodos (numpy.ndarray si NumPy está instalado, array("d") si no).
+        """
+        n = self.num_nodos
+        while True:
+            secuencia = self._enteros[0]
+            if secuencia % 2:
+                continue
+            if np is not None:
+                x = np.array(self._reales[1:n + 1])
+                y = np.array(self._reales[n + 1:2 * n + 1])
+            else:
+                x = array("d", self._reales[1:n + 1])
+                y = array("d", self._reales[n + 1:2 * n + 1])
+            if self._enteros[0] == secuencia:
+                return (x, y)
+
+    def escribir(self):
+        """Escribe la última publicación de las posiciones en las propiedades "dis_x" y "dis_y" de los nodos."""
+        x, y = self.posiciones()
+        for nodo, nodo_x, nodo_y in zip(self.grafo.nodos, x, y):
+            nodo.definir_propiedad("dis_x", float(nodo_x))
+            nodo.definir_propiedad("dis_y", float(nodo_y))
+
+def _publicar_posiciones(enteros, reales, motor, iteraciones, estado, desplazamiento):
+    #Escritura del buffer de SesionDistribucion: la secuencia impar marca la copia en curso.
+    n = len(motor.x)
+    enteros[0] += 1
+    reales[1:n + 1] = motor.x if np is not None else array("d", motor.x)
+    reales[n + 1:2 * n + 1] = motor.y if np is not None else array("d", motor.y)
+    reales[0] = desplazamiento
+    enteros[1] = iteraciones
+    enteros[2] = estado
+    enteros[0] += 1
+
+def _trabajo_sesion(motor, nombre_memoria, activa, detener, tolerancia, max_iteraciones, iteraciones_por_paso):
+    #Ciclo del trabajador de SesionDistribucion (función de módulo para que un proceso nuevo pueda importarla).
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    enteros = memoria.buf[:24].cast("q")
+    reales = memoria.buf[24:].cast("d")
+    iteraciones = 0
+    convergida = False
+    try:
+        while not detener.is_set():
+            if not activa.is_set():
+                enteros[2] = SESION_PAUSADA
+                activa.wait(0.1)
+                continue
+            if convergida:
+                enteros[2] = SESION_CONVERGIDA
+                detener.wait(0.1)
+                continue
+            pasos = iteraciones_por_paso if max_iteraciones < 0 else min(iteraciones_por_paso, max_iteraciones - iteraciones)
+            desplazamiento = motor.iterar(pasos) if pasos > 0 else 0.0
+            iteraciones += pasos
+            convergida = desplazamiento < tolerancia or 0 <= max_iteraciones <= iteraciones
+            _publicar_posiciones(enteros, reales, motor, iteraciones, SESION_CONVERGIDA if convergida else SESION_CORRIENDO, desplazamiento)
+    finally:
+        enteros[2] = SESION_TERMINADA
+        enteros.release()
+        reales.release()
+        memoria.close()
@@ -0,0 +1,313 @@
+#En este módulo se miden los tiempos de los algoritmos de P-Grafos.
+#Ejecutar con: python rendimiento.py
+
+import pgrafos
+import os
+import random
+import time
+import tracemalloc
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return (time.perf_counter() - inicio, resultado)
+
+def construccion_lineal(tamanos=(10000, 20000, 40000, 80000)):
+    #Si get_nodo es O(1), duplicar la cantidad de nodos debe duplicar (aprox.) el tiempo de construcción.
+    print("Construcción de mallas (nodos -> segundos, microsegundos por nodo)")
+    for n in tamanos:
+        tiempo, grafo = medir(pgrafos.Grafo.generar_malla, n // 100, 100)
+        print("  " + str(grafo.num_nodos()) + " -> " + format(tiempo, ".3f") + " s, " + format(tiempo / grafo.num_nodos() * 1e6, ".2f") + " us/nodo")
+
+def kruskal_inverso(n=1000, p=0.1):
+    #Gilbert con n=1000 y p=0.1 genera ~50k aristas.
+    grafo = pgrafos.Grafo.generar_Gilbert(n, p)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    print("MST sobre Gilbert(" + str(n) + ", " + str(p) + ") con " + str(len(grafo.aristas)) + " aristas")
+    tiempo, (mst, peso_d) = medir(grafo.KruskalD)
+    print("  KruskalD: " + format(tiempo, ".3f") + " s, peso " + str(peso_d))
+    tiempo, (mst, peso_i) = medir(grafo.KruskalI)
+    print("  KruskalI: " + format(tiempo, ".3f") + " s, peso " + str(peso_i))
+
+def prim_malla(n=250, m=250):
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    tiempo, (arbol, peso) = medir(grafo.Prim)
+    print("Prim sobre malla " + str(n) + "x" + str(m) + ": " + format(tiempo, ".3f") + " s, peso " + str(peso))
+
+def camino_punto_a_punto(n=200, m=200, consultas=20):
+    #Malla con coordenadas "x"/"y" y aristas de longitud >= 1, así la distancia euclidiana es una heurística admisible.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for nodo in grafo.nodos:
+        nodo.definir_propiedad("x", nodo.identificador % m)
+        nodo.definir_propiedad("y", nodo.identificador // m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 10))
+    pares = [(random.randrange(n * m), random.randrange(n * m)) for i in range(consultas)]
+    print("Camino más corto en malla " + str(n) + "x" + str(m) + " (" + str(consultas) + " consultas, nodos fijados promedio)")
+    tiempo = 0
+    for s, t in pares:
+        tiempo += medir(grafo.Dijkstra, s)[0]
+    print("  Dijkstra completo: " + format(tiempo, ".3f") + " s, " + str(grafo.num_nodos()) + " nodos")
+    for modo in ("dijkstra", "bidireccional", "A*"):
+        tiempo = 0
+        fijados = 0
+        for s, t in pares:
+            t_consulta, resultado = medir(grafo._camino_mas_corto, s, t, modo)
+            tiempo += t_consulta
+            fijados += resultado[2]
+        print("  " + modo + ": " + format(tiempo, ".3f") + " s, " + str(fijados // consultas) + " nodos")
+
+def memoria_compacta(n=200, m=200):
+    tracemalloc.start()
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    memoria_objetos = tracemalloc.get_traced_memory()[0]
+    compacto = grafo.compilar()
+    memoria_compacto = tracemalloc.get_traced_memory()[0] - memoria_objetos
+    tracemalloc.stop()
+    print("Memoria de malla " + str(n) + "x" + str(m) + " (" + str(len(grafo.aristas)) + " aristas)")
+    print("  Grafo: " + format(memoria_objetos / 2**20, ".1f") + " MiB, GrafoCompacto: " + format(memoria_compacto / 2**20, ".1f") + " MiB")
+    for nombre, funcion, args in (("BFS", "BFS", (0,)), ("Dijkstra", "Dijkstra", (0,)), ("Prim", "Prim", ()), ("Kruskal", "KruskalD", ())):
+        tiempo_grafo = medir(getattr(grafo, funcion), *args)[0]
+        tiempo_compacto = medir(getattr(compacto, nombre), *args)[0]
+        print("  " + nombre + ": Grafo " + format(tiempo_grafo, ".3f") + " s, GrafoCompacto " + format(tiempo_compacto, ".3f") + " s")
+
+class _NodoDict:
+    #Nodo y Arista como eran antes de __slots__: atributos en __dict__ y diccionario de propiedades siempre creado.
+    def __init__(self, id):
+        self.identificador = id
+        self.propiedad = {}
+        self.vecinos = []
+
+class _AristaDict:
+    def __init__(self, **kwargs):
+        self.propiedad = {}
+        self.extremos = (None, None)
+        for llave, valor in kwargs.items():
+            self.propiedad[llave] = valor
+
+def _memoria_objetos(clase_nodo, clase_arista, n):
+    #Bytes promedio por Nodo, por Arista sin propiedades y por Arista con sólo "distancia" (incluye la referencia en la lista).
+    tracemalloc.start()
+    nodos = [clase_nodo(i) for i in range(n)]
+    memoria_nodos = tracemalloc.get_traced_memory()[0]
+    aristas = [clase_arista() for i in range(n)]
+    memoria_aristas = tracemalloc.get_traced_memory()[0]
+    aristas_peso = [clase_arista(distancia=i) for i in range(n)]
+    memoria_aristas_peso = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (memoria_nodos / n, (memoria_aristas - memoria_nodos) / n, (memoria_aristas_peso - memoria_aristas) / n)
+
+def memoria_por_objeto(n=100000):
+    antes = _memoria_objetos(_NodoDict, _AristaDict, n)
+    despues = _memoria_objetos(pgrafos.Nodo, pgrafos.Arista, n)
+    print("Memoria por objeto (bytes, con __dict__ -> con __slots__)")
+    for nombre, k in (("Nodo", 0), ("Arista", 1), ("Arista con distancia", 2)):
+        print("  " + nombre + ": " + format(antes[k], ".0f") + " -> " + format(despues[k], ".0f"))
+
+def bfs_sin_arbol(n=300, m=300):
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    print("BFS en malla " + str(n) + "x" + str(m) + " (" + str(grafo.num_aristas()) + " aristas)")
+    print("  BFS (árbol): " + format(medir(grafo.BFS, 0)[0], ".3f") + " s")
+    print("  BFS_padres: " + format(medir(grafo.BFS_padres, 0)[0], ".3f") + " s")
+    print("  BFS_capas: " + format(medir(lambda: sum(1 for capa in grafo.BFS_capas(0)))[0], ".3f") + " s")
+
+def escritura_gv(n=300, m=300):
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    with open(os.devnull, 'w') as archivo:
+        tiempo = medir(grafo.escribir, archivo)[0]
+    print("Escritura GV de malla " + str(n) + "x" + str(m) + ": " + format(tiempo, ".3f") + " s, " + format(grafo.num_aristas() / tiempo, ".0f") + " aristas/s")
+
+def lectura_gv(n=300, m=300, ruta="rendimiento_malla"):
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    grafo.guardar(ruta, directorio=None)
+    tiempo, cargado = medir(pgrafos.Grafo.generar_desde_archivo, ruta + ".gv")
+    os.remove(ruta + ".gv")
+    print("Lectura GV de malla " + str(n) + "x" + str(m) + ": " + format(tiempo, ".3f") + " s, " + format(cargado.num_aristas() / tiempo, ".0f") + " aristas/s")
+
+def binario_ida_vuelta(n=300, m=300, ruta="rendimiento_malla"):
+    #Compara los tiempos de carga de texto y binario (la ida y vuelta se verifica en tests/test_binario.py).
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    grafo.guardar(ruta, directorio=None)
+    tiempo_texto, desde_texto = medir(pgrafos.Grafo.generar_desde_archivo, ruta + ".gv")
+    desde_texto.guardar_binario(ruta + ".pgr")
+    tiempo_sin_validar, compacto = medir(pgrafos.Grafo.cargar_binario, ruta + ".pgr", validar=False)
+    compacto.cerrar()
+    tiempo_binario, compacto = medir(pgrafos.Grafo.cargar_binario, ruta + ".pgr")
+    tiempo_consulta = medir(compacto.BFS, "0")[0]
+    compacto.cerrar()
+    os.remove(ruta + ".gv")
+    os.remove(ruta + ".pgr")
+    print("Carga de malla " + str(n) + "x" + str(m))
+    print("  GV: " + format(tiempo_texto, ".3f") + " s, binario (mmap): " + format(tiempo_binario, ".4f") + " s (" + format(tiempo_sin_validar, ".4f") + 
+          " s sin validar) + BFS " + format(tiempo_consulta, ".3f") + " s")
+
+def distribucion_spring(n=40, m=40, tamanos=(2500, 10000, 50000, 100000)):
+    #Distribucion.spring es O(V²) en Python puro: se mide sólo en una malla pequeña y se compara con MotorSpring.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    pgrafos.Distribucion.aleatoria(grafo, 1280, 720)
+    print("Distribución Spring (segundos por iteración)")
+    print("  Distribucion.spring, " + str(grafo.num_nodos()) + " nodos: " + format(medir(pgrafos.Distribucion.spring, grafo, 1280, 720, c1=110, c2=15, c3=6, c4=0.01)[0], ".3f") + " s")
+    for tamano in tamanos:
+        grafo = pgrafos.Grafo.generar_malla(tamano // 100, 100)
+        pgrafos.Distribucion.aleatoria(grafo, 1280, 720)
+        motor = pgrafos.MotorSpring(grafo, 1280, 720, c1=110, c2=15, c3=6, c4=0.01)
+        print("  MotorSpring (" + motor.metodo + "), " + str(grafo.num_nodos()) + " nodos: " + format(medir(motor.paso)[0], ".3f") + " s")
+
+def geografico_simple(tamanos=(25000, 50000, 100000), grado=8):
+    #r se elige para mantener el grado promedio constante (grado ≈ n·π·r²): el tiempo debe crecer linealmente con n.
+    print("Generación geográfica simple (grado promedio ~" + str(grado) + ")")
+    for n in tamanos:
+        r = (grado / (n * 3.141592653589793)) ** 0.5
+        tiempo, grafo = medir(pgrafos.Grafo.generar_geo_simple, n, r)
+        tiempo_compacto, compacto = medir(pgrafos.Grafo.generar_geo_simple, n, r, compacto=True)
+        print("  " + str(n) + " nodos, " + str(grafo.num_aristas()) + " aristas: Grafo " + format(tiempo, ".3f") + " s, GrafoCompacto " + format(tiempo_compacto, ".3f") + " s")
+
+def gilbert_disperso(n=100000, p=1e-4):
+    #Con saltos geométricos el tiempo depende de n + m y no de las n² parejas.
+    tiempo, grafo = medir(pgrafos.Grafo.generar_Gilbert, n, p, semilla=1)
+    print("Gilbert(" + str(n) + ", " + str(p) + "): " + str(grafo.num_aristas()) + " aristas en " + format(tiempo, ".3f") + " s")
+
+def barabasi_albert(tamanos=(50000, 100000, 200000), m=5):
+    #El muestreo sobre la lista de extremos es O(1): el tiempo por arista debe mantenerse constante.
+    print("Barabási-Albert (m=" + str(m) + ")")
+    for n in tamanos:
+        tiempo, grafo = medir(pgrafos.Grafo.generar_BarabasiAlbert, n, m, semilla=1)
+        tiempo_compacto = medir(pgrafos.Grafo.generar_BarabasiAlbert, n, m, semilla=1, compacto=True)[0]
+        print("  " + str(grafo.num_aristas()) + " aristas: Grafo " + format(tiempo, ".3f") + " s, GrafoCompacto " + format(tiempo_compacto, ".3f") + " s")
+
+def construccion_masiva(n=100000, m=500000):
+    #Aristas por segundo al construir el mismo grafo arista por arista y en lote, y con cada generador.
+    pares = [(random.randrange(n), random.randrange(n)) for i in range(m)]
+    pesos = [random.randint(1, 100) for i in range(m)]
+    print("Construcción de grafos (aristas/s)")
+    def una_por_una():
+        grafo = pgrafos.Grafo(False)
+        for i in range(n):
+            grafo.crear_nodo(i)
+        for (id_de, id_a), peso in zip(pares, pesos):
+            grafo.conectar_nodos(id_de, id_a, distancia=peso)
+        return grafo
+    for nombre, funcion, args in (("conectar_nodos", una_por_una, ()),
+                                  ("desde_aristas", pgrafos.Grafo.desde_aristas, (range(n), pares, pesos)),
+                                  ("generar_malla", pgrafos.Grafo.generar_malla, (500, 500)),
+                                  ("generar_ErdosRenyi", pgrafos.Grafo.generar_ErdosRenyi, (n, m)),
+                                  ("generar_Gilbert", pgrafos.Grafo.generar_Gilbert, (n, 1e-4)),
+                                  ("generar_geo_simple", pgrafos.Grafo.generar_geo_simple, (n, 0.005)),
+                                  ("generar_BarabasiAlbert", pgrafos.Grafo.generar_BarabasiAlbert, (n, 5)),
+                                  ("generar_DorogovtsevMendes", pgrafos.Grafo.generar_DorogovtsevMendes, (n,))):
+        tiempo, grafo = medir(funcion, *args)
+        print("  " + nombre + ": " + str(grafo.num_aristas()) + " aristas, " + format(grafo.num_aristas() / tiempo, ".0f") + " aristas/s")
+        del grafo
+
+def fuentes_multiples(n=60, m=60, fuentes=400):
+    #Con procesos suficientes el tiempo debe bajar casi en proporción al número de núcleos.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    ids = random.sample(range(n * m), fuentes)
+    print("Dijkstra desde " + str(fuentes) + " fuentes en malla " + str(n) + "x" + str(m) + " (" + str(os.cpu_count()) + " núcleos)")
+    for procesos in sorted({1, 2, 4, os.cpu_count() or 1}):
+        tiempo = medir(grafo.Dijkstra_multiple, ids, procesos)[0]
+        print("  " + str(procesos) + " procesos: " + format(tiempo, ".3f") + " s")
+
+def consultas_repetidas(n=150, m=150, repeticiones=20):
+    #La primera consulta se calcula; las repetidas se sirven de la caché hasta que el grafo cambia.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    print("Consultas repetidas en malla " + str(n) + "x" + str(m) + " (" + str(repeticiones) + " veces cada una)")
+    for nombre, funcion, args in (("esta_conectado", grafo.esta_conectado, ()), ("distancias_Dijkstra", grafo.distancias_Dijkstra, (0,)), ("puentes", grafo.puentes, ())):
+        grafo.tamano_cache = 0
+        tiempo_sin_cache = medir(lambda: [funcion(*args) for i in range(repeticiones)])[0]
+        grafo.tamano_cache = pgrafos.TAMANO_CACHE
+        tiempo_con_cache = medir(lambda: [funcion(*args) for i in range(repeticiones)])[0]
+        print("  " + nombre + ": sin caché " + format(tiempo_sin_cache, ".3f") + " s, con caché " + format(tiempo_con_cache, ".3f") + " s")
+    grafo.aristas[0].definir_propiedad("distancia", 1)
+    grafo.distancias_Dijkstra(0)
+    print("  " + str(grafo.estadisticas_cache()))
+
+def dijkstra_dinamico(n=150, m=150, cambios=200):
+    #Cada cambio de distancia se repara en el subárbol afectado; se compara contra recalcular distancias_Dijkstra.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    grafo.tamano_cache = 0
+    arbol = pgrafos.DijkstraDinamico(grafo, 0)
+    pares = [(arista.extremos[0].identificador, arista.extremos[1].identificador) for arista in random.sample(grafo.aristas, cambios)]
+    cambiados = 0
+    tiempo = 0
+    for id_de, id_a in pares:
+        t_cambio, resultado = medir(arbol.definir_distancia, id_de, id_a, random.randint(1, 100))
+        tiempo += t_cambio
+        cambiados += len(resultado)
+    tiempo_completo = medir(grafo.distancias_Dijkstra, 0)[0]
+    print("Dijkstra dinámico en malla " + str(n) + "x" + str(m) + " (" + str(cambios) + " cambios de distancia)")
+    print("  reparación: " + format(tiempo / cambios * 1000, ".2f") + " ms por cambio, " + str(cambiados // cambios) + " nodos cambiados en promedio")
+    print("  distancias_Dijkstra completo: " + format(tiempo_completo * 1000, ".2f") + " ms")
+
+def mst_dinamico(n=150, m=150, cambios=1000):
+    #Cada arista nueva se compara con la más pesada del ciclo que cierra (ArbolLinkCut); se compara contra recalcular KruskalD.
+    grafo = pgrafos.Grafo.generar_malla(n, m)
+    for arista in grafo.aristas:
+        arista.definir_propiedad("distancia", random.randint(1, 100))
+    grafo.tamano_cache = 0
+    t_inicial, arbol = medir(pgrafos.MSTDinamico, grafo)
+    pares = [random.sample(range(n * m), 2) for _ in range(cambios)]
+    reemplazos = 0
+    tiempo = 0
+    for id_de, id_a in pares:
+        t_cambio, cambio = medir(arbol.conectar_nodos, id_de, id_a, distancia=random.randint(1, 100))
+        tiempo += t_cambio
+        reemplazos += cambio
+    tiempo_completo, resultado = medir(grafo.KruskalD)
+    print("MST dinámico en malla " + str(n) + "x" + str(m) + " (" + str(cambios) + " aristas nuevas, " + str(reemplazos) + " reemplazos)")
+    print("  construcción: " + format(t_inicial, ".3f") + " s")
+    print("  actualización: " + format(tiempo / cambios * 1000, ".3f") + " ms por arista")
+    print("  KruskalD completo: " + format(tiempo_completo * 1000, ".2f") + " ms, mismo peso: " + str(resultado[1] == arbol.peso_total))
+
+def componentes(n=200000, m=200000):
+    #Un ErdosRenyi disperso (grado promedio 2) se parte en muchas componentes; todo se calcula en O(V + E) sobre la copia compacta.
+    grafo = pgrafos.Grafo.generar_ErdosRenyi(n, m, False)
+    dirigido = pgrafos.Grafo.generar_ErdosRenyi(n, m, True)
+    print("Componentes en ErdosRenyi(" + str(n) + ", " + str(m) + ")")
+    tiempo, (cantidad, etiquetas) = medir(grafo.componentes_conexas)
+    print("  componentes_conexas: " + str(cantidad) + " en " + format(tiempo, ".3f") + " s")
+    tiempo, puentes = medir(grafo.puentes)
+    print("  puentes: " + str(len(puentes)) + " en " + format(tiempo, ".3f") + " s")
+    tiempo, articulaciones = medir(grafo.puntos_articulacion)
+    print("  puntos_articulacion: " + str(len(articulaciones)) + " en " + format(tiempo, ".3f") + " s")
+    tiempo, (cantidad, etiquetas) = medir(dirigido.componentes_fuertes)
+    print("  componentes_fuertes (dirigido): " + str(cantidad) + " en " + format(tiempo, ".3f") + " s")
+
+if __name__ == "__main__":
+    construccion_lineal()
+    kruskal_inverso()
+    prim_malla()
+    camino_punto_a_punto()
+    memoria_compacta()
+    memoria_por_objeto()
+    bfs_sin_arbol()
+    escritura_gv()
+    lectura_gv()
+    binario_ida_vuelta()
+    distribucion_spring()
+    geografico_simple()
+    gilbert_disperso()
+    barabasi_albert()
+    construccion_masiva()
+    fuentes_multiples()
+    consultas_repetidas()
+    dijkstra_dinamico()
+    mst_dinamico()
+    componentes()
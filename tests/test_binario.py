@@ -0,0 +1,109 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+import pgrafos
+
+
+def aristas_con_peso(grafo):
+    #Aristas (extremos, distancia) con los IDs como texto; sin orientación en grafos no dirigidos.
+    aristas = set()
+    for arista in grafo.aristas:
+        extremos = (str(arista.extremos[0]), str(arista.extremos[1]))
+        aristas.add((extremos if grafo.es_dirigido else frozenset(extremos), float(arista.get_distancia())))
+    return aristas
+
+
+class TestBinarioIdaVuelta(unittest.TestCase):
+    """Texto GV -> Grafo.guardar_binario -> Grafo.cargar_binario -> GrafoCompacto.a_grafo conserva el grafo."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def ida_vuelta(self, grafo):
+        grafo.guardar("grafo", directorio=self.directorio.name)
+        desde_texto = pgrafos.Grafo.generar_desde_archivo(self.ruta("grafo.gv"))
+        desde_texto.guardar_binario(self.ruta("grafo.pgr"))
+        compacto = pgrafos.Grafo.cargar_binario(self.ruta("grafo.pgr"))
+        self.assertIsNotNone(compacto)
+        desde_binario = compacto.a_grafo()
+        self.assertEqual(desde_binario.es_dirigido, grafo.es_dirigido)
+        self.assertEqual([nodo.identificador for nodo in desde_binario.nodos], [nodo.identificador for nodo in desde_texto.nodos])
+        self.assertEqual({nodo.identificador for nodo in desde_binario.nodos}, {str(nodo.identificador) for nodo in grafo.nodos})
+        self.assertEqual(desde_binario.num_aristas(), grafo.num_aristas())
+        self.assertEqual(aristas_con_peso(desde_binario), aristas_con_peso(grafo))
+
+    def test_no_dirigido(self):
+        random.seed(1)
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(200, 600, False)
+        for arista in grafo.aristas:
+            arista.definir_propiedad("distancia", random.randint(1, 100))
+        self.ida_vuelta(grafo)
+
+    def test_dirigido_con_pesos_reales(self):
+        random.seed(2)
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(150, 500, True)
+        for arista in grafo.aristas:
+            arista.definir_propiedad("distancia", random.random() * 10)
+        self.ida_vuelta(grafo)
+
+    def test_nodos_aislados_y_sin_distancia(self):
+        grafo = pgrafos.Grafo(False)
+        for id in ("a", "b", "c", "d"):
+            grafo.crear_nodo(id)
+        grafo.conectar_nodos("a", "b")
+        grafo.conectar_nodos("b", "c", distancia=2.5)
+        self.ida_vuelta(grafo)
+
+    def test_archivo_truncado(self):
+        grafo = pgrafos.Grafo.generar_malla(5, 5)
+        grafo.guardar_binario(self.ruta("malla.pgr"))
+        with open(self.ruta("malla.pgr"), "rb") as archivo:
+            contenido = archivo.read()
+        for tamano in (0, 10, len(contenido) // 2, len(contenido) - 8):
+            with open(self.ruta("truncado.pgr"), "wb") as archivo:
+                archivo.write(contenido[:tamano])
+            self.assertIsNone(pgrafos.Grafo.cargar_binario(self.ruta("truncado.pgr")))
+
+    def danar(self, posicion, valor):
+        #Copia de malla.pgr con el int64 en la posición indicada (en enteros después del encabezado) reemplazado por valor.
+        with open(self.ruta("malla.pgr"), "rb") as archivo:
+            contenido = bytearray(archivo.read())
+        inicio = pgrafos.ENCABEZADO_BINARIO.size + 8 * posicion
+        contenido[inicio:inicio + 8] = struct.pack("<q", valor)
+        with open(self.ruta("danado.pgr"), "wb") as archivo:
+            archivo.write(contenido)
+        return self.ruta("danado.pgr")
+
+    def test_archivo_danado(self):
+        grafo = pgrafos.Grafo.generar_malla(5, 5)
+        grafo.guardar_binario(self.ruta("malla.pgr"))
+        n, m = 25, 2 * grafo.num_aristas()
+        #Tabla de IDs (n), desplazamientos (n + 1) y vecinos (m).
+        for posicion, valor in ((n + 1, m), (n + 2, -1), (n + 12, 0), (2 * n + 1, n), (2 * n + 1 + m - 1, -3)):
+            self.assertIsNone(pgrafos.Grafo.cargar_binario(self.danar(posicion, valor)), (posicion, valor))
+        with pgrafos.Grafo.cargar_binario(self.danar(2 * n + 1, 1)) as compacto:
+            self.assertEqual(compacto.num_nodos(), n)
+        self.assertIsNone(compacto.vecinos)
+        sin_validar = pgrafos.Grafo.cargar_binario(self.danar(2 * n + 1, n), validar=False)
+        self.assertIsNotNone(sin_validar)
+        sin_validar.cerrar()
+        sin_validar.cerrar()
+
+    def test_cerrar(self):
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(50, 100, False)
+        grafo.guardar_binario(self.ruta("grafo.pgr"))
+        compacto = pgrafos.Grafo.cargar_binario(self.ruta("grafo.pgr"))
+        self.assertEqual(compacto.a_grafo().num_aristas(), grafo.num_aristas())
+        compacto.cerrar()
+        os.remove(self.ruta("grafo.pgr"))
+
+
+if __name__ == "__main__":
+    unittest.main()
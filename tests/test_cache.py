@@ -0,0 +1,41 @@
+import unittest
+
+import pgrafos
+
+
+class TestCacheConsultas(unittest.TestCase):
+    """Los cambios hechos con los métodos de Nodo y Arista invalidan la caché de consultas de todos los grafos que los contienen."""
+
+    def setUp(self):
+        self.grafo = pgrafos.Grafo.generar_malla(4, 4)
+        for arista in self.grafo.aristas:
+            arista.definir_propiedad("distancia", 1)
+
+    def test_propiedad_de_arista(self):
+        distancias = self.grafo.distancias_Dijkstra(0)[0]
+        self.assertIs(self.grafo.distancias_Dijkstra(0)[0], distancias)
+        self.grafo.get_arista(0, 1).definir_propiedad("distancia", 10)
+        self.assertNotEqual(list(self.grafo.distancias_Dijkstra(0)[0]), list(distancias))
+
+    def test_nodos_compartidos(self):
+        otro = pgrafos.Grafo(False)
+        otro.agregar_nodos(self.grafo.nodos)
+        nodo = self.grafo.get_nodo(0)
+        for grafo in (self.grafo, otro):
+            version = grafo.version
+            resultado = grafo.componentes_conexas()
+            nodo.definir_propiedad("x", 1)
+            self.assertNotEqual(grafo.version, version)
+            self.assertIsNot(grafo.componentes_conexas(), resultado)
+        version = otro.version
+        self.grafo.get_arista(0, 1).definir_propiedad("distancia", 10)
+        self.assertNotEqual(otro.version, version)
+
+    def test_consultas_que_regresan_grafos(self):
+        arbol = self.grafo.KruskalD()[0]
+        self.assertIsNot(self.grafo.KruskalD()[0], arbol)
+        self.assertIsNot(self.grafo.Dijkstra(0), self.grafo.Dijkstra(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
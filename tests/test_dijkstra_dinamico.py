@@ -0,0 +1,67 @@
+import math
+import random
+import unittest
+
+import pgrafos
+
+
+class TestDijkstraDinamico(unittest.TestCase):
+    """Tras cada cambio, DijkstraDinamico coincide con recalcular Grafo.distancias_Dijkstra desde cero."""
+
+    NODOS = 50
+
+    def anteriores(self, dinamico, grafo):
+        #Nodo anterior de cada nodo en el árbol (None en s y en los nodos no alcanzados).
+        anteriores = {}
+        for nodo in grafo.nodos:
+            camino = dinamico.camino(nodo.identificador)
+            anteriores[nodo.identificador] = camino[-2] if camino and len(camino) > 1 else None
+        return anteriores
+
+    def revisar(self, dinamico, grafo):
+        grafo.tamano_cache = 0
+        distancias = grafo.distancias_Dijkstra(0)[0]
+        for i, nodo in enumerate(grafo.nodos):
+            self.assertEqual(dinamico.distancia(nodo.identificador), distancias[i])
+            camino = dinamico.camino(nodo.identificador)
+            if distancias[i] == math.inf:
+                self.assertIsNone(camino)
+                continue
+            self.assertEqual((camino[0], camino[-1]), (0, nodo.identificador))
+            self.assertEqual(sum(grafo.get_arista(a, b).get_distancia() for a, b in zip(camino, camino[1:])), distancias[i])
+
+    def cambios_aleatorios(self, es_dirigido, semilla, pasos=200):
+        random.seed(semilla)
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(self.NODOS, 3 * self.NODOS, es_dirigido)
+        for arista in grafo.aristas:
+            arista.definir_propiedad("distancia", random.randint(0, 10))
+        dinamico = pgrafos.DijkstraDinamico(grafo, 0)
+        self.revisar(dinamico, grafo)
+        for paso in range(pasos):
+            id_de, id_a = random.randrange(self.NODOS), random.randrange(self.NODOS)
+            distancias = {nodo.identificador: dinamico.distancia(nodo.identificador) for nodo in grafo.nodos}
+            anteriores = self.anteriores(dinamico, grafo)
+            operacion = random.random()
+            if operacion < 0.35:
+                cambiados = dinamico.conectar_nodos(id_de, id_a, distancia=random.randint(0, 10))
+            elif operacion < 0.6:
+                cambiados = dinamico.desconectar_nodos(id_de, id_a)
+            else:
+                arista = random.choice(grafo.aristas)
+                cambiados = dinamico.definir_distancia(arista.extremos[0].identificador, arista.extremos[1].identificador, random.randint(0, 10))
+            self.revisar(dinamico, grafo)
+            nuevos_anteriores = self.anteriores(dinamico, grafo)
+            esperados = {id for id in distancias if distancias[id] != dinamico.distancia(id) or anteriores[id] != nuevos_anteriores[id]}
+            self.assertEqual(cambiados, esperados, (es_dirigido, semilla, paso))
+
+    def test_no_dirigido(self):
+        for semilla in range(4):
+            self.cambios_aleatorios(False, semilla)
+
+    def test_dirigido(self):
+        for semilla in range(4):
+            self.cambios_aleatorios(True, semilla)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+import pgrafos
+
+
+VALORES = ['di"jo', "x]y", "p[q]r", "a b", "x,y;z=w", "\\", 'a\\"b', "\\n", "línea\nnueva", "", " ",
+           "12", "1.5", "True", "inf", 7, -2.5, 1e-3, float("inf"), True, False, None]
+
+
+class TestGVIdaVuelta(unittest.TestCase):
+    """Grafo.guardar -> Grafo.generar_desde_archivo conserva los valores y tipos de los atributos."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def ida_vuelta(self, grafo):
+        grafo.guardar("grafo", directorio=self.directorio.name)
+        return pgrafos.Grafo.generar_desde_archivo(os.path.join(self.directorio.name, "grafo.gv"))
+
+    def assertMismoValor(self, leido, valor):
+        self.assertEqual(leido, valor)
+        self.assertIs(type(leido), type(valor))
+
+    def test_atributos_de_nodos(self):
+        grafo = pgrafos.Grafo(False)
+        for i, valor in enumerate(VALORES):
+            grafo.crear_nodo(i)
+            grafo.get_nodo(i).definir_propiedad("valor", valor)
+            grafo.get_nodo(i).definir_propiedad("otro", i)
+        leido = self.ida_vuelta(grafo)
+        for i, valor in enumerate(VALORES):
+            nodo = leido.get_nodo(str(i))
+            self.assertMismoValor(nodo.get_propiedad("valor"), valor)
+            self.assertMismoValor(nodo.get_propiedad("otro"), i)
+
+    def test_atributos_de_aristas(self):
+        grafo = pgrafos.Grafo(True)
+        for i in range(len(VALORES) + 1):
+            grafo.crear_nodo(i)
+        for i, valor in enumerate(VALORES):
+            grafo.conectar_nodos(i, i + 1, q=valor, lbl="x]y", nota="p[q]r", distancia=i)
+        leido = self.ida_vuelta(grafo)
+        self.assertEqual(leido.num_aristas(), len(VALORES))
+        for i, valor in enumerate(VALORES):
+            arista = leido.get_arista(str(i), str(i + 1))
+            self.assertMismoValor(arista.get_propiedad("q"), valor)
+            self.assertEqual(arista.get_propiedad("lbl"), "x]y")
+            self.assertEqual(arista.get_propiedad("nota"), "p[q]r")
+            self.assertMismoValor(arista.get_distancia(), i)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import contextlib
+import io
+import unittest
+
+import pgrafos
+
+
+class TestIndiceNodos(unittest.TestCase):
+    """Grafo.get_nodo usa el índice por identificador y sólo lo reconstruye si la lista de nodos cambió directamente."""
+
+    def setUp(self):
+        self.grafo = pgrafos.Grafo.generar_malla(3, 3)
+
+    def test_cambios_directos_a_la_lista(self):
+        self.grafo.nodos.append(pgrafos.Nodo("nuevo"))
+        self.assertIs(self.grafo.get_nodo("nuevo"), self.grafo.nodos[-1])
+        self.grafo.nodos = self.grafo.nodos[:4]
+        self.assertIsNone(self.grafo.get_nodo(5))
+        self.assertIs(self.grafo.get_nodo(3), self.grafo.nodos[3])
+
+    def test_identificadores_repetidos(self):
+        repetido = pgrafos.Nodo(0)
+        self.grafo.nodos.append(repetido)
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            self.assertIs(self.grafo.get_nodo(0), repetido)
+        self.assertIn("ADVERTENCIA", salida.getvalue())
+        #El índice queda vigente: las siguientes consultas no lo reconstruyen ni repiten la advertencia.
+        indice = self.grafo._indice
+        with contextlib.redirect_stdout(io.StringIO()) as salida:
+            for i in range(9):
+                self.grafo.get_nodo(i)
+            self.grafo.crear_nodo("otro")
+            self.assertIsNotNone(self.grafo.get_nodo("otro"))
+        self.assertIs(self.grafo._indice, indice)
+        self.assertEqual(salida.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import unittest
+
+import pgrafos
+
+
+class TestArbolesExpansion(unittest.TestCase):
+    """KruskalD, KruskalI y Prim regresan el mismo tipo de árbol: no dirigido, con todos los nodos y sólo "distancia" en las aristas."""
+
+    def revisar(self, grafo):
+        resultados = [grafo.KruskalD(), grafo.KruskalI(), grafo.Prim()]
+        pesos = [peso for arbol, peso in resultados]
+        self.assertAlmostEqual(min(pesos), max(pesos), places=9)
+        aristas = []
+        for arbol, peso in resultados:
+            self.assertFalse(arbol.es_dirigido)
+            self.assertEqual([nodo.identificador for nodo in arbol.nodos], [nodo.identificador for nodo in grafo.nodos])
+            self.assertEqual(arbol.get_nodo(grafo.nodos[0].identificador).get_propiedad("color"), "rojo")
+            for arista in arbol.aristas:
+                self.assertEqual([llave for llave, valor in arista.propiedades()], ["distancia"])
+            aristas.append({frozenset((arista.extremos[0].identificador, arista.extremos[1].identificador)) for arista in arbol.aristas})
+        #Con distancias reales aleatorias el bosque es único.
+        self.assertEqual(aristas[0], aristas[1])
+        self.assertEqual(aristas[0], aristas[2])
+
+    def generar(self, es_dirigido, semilla):
+        random.seed(semilla)
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(60, 120, es_dirigido)
+        for arista in grafo.aristas:
+            arista.definir_propiedad("distancia", random.random())
+            arista.definir_propiedad("etiqueta", "a")
+        grafo.nodos[0].definir_propiedad("color", "rojo")
+        return grafo
+
+    def test_no_dirigido(self):
+        for semilla in range(3):
+            self.revisar(self.generar(False, semilla))
+
+    def test_dirigido(self):
+        for semilla in range(3):
+            self.revisar(self.generar(True, semilla))
+
+
+if __name__ == "__main__":
+    unittest.main()
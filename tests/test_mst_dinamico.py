@@ -0,0 +1,72 @@
+import random
+import unittest
+from fractions import Fraction
+
+import pgrafos
+
+
+def aristas_de(arbol):
+    return {frozenset((arista.extremos[0].identificador, arista.extremos[1].identificador)) for arista in arbol.aristas}
+
+
+class TestMSTDinamico(unittest.TestCase):
+    """Tras cada cambio, MSTDinamico tiene el mismo peso y un bosque equivalente al que calcula Grafo.KruskalD desde cero."""
+
+    NODOS = 40
+
+    def revisar(self, dinamico, grafo, reales):
+        arbol, peso = grafo.KruskalD()
+        self.assertAlmostEqual(dinamico.peso_total, peso, places=9)
+        #El peso acumulado es exacto: coincide con la suma (como fracción) de las aristas del árbol.
+        exacto = sum(Fraction(arista.get_distancia()) for arista in dinamico.mst.aristas)
+        self.assertEqual(dinamico.peso_total, float(exacto) if reales else exacto)
+        for arista in dinamico.mst.aristas:
+            original = grafo.get_arista(arista.extremos[0].identificador, arista.extremos[1].identificador)
+            self.assertIsNotNone(original)
+            self.assertEqual(original.get_distancia(), arista.get_distancia())
+        if reales:
+            #Con distancias reales aleatorias (distintas) el bosque de expansión mínima es único.
+            self.assertEqual(aristas_de(dinamico.mst), aristas_de(arbol))
+        else:
+            #Con empates basta que sea un bosque (sin ciclos) con una arista menos que nodos por componente del grafo.
+            self.assertEqual(dinamico.mst.num_aristas(), grafo.num_nodos() - grafo.componentes_conexas()[0])
+            self.assertEqual(dinamico.mst.num_aristas(), dinamico.mst.num_nodos() - dinamico.mst.componentes_conexas()[0])
+
+    def cambios_aleatorios(self, semilla, reales, inicial, pasos=200):
+        random.seed(semilla)
+        peso = (lambda: random.random() * 10) if reales else (lambda: random.randint(1, 20))
+        grafo = pgrafos.Grafo.generar_ErdosRenyi(self.NODOS, 60, False)
+        for arista in grafo.aristas:
+            arista.definir_propiedad("distancia", peso())
+        dinamico = pgrafos.MSTDinamico(grafo, inicial(grafo))
+        self.revisar(dinamico, grafo, reales)
+        for paso in range(pasos):
+            operacion = random.random()
+            if operacion < 0.4:
+                id_de, id_a = random.sample(range(self.NODOS), 2)
+                dinamico.conectar_nodos(id_de, id_a, distancia=peso())
+            else:
+                arista = random.choice(grafo.aristas)
+                id_de, id_a = arista.extremos[0].identificador, arista.extremos[1].identificador
+                if operacion < 0.8:
+                    dinamico.definir_distancia(id_de, id_a, peso())
+                else:
+                    dinamico.desconectar_nodos(id_de, id_a)
+            with self.subTest(semilla=semilla, paso=paso):
+                self.revisar(dinamico, grafo, reales)
+
+    def test_distancias_enteras(self):
+        for semilla in range(3):
+            self.cambios_aleatorios(semilla, False, lambda grafo: None)
+
+    def test_distancias_reales(self):
+        for semilla in range(3):
+            self.cambios_aleatorios(semilla, True, lambda grafo: None)
+
+    def test_desde_KruskalI_y_Prim(self):
+        self.cambios_aleatorios(10, True, lambda grafo: grafo.KruskalI())
+        self.cambios_aleatorios(11, False, lambda grafo: grafo.Prim())
+
+
+if __name__ == "__main__":
+    unittest.main()
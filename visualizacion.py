@@ -4,11 +4,9 @@ import pgrafos
 import pygame
 
 #Propiedades del Grafo
-grafo = pgrafos.Grafo.generar_desde_archivo("grafos/malla/malla_100.gv")
-metodo_disposicion = pgrafos.Distribucion.spring
-ultimo_nodo = 0 #último nodo calculado el fotograma anterior
-ipf = 100 #maximo de nodos calculados por fotograma
-max_iteraciones_disp = 500000 #máximo de iteraciones del algoritmo
+archivo_grafo = "grafos/malla/malla_100.gv"
+max_iteraciones_disp = 5000 #máximo de iteraciones del algoritmo
+tolerancia_disp = 0.05 #desplazamiento (px) con el que la distribución se considera terminada
 
 #Propiedades del programa
 ventana_ancho = 1280
@@ -20,51 +18,86 @@ arista_color = pygame.Color(130,0,210,255)
 arista_ancho = 1
 
 #Funciones para el programa
-def calcular_posiciones(grafo):
-    global max_iteraciones_disp
-    global ultimo_nodo
-    if  max_iteraciones_disp > 0:
-        metodo_disposicion(grafo, ventana_ancho - (nodo_radio * 2), ventana_alto - (nodo_radio * 2), c1=110, c2=15, c3=6, c4=0.01, comienzo=ultimo_nodo, operaciones_por_frame=ipf)
-        max_iteraciones_disp = (max_iteraciones_disp - 1) if (ultimo_nodo + ipf) >= len(grafo.nodos) else max_iteraciones_disp
-        ultimo_nodo = (ultimo_nodo + ipf) % len(grafo.nodos)
+def trazos_aristas(grafo):
+    """
+    Agrupa las aristas en recorridos que no repiten arista, para dibujar cada uno con una sola llamada a pygame.draw.lines.
 
-def dibujar_grafo(surface, grafo):
-    for arista in grafo.aristas:
-        inicio = (arista.extremos[0].propiedad.get("dis_x", 0) + nodo_radio, arista.extremos[0].propiedad.get("dis_y", 0) + nodo_radio)
-        fin = (arista.extremos[1].propiedad.get("dis_x", 0) + nodo_radio, arista.extremos[1].propiedad.get("dis_y", 0) + nodo_radio)
-        pygame.draw.line(surface, arista_color, inicio, fin, arista_ancho)
+    :return: Lista de listas de índices de nodos (posiciones en grafo.nodos).
+    """
+    indice = {nodo: i for i, nodo in enumerate(grafo.nodos)}
+    pendientes = [[] for nodo in grafo.nodos]
+    for i, arista in enumerate(grafo.aristas):
+        nodo_de, nodo_a = arista.extremos
+        de, a = indice[nodo_de], indice[nodo_a]
+        pendientes[de].append((a, i))
+        pendientes[a].append((de, i))
+    dibujadas = set()
+    trazos = []
+    for inicio in range(len(pendientes)):
+        while pendientes[inicio]:
+            trazo = [inicio]
+            actual = inicio
+            while pendientes[actual]:
+                siguiente, arista = pendientes[actual].pop()
+                if arista in dibujadas:
+                    continue
+                dibujadas.add(arista)
+                trazo.append(siguiente)
+                actual = siguiente
+            if len(trazo) > 1:
+                trazos.append(trazo)
+    return trazos
 
-    for nodo in grafo.nodos:
-        surface.blit(nodo_sprite, dest=(nodo.propiedad.get("dis_x", 0), nodo.propiedad.get("dis_y", 0)))
+def dibujar_grafo(surface, trazos, nodo_sprite, x, y):
+    for trazo in trazos:
+        pygame.draw.lines(surface, arista_color, False, [(x[i] + nodo_radio, y[i] + nodo_radio) for i in trazo], arista_ancho)
+    surface.blits([(nodo_sprite, (nodo_x, nodo_y)) for nodo_x, nodo_y in zip(x, y)], False)
 
-#Inicializar pygame
-pygame.init()
-pantalla = pygame.display.set_mode((ventana_ancho, ventana_alto))
-clock = pygame.time.Clock()
-ejecutandose = True
-delta_time = 0
+def main():
+    #La sesión calcula en otro proceso: con spawn o forkserver ese proceso vuelve a importar este módulo, por lo que
+    #pygame y la sesión sólo se crean aquí, bajo if __name__ == "__main__".
+    grafo = pgrafos.Grafo.generar_desde_archivo(archivo_grafo)
 
-#Crear representación de nodo a instanciar
-nodo_sprite = pygame.Surface((nodo_radio * 2, nodo_radio * 2), pygame.SRCALPHA)
-pygame.draw.circle(nodo_sprite, nodo_color, (nodo_sprite.width/2, nodo_sprite.height/2), nodo_radio)
+    #Inicializar pygame
+    pygame.init()
+    pantalla = pygame.display.set_mode((ventana_ancho, ventana_alto))
+    clock = pygame.time.Clock()
+    ejecutandose = True
+    delta_time = 0
 
-#Ejecución del programa
-pgrafos.Distribucion.aleatoria(grafo, ventana_ancho - (nodo_radio * 2), ventana_alto - (nodo_radio * 2))
+    #Crear representación de nodo a instanciar
+    nodo_sprite = pygame.Surface((nodo_radio * 2, nodo_radio * 2), pygame.SRCALPHA)
+    pygame.draw.circle(nodo_sprite, nodo_color, (nodo_sprite.width/2, nodo_sprite.height/2), nodo_radio)
 
-while ejecutandose:
-    #Cerrar programa cuando se presiona "X" en la ventana.
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            ejecutandose = False
-    
-    pantalla.fill(ventana_color)
-    calcular_posiciones(grafo)
-    dibujar_grafo(pantalla, grafo)
-    
-    #Renderizar el fotograma
-    pygame.display.flip()
+    #Ejecución del programa
+    pgrafos.Distribucion.aleatoria(grafo, ventana_ancho - (nodo_radio * 2), ventana_alto - (nodo_radio * 2))
+    trazos = trazos_aristas(grafo)
+    sesion = pgrafos.Distribucion.sesion(grafo, ventana_ancho - (nodo_radio * 2), ventana_alto - (nodo_radio * 2), c1=110, c2=15, c3=6, c4=0.01,
+                                         tolerancia=tolerancia_disp, max_iteraciones=max_iteraciones_disp)
 
-    #Limitar FPS y calcular Delta Time
-    delta_time = clock.tick(60) / 1000
-pygame.quit()
+    while ejecutandose:
+        #Cerrar programa cuando se presiona "X" en la ventana.
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                ejecutandose = False
+            #Pausar o reanudar la distribución con la barra espaciadora.
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                if sesion.estado == pgrafos.SESION_PAUSADA:
+                    sesion.reanudar()
+                else:
+                    sesion.pausar()
+        
+        pantalla.fill(ventana_color)
+        dibujar_grafo(pantalla, trazos, nodo_sprite, *sesion.posiciones())
+        
+        #Renderizar el fotograma
+        pygame.display.flip()
 
+        #Limitar FPS y calcular Delta Time
+        delta_time = clock.tick(60) / 1000
+    sesion.escribir()
+    sesion.detener()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()